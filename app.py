@@ -1,11 +1,11 @@
 import streamlit as st
-import pandas as pd
-import cv2
-import numpy as np
-import tempfile
 import os
 import base64
-from PIL import Image
+from concurrent.futures import Future
+
+# pandas, cv2 and the OCR/vision modules are imported where they are first
+# needed, so the page renders before the heavy libraries load.
+from session_store import SessionResults, compact_record, make_thumbnail
 
 # ==========================================
 # 1. PAGE CONFIGURATION
@@ -75,7 +75,121 @@ st.markdown('<div class="header-sub">Intelligent Cable Inspection & Document Ana
 st.divider()
 
 # ==========================================
-# 4. SIDEBAR CONTROL
+# 4. BACKGROUND DOCUMENT PROCESSING
+# ==========================================
+# Documents are OCR'd by a pipeline shared by all sessions, so the script run
+# never blocks: uploads are submitted, progress is polled, and each result is
+# rendered as soon as its document completes.
+DOC_PIPELINE_WORKERS = {"render": 2, "ocr": 2}
+DOC_BATCHING = {"max_batch_size": 64, "max_wait_ms": 10}
+# Grayscale pages capped at 2500 px; near 3 GB RSS, pages shrink and new
+# documents wait for the ones in flight instead of pushing the server to swap
+DOC_LOW_MEMORY = {"max_edge": 2500, "budget_mb": 3072}
+# Photo uploads: tiny/blurry ones are rejected before OCR, dark, flat or
+# skewed ones are enhanced first (thresholds: ocr_module/src/quality.py)
+DOC_QUALITY_GATE = {"enhance": True}
+
+# st.fragment (Streamlit >= 1.37) / st.experimental_fragment (older releases)
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+
+@st.cache_resource(show_spinner="Loading OCR engine...")
+def get_document_pipeline():
+    """One warm OCR engine and document pipeline, reused across reruns and sessions."""
+    from ocr_module.interface import create_document_pipeline
+    return create_document_pipeline(workers=DOC_PIPELINE_WORKERS, batching=DOC_BATCHING,
+                                    low_memory=DOC_LOW_MEMORY, quality_gate=DOC_QUALITY_GATE).start()
+
+
+@st.cache_resource
+def get_document_intake():
+    """
+    Single thread feeding uploads into the pipeline. Its work queue is
+    unbounded, so a full pipeline (large batch, other sessions busy) makes
+    the intake thread wait instead of the script run.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="doc-intake")
+
+
+def _feed_pipeline(pipe, job, future):
+    """Runs on the intake thread: blocks on pipeline backpressure, then chains the result into future."""
+    try:
+        inner = pipe.submit(job)
+    except Exception as e:
+        future.set_exception(e)
+        return
+
+    def relay(done):
+        error = done.exception()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(done.result())
+    inner.add_done_callback(relay)
+
+
+def submit_document(uploaded_doc):
+    """Queue an upload for extraction; returns the pending job record."""
+    file_ext = os.path.splitext(uploaded_doc.name)[1].lower()
+    progress = {"pages_done": 0, "pages_total": None}
+
+    def on_page(index, total, texts):
+        # Runs on a pipeline thread: only touches this plain dict
+        progress["pages_done"] = index + 1
+        progress["pages_total"] = total
+
+    data = uploaded_doc.getvalue()
+    suffix = file_ext if file_ext in ['.pdf', '.docx', '.jpg', '.png', '.jpeg'] else ".jpg"
+    # Handed to the intake thread: returns immediately even when the pipeline is full
+    future = Future()
+    future.set_running_or_notify_cancel()
+    get_document_intake().submit(_feed_pipeline, get_document_pipeline(), {
+        "source": data,  # Upload buffer, no temp file round trip
+        "filename": uploaded_doc.name,
+        "on_page": on_page,
+    }, future)
+    return {
+        "future": future,
+        "progress": progress,
+        "size": uploaded_doc.size,
+        "suffix": suffix,
+        # Only a small preview is kept, not the upload itself
+        "thumbnail": make_thumbnail(data) if suffix in ['.jpg', '.png', '.jpeg'] else None,
+    }
+
+
+def collect_result(job):
+    """Compact session record (see session_store) for a finished job."""
+    try:
+        specs, report = job["future"].result()
+    except Exception as e:
+        specs, report = {}, {"status": "ERROR", "valid": False, "errors": [str(e)], "warnings": []}
+    return compact_record(specs, report, job["size"], job["suffix"], thumbnail=job["thumbnail"])
+
+
+@fragment(run_every=1)
+def show_pending_documents():
+    """Progress bars for queued documents; reruns the app as each one completes."""
+    pending = st.session_state.ocr_pending
+    finished = [name for name, job in pending.items() if job["future"].done()]
+    for doc_name, job in pending.items():
+        if doc_name in finished:
+            continue
+        done, total = job["progress"]["pages_done"], job["progress"]["pages_total"]
+        if total:
+            st.progress(done / total, text=f"⏳ {doc_name}: page {done}/{total}")
+        else:
+            st.progress(0.0, text=f"⏳ {doc_name}: waiting / rendering...")
+
+    if finished:
+        for doc_name in finished:
+            st.session_state.ocr_results[doc_name] = collect_result(pending.pop(doc_name))
+        st.rerun()
+
+
+# ==========================================
+# 5. SIDEBAR CONTROL
 # ==========================================
 st.sidebar.title("🎛️ System Control")
 mode = st.sidebar.radio("Select Module:", 
@@ -103,35 +217,30 @@ if mode == "👁️ Vision Inspection (Cross-Section)":
                     st.divider()
                     st.markdown(f"### 🖼️ Analyzing: {uploaded_file.name}")
                     
-                    # Create Temp File
-                    tfile = tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") 
-                    tfile.write(uploaded_file.read())
-                    tfile.close() 
-                    
                     # Layout
                     c1, c2 = st.columns(2)
                     c1.image(uploaded_file, caption="Original Image", use_container_width=True)
                     
                     with st.spinner(f"Processing {uploaded_file.name}..."):
-                        processed_img, data = analyze_cable_image(tfile.name)
+                        # Decode straight from the upload buffer (no temp file round trip)
+                        processed_img, data = analyze_cable_image(uploaded_file.getvalue())
                         
                         # Handle Results
                         if data and "Error" in data[0]:
                             st.error(f"❌ {data[0]['Error']}")
                         elif processed_img is not None:
                             # Convert BGR to RGB
+                            import cv2
                             rgb_img = cv2.cvtColor(processed_img, cv2.COLOR_BGR2RGB)
                             c2.image(rgb_img, caption="AI Result", use_container_width=True)
                             
                             if data:
                                 st.markdown('<div class="success-box">✅ Detection Successful</div>', unsafe_allow_html=True)
+                                import pandas as pd
                                 df = pd.DataFrame(data)
                                 st.table(df)
                             else:
                                 st.warning("⚠️ No cable detected. Try adjusting lighting.")
-                                
-                    # Cleanup
-                    os.unlink(tfile.name)
 
             except ImportError:
                 st.error("❌ Error: 'vision_module' not found. Please check folder structure.")
@@ -151,59 +260,55 @@ elif mode == "📄 Datasheet OCR & Validation":
 
         # Initialize session state for this module
         if 'ocr_results' not in st.session_state:
-            st.session_state.ocr_results = {}
+            # Capped per session; the oldest documents are evicted first
+            st.session_state.ocr_results = SessionResults()
+        if 'ocr_pending' not in st.session_state:
+            st.session_state.ocr_pending = {}
             
         # Process Button
         if st.button("🔍 Extract & Validate All", type="primary"):
-            st.session_state.ocr_results = {} # Clear previous
+            # Drop results of documents that are no longer uploaded
+            uploaded_names = {doc.name for doc in uploaded_docs}
+            for doc_name in list(st.session_state.ocr_results):
+                if doc_name not in uploaded_names:
+                    del st.session_state.ocr_results[doc_name]
             
             # Import Logic Here (Lazy Loading)
             try:
-                from ocr_module.interface import extract_and_validate
-                
                 for uploaded_doc in uploaded_docs:
-                    # Handle File Extensions
-                    file_ext = os.path.splitext(uploaded_doc.name)[1].lower()
-                    suffix = file_ext if file_ext in ['.pdf', '.docx', '.jpg', '.png', '.jpeg'] else ".jpg"
-                    
-                    # Create Temp File
-                    tfile = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-                    tfile.write(uploaded_doc.read())
-                    tfile.close()
-                    
-                    with st.spinner(f"Reading {uploaded_doc.name}..."):
-                        specs, report = extract_and_validate(tfile.name)
-                        
-                        # Store in session state
-                        st.session_state.ocr_results[uploaded_doc.name] = {
-                            "specs": specs,
-                            "report": report,
-                            "suffix": suffix,
-                            "doc_obj": uploaded_doc # Store ref to display image 
-                        }
-                        
-                    # Cleanup
-                    os.unlink(tfile.name)
+                    # Already processed or in progress: no repeated OCR
+                    done = st.session_state.ocr_results.get(uploaded_doc.name)
+                    if uploaded_doc.name in st.session_state.ocr_pending or (done and done["size"] == uploaded_doc.size):
+                        continue
+                    st.session_state.ocr_results.pop(uploaded_doc.name, None)
+                    st.session_state.ocr_pending[uploaded_doc.name] = submit_document(uploaded_doc)
                     
             except ImportError:
                 st.error("❌ Error: 'ocr_module' not found. Please check folder structure.")
             except Exception as e:
                 st.error(f"❌ System Error: {e}")
 
+        # --- PROGRESS (documents still being processed) ---
+        if st.session_state.ocr_pending:
+            show_pending_documents()
+
+        results = st.session_state.ocr_results
+        if results.evicted:
+            st.info(f"ℹ️ Older results were removed to save memory: {', '.join(results.evicted)}")
+
         # --- DISPLAY RESULTS (Persist across re-runs) ---
         if 'ocr_results' in st.session_state and st.session_state.ocr_results:
              for doc_name, res in st.session_state.ocr_results.items():
                 specs = res['specs']
                 report = res['report']
-                doc_obj = res['doc_obj']
-                suffix = res['suffix']
+                thumbnail = res['thumbnail']
 
                 st.divider()
                 st.markdown(f"### 📄 Processing: {doc_name}")
                 
                 # Simple Preview for Images
-                if suffix in ['.jpg', '.png', '.jpeg']:
-                        st.image(doc_obj, caption="Document Preview", width=250)
+                if thumbnail:
+                        st.image(thumbnail, caption="Document Preview", width=250)
                 
                 # 1. Extracted Data Section
                 st.markdown("**📋 Extracted Specifications**")
@@ -248,13 +353,15 @@ elif mode == "📄 Datasheet OCR & Validation":
                         
                         # Debugging: Show Raw Text
                         with st.expander("🔍 Debug: View Raw OCR Text"):
-                            st.text(kw_details.get('full_text_debug', 'No text available'))
+                            # Decompressed (or read back from disk) only when requested
+                            st.text(res['ocr_text'].load() or 'No text available')
                 # ---------------------------------------------------
 
                 # Clean Keys for Display (e.g., voltage_rating -> Voltage Rating)
                 clean_specs = {k.replace('_', ' ').title(): v for k, v in display_specs.items() if v}
                 
                 if clean_specs:
+                    import pandas as pd
                     st.table(pd.DataFrame(list(clean_specs.items()), columns=["Parameter", "Value"]))
                 else:
                     st.warning("⚠️ No specifications could be extracted.")
@@ -270,6 +377,10 @@ elif mode == "📄 Datasheet OCR & Validation":
                 else:
                     st.markdown(f'<div class="error-box">❌ Status: {status} (Violations Found)</div>', unsafe_allow_html=True)
                 
+                quality = report.get("quality") or {}
+                if quality.get("enhanced"):
+                    st.info(f"🪄 Image enhanced before OCR: {', '.join(quality['reasons'])}")
+
                 # Show Specific Errors
                 if report.get("errors"):
                     for err in report["errors"]:
@@ -278,7 +389,7 @@ elif mode == "📄 Datasheet OCR & Validation":
                     st.info("✨ No engineering violations detected.")
 
 # ==========================================
-# 5. FOOTER
+# 6. FOOTER
 # ==========================================
 st.markdown("---")
 st.markdown("<p style='text-align: center; color: #888;'>© 2025 SpecSense AI | Graduation Project System</p>", unsafe_allow_html=True)
\ No newline at end of file
@@ -0,0 +1,547 @@
+"""
+Reproducible performance benchmark for SpecSense.
+
+Runs the full OCR pipeline (extract_and_validate) over the bundled sample
+documents in ocr_module/data/raw and the vision pipeline over
+vision_module/Cable_Dataset, and writes machine-readable JSON with:
+
+    - model load time (cold, per suite)
+    - end-to-end and per-stage latency percentiles (stage timings come from
+      the instrumentation layer, ocr_module/src/instrumentation.py)
+    - throughput (documents/s, pages/s, images/s)
+    - peak RSS
+    - extraction accuracy of the OCR suite against the golden files in
+      ocr_module/data/golden (ocr_module/accuracy.py), so a faster setting
+      is reported together with what it costs in precision and recall
+
+Each suite runs in its own process so load times and memory are not skewed by
+the other suite.
+
+The `startup` command measures cold start instead: it runs an entry point in
+fresh interpreters with `-X importtime`, reports import cost per top-level
+package, and fails when the start-up exceeds its time budget or imports a
+module that path must not need (torch, easyocr, cv2 for validation-only use).
+
+Usage:
+    python benchmark.py run --output bench/base.json
+    python benchmark.py run --suite ocr --repeat 5 --output bench/new.json
+    python benchmark.py compare bench/base.json bench/new.json --threshold 0.10
+    python benchmark.py startup --target validate --budget 1.5
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from ocr_module.src.memory import peak_rss_mb
+
+# ==========================================
+# ⚙️ DEFAULTS
+# ==========================================
+OCR_SAMPLES_DIR = os.path.join(project_root, "ocr_module", "data", "raw")
+OCR_GOLDEN_DIR = os.path.join(project_root, "ocr_module", "data", "golden")
+VISION_DATASET_DIR = os.path.join(project_root, "vision_module", "Cable_Dataset", "images")
+OCR_EXTENSIONS = (".png", ".jpg", ".jpeg", ".pdf", ".docx", ".xlsx", ".csv")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+PERCENTILES = (50, 90, 95, 99)
+REGRESSION_THRESHOLD = 0.10   # 10% worse than the baseline is flagged
+ACCURACY_THRESHOLD = 0.01     # Accuracy drop (absolute, 0.01 = 1 point) flagged
+
+# Heavy modules the light entry points must not import
+HEAVY_MODULES = ("torch", "easyocr", "cv2")
+# Specs used for the validation-only start-up target (test2.png)
+STARTUP_SAMPLE_SPECS = {
+    "cable_type": "Copper", "voltage": "450/750V", "current_rating": "32A", "insulation": "PVC",
+    "conductor_count": "3", "conductor_size": "6mm2", "sheath": "PVC", "operating_temperature": "70 C",
+    "insulation_resistance": "20MΩkm", "armor": "SWA",
+}
+
+
+# ==========================================
+# 📏 MEASUREMENT HELPERS
+# ==========================================
+def percentile(values, q):
+    """Linear-interpolated percentile (same as numpy's default)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100.0
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+def summarize(values):
+    summary = {f"p{q}": round(percentile(values, q), 6) for q in PERCENTILES}
+    summary["mean"] = round(sum(values) / len(values), 6) if values else 0.0
+    summary["max"] = round(max(values), 6) if values else 0.0
+    summary["count"] = len(values)
+    return summary
+
+
+def list_files(root, extensions, limit=None):
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        files.extend(os.path.join(dirpath, name) for name in sorted(filenames) if name.lower().endswith(extensions))
+    return files[:limit] if limit else files
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def stage_percentiles(per_doc_metrics):
+    """Per-stage latency percentiles across documents from report['metrics'] dicts."""
+    samples = {}
+    for metrics in per_doc_metrics:
+        for stage, values in (metrics or {}).items():
+            samples.setdefault(stage, []).append(values["wall_seconds"])
+    return {stage: summarize(values) for stage, values in sorted(samples.items())}
+
+
+# ==========================================
+# 📄 OCR SUITE
+# ==========================================
+def run_ocr_suite(options):
+    from ocr_module.src import instrumentation
+    instrumentation.enable()
+
+    start = time.perf_counter()
+    from ocr_module.interface import extract_and_validate, get_ocr_engine
+    engine = get_ocr_engine(['en'])
+    load_seconds = time.perf_counter() - start
+    if options["low_memory"]:
+        engine.enable_low_memory(max_edge=options["max_edge"], budget_mb=options["memory_budget"])
+    if options["two_pass"]:
+        engine.enable_two_pass()
+    if options["triage"]:
+        engine.enable_triage()
+
+    early_exit = None
+    if options["early_exit"] or options["max_pages"]:
+        early_exit = {"max_pages": options["max_pages"]}
+
+    files = list_files(options["ocr_dir"], OCR_EXTENSIONS, options["limit"])
+    for path in files[:1] * options["warmup"]:
+        extract_and_validate(path, early_exit=early_exit)
+
+    latencies, metrics, documents = [], [], []
+    predictions = {}
+    pages = 0
+    suite_start = time.perf_counter()
+    for _ in range(options["repeat"]):
+        for path in files:
+            doc_start = time.perf_counter()
+            specs, report = extract_and_validate(path, early_exit=early_exit)
+            elapsed = time.perf_counter() - doc_start
+            doc_metrics = report.get("metrics", {})
+            doc_pages = doc_metrics.get("ocr.render", {}).get("pages", 0)
+
+            name = os.path.relpath(path, options["ocr_dir"]).replace(os.sep, "/")
+            predictions.setdefault(name, (specs, report.get("status")))
+
+            latencies.append(elapsed)
+            metrics.append(doc_metrics)
+            pages += doc_pages
+            documents.append({
+                "file": name,
+                "seconds": round(elapsed, 6),
+                "pages": doc_pages,
+                "status": report.get("status"),
+                "rss_mb": report.get("memory", {}).get("rss_after_render_mb"),
+                "skipped_pages": len(report.get("early_exit", {}).get("skipped_pages", [])),
+            })
+    wall = time.perf_counter() - suite_start
+
+    accuracy = None
+    if options["golden_dir"]:
+        from ocr_module.accuracy import evaluate, load_golden
+        golden = load_golden(options["golden_dir"])
+        if golden:
+            accuracy = evaluate(predictions, golden)
+
+    return {
+        "files": len(files),
+        "model_load_seconds": round(load_seconds, 3),
+        "wall_seconds": round(wall, 3),
+        "throughput": {
+            "documents_per_second": round(len(latencies) / wall, 3) if wall > 0 else 0.0,
+            "pages_per_second": round(pages / wall, 3) if wall > 0 else 0.0,
+        },
+        "latency": summarize(latencies),
+        "stages": stage_percentiles(metrics),
+        "peak_rss_mb": peak_rss_mb(),
+        "document_rss_mb": summarize([doc["rss_mb"] for doc in documents if doc["rss_mb"] is not None]),
+        "accuracy": accuracy,
+        "two_pass": {k: engine.two_pass[k] for k in ("regions", "refined")} if engine.two_pass else None,
+        "skipped_pages": sum(doc["skipped_pages"] for doc in documents) if early_exit else None,
+        "triage": {k: engine.triage[k] for k in ("pages", "skipped")} if engine.triage else None,
+        "documents": documents,
+    }
+
+
+# ==========================================
+# 👁️ VISION SUITE
+# ==========================================
+def run_vision_suite(options):
+    from ocr_module.src import instrumentation
+    instrumentation.enable()
+
+    import vision_module.interface as vision
+    # Measure inference, not detection-cache lookups (unless asked to)
+    vision.DETECTION_CACHE = options["use_cache"]
+
+    start = time.perf_counter()
+    vision.load_model()
+    load_seconds = time.perf_counter() - start
+
+    files = list_files(options["vision_dir"], IMAGE_EXTENSIONS, options["limit"])
+    for path in files[:1] * options["warmup"]:
+        vision.analyze_cable_image(path)
+
+    latencies, metrics, errors = [], [], 0
+    suite_start = time.perf_counter()
+    for _ in range(options["repeat"]):
+        for path in files:
+            collector = instrumentation.Collector()
+            image_start = time.perf_counter()
+            with collector.activate():
+                _, rows = vision.analyze_cable_image(path)
+            latencies.append(time.perf_counter() - image_start)
+            metrics.append(collector.summary())
+            if rows and "Error" in rows[0]:
+                errors += 1
+    wall = time.perf_counter() - suite_start
+
+    return {
+        "files": len(files),
+        "model_load_seconds": round(load_seconds, 3),
+        "wall_seconds": round(wall, 3),
+        "throughput": {"images_per_second": round(len(latencies) / wall, 3) if wall > 0 else 0.0},
+        "latency": summarize(latencies),
+        "stages": stage_percentiles(metrics),
+        "errors": errors,
+        "detection_cache": options["use_cache"],
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+SUITES = {"ocr": run_ocr_suite, "vision": run_vision_suite}
+
+
+def _run_suite(name, options):
+    return SUITES[name](options)
+
+
+def run_benchmarks(args):
+    options = {
+        "ocr_dir": args.ocr_dir,
+        "golden_dir": None if args.no_accuracy else args.golden_dir,
+        "vision_dir": args.vision_dir,
+        "repeat": max(1, args.repeat),
+        "warmup": max(0, args.warmup),
+        "limit": args.limit,
+        "use_cache": args.use_cache,
+        "low_memory": args.low_memory,
+        "max_edge": args.max_edge,
+        "memory_budget": args.memory_budget,
+        "two_pass": args.two_pass,
+        "early_exit": args.early_exit,
+        "max_pages": args.max_pages,
+        "triage": args.triage,
+    }
+    suites = list(SUITES) if args.suite == "all" else [args.suite]
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": {k: v for k, v in options.items() if not k.endswith("_dir")},
+        },
+    }
+
+    # A fresh process per suite: cold model loads and an unshared peak RSS
+    ctx = multiprocessing.get_context("spawn")
+    for name in suites:
+        print(f"⏱️ Running {name} benchmark...")
+        with ctx.Pool(1) as pool:
+            try:
+                results[name] = pool.apply(_run_suite, (name, options))
+            except Exception as e:
+                print(f"❌ {name} benchmark failed: {e}")
+                results[name] = {"error": str(e)}
+
+    text = json.dumps(results, indent=4)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"📁 Results saved to {args.output}")
+    else:
+        print(text)
+    return results
+
+
+# ==========================================
+# ⚖️ COMPARISON
+# ==========================================
+def _collect_metrics(results):
+    """
+    Flattens a results file into {metric: (value, higher_is_better)}.
+    """
+    metrics = {}
+    for suite in SUITES:
+        data = results.get(suite)
+        if not data or "error" in data:
+            continue
+        metrics[f"{suite}.model_load_seconds"] = (data["model_load_seconds"], False)
+        if data.get("peak_rss_mb") is not None:
+            metrics[f"{suite}.peak_rss_mb"] = (data["peak_rss_mb"], False)
+        for key, value in data["throughput"].items():
+            metrics[f"{suite}.throughput.{key}"] = (value, True)
+        for q in ("p50", "p95"):
+            metrics[f"{suite}.latency.{q}"] = (data["latency"][q], False)
+            for stage, values in data["stages"].items():
+                metrics[f"{suite}.stages.{stage}.{q}"] = (values[q], False)
+        accuracy = data.get("accuracy")
+        if accuracy:
+            overall = accuracy["overall"]
+            for key in ("precision", "recall", "f1"):
+                metrics[f"{suite}.accuracy.{key}"] = (overall[key], True)
+            metrics[f"{suite}.accuracy.status_agreement"] = (accuracy["status_agreement"], True)
+            for field, rates in accuracy["fields"].items():
+                metrics[f"{suite}.accuracy.fields.{field}.f1"] = (rates["f1"], True)
+    return metrics
+
+
+def compare_results(base, new, threshold=REGRESSION_THRESHOLD, min_seconds=0.001,
+                    accuracy_threshold=ACCURACY_THRESHOLD):
+    """
+    :return: list of rows {metric, base, new, change, status}; status is
+             'REGRESSION', 'IMPROVED' or 'OK'. Latencies below `min_seconds`
+             in both runs are too small to judge and always 'OK'. Accuracy
+             metrics are fractions already: their change is absolute and
+             judged against `accuracy_threshold`.
+    """
+    base_metrics, new_metrics = _collect_metrics(base), _collect_metrics(new)
+    rows = []
+    for metric in sorted(set(base_metrics) & set(new_metrics)):
+        (old, higher_is_better), (value, _) = base_metrics[metric], new_metrics[metric]
+        if ".accuracy." in metric:
+            change, limit = value - old, accuracy_threshold
+        else:
+            change, limit = ((value - old) / old if old else 0.0), threshold
+        worse = -change if higher_is_better else change
+        tiny = metric.endswith(("p50", "p95")) and max(old, value) < min_seconds
+        if tiny or abs(worse) <= limit:
+            status = "OK"
+        else:
+            status = "REGRESSION" if worse > 0 else "IMPROVED"
+        rows.append({"metric": metric, "base": old, "new": value, "change": round(change, 4), "status": status})
+    return rows
+
+
+def print_comparison(rows):
+    print(f"{'Metric':<52}{'Base':>12}{'New':>12}{'Change':>10}  Status")
+    for row in rows:
+        icon = {"REGRESSION": "❌", "IMPROVED": "✅"}.get(row["status"], "  ")
+        # Accuracy changes are absolute (percentage points), the rest relative
+        change = f"{row['change'] * 100:>+8.1f}pt" if ".accuracy." in row["metric"] else f"{row['change']:>+10.1%}"
+        print(f"{row['metric']:<52}{row['base']:>12.4f}{row['new']:>12.4f}{change}  {icon} {row['status']}")
+
+
+# ==========================================
+# 🧊 COLD START
+# ==========================================
+def _startup_command(target, workdir):
+    """Interpreter arguments (after `python -X importtime`) for a start-up target."""
+    if target == "validate":
+        specs_path = os.path.join(workdir, "specs.json")
+        with open(specs_path, "w", encoding="utf-8") as f:
+            json.dump(STARTUP_SAMPLE_SPECS, f)
+        script = os.path.join(project_root, "ocr_module", "validation", "valid.py")
+        return [script, "--mode", "validate_json", "--specs", specs_path]
+    return ["-c", STARTUP_TARGETS[target]["code"]]
+
+
+# target: what runs, modules it must not import, default budget (seconds)
+STARTUP_TARGETS = {
+    "package": {"code": "import ocr_module", "forbidden": HEAVY_MODULES, "budget": 0.5},
+    "interface": {"code": "import ocr_module.interface", "forbidden": HEAVY_MODULES, "budget": 1.0},
+    "validate": {"code": None, "forbidden": HEAVY_MODULES, "budget": 1.5},
+    "app": {"code": "import streamlit, session_store", "forbidden": HEAVY_MODULES + ("ultralytics",), "budget": None},
+}
+
+
+def parse_importtime(stderr):
+    """
+    Parses `-X importtime` output.
+    :return: {module: (self_us, cumulative_us)}
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue
+    return modules
+
+
+def profile_startup(target, repeat=3):
+    """
+    Runs a start-up target in fresh interpreters.
+    :return: dict with wall times, import cost per top-level package (last
+             run) and the forbidden modules that were imported
+    """
+    env = dict(os.environ, SPECSENSE_NO_DAEMON="1")
+    walls, modules, exit_code = [], {}, 0
+    with tempfile.TemporaryDirectory() as workdir:
+        for _ in range(max(1, repeat)):
+            command = [sys.executable, "-X", "importtime"] + _startup_command(target, workdir)
+            start = time.perf_counter()
+            proc = subprocess.run(command, cwd=project_root, env=env, capture_output=True, text=True)
+            walls.append(time.perf_counter() - start)
+            modules, exit_code = parse_importtime(proc.stderr), proc.returncode
+
+    packages = {}
+    for name, (self_us, _) in modules.items():
+        root = name.split(".")[0]
+        packages[root] = packages.get(root, 0) + self_us
+    forbidden = STARTUP_TARGETS[target]["forbidden"]
+    return {
+        "target": target,
+        "exit_code": exit_code,
+        "wall_seconds": {"min": round(min(walls), 4), "max": round(max(walls), 4)},
+        "import_seconds": round(sum(packages.values()) / 1e6, 4),
+        "modules_imported": len(modules),
+        "packages": {name: round(us / 1e6, 4) for name, us in sorted(packages.items(), key=lambda kv: -kv[1])},
+        "forbidden_imported": sorted({name.split(".")[0] for name in modules} & set(forbidden)),
+    }
+
+
+def print_startup(profile, top=15):
+    print(f"🧊 {profile['target']}: {profile['wall_seconds']['min']:.3f}s cold start "
+          f"(max {profile['wall_seconds']['max']:.3f}s), {profile['import_seconds']:.3f}s in "
+          f"{profile['modules_imported']} imports")
+    print(f"{'Package':<32}{'Self (s)':>10}")
+    for name, seconds in list(profile["packages"].items())[:top]:
+        print(f"{name:<32}{seconds:>10.4f}")
+
+
+def run_startup(args):
+    targets = list(STARTUP_TARGETS) if args.target == "all" else [args.target]
+    failures = []
+    profiles = []
+    for target in targets:
+        profile = profile_startup(target, repeat=args.repeat)
+        profiles.append(profile)
+        if not args.json:
+            print_startup(profile, top=args.top)
+        budget = args.budget if args.budget is not None else STARTUP_TARGETS[target]["budget"]
+        if profile["exit_code"]:
+            failures.append(f"{target}: exited with code {profile['exit_code']}")
+        if profile["forbidden_imported"]:
+            failures.append(f"{target}: imported {', '.join(profile['forbidden_imported'])}")
+        if budget is not None and profile["wall_seconds"]["min"] > budget:
+            failures.append(f"{target}: {profile['wall_seconds']['min']:.3f}s is over the {budget:.2f}s budget")
+        if not args.json:
+            print()
+
+    if args.json:
+        print(json.dumps(profiles, indent=4))
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Start-up within budget")
+
+
+# ==========================================
+# 🚀 MAIN
+# ==========================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SpecSense performance benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run the benchmark suites")
+    run.add_argument("--suite", choices=["all"] + list(SUITES), default="all")
+    run.add_argument("--output", help="JSON output path (printed when omitted)")
+    run.add_argument("--repeat", type=int, default=3, help="Timed passes over the sample files")
+    run.add_argument("--warmup", type=int, default=1, help="Untimed runs before measuring")
+    run.add_argument("--limit", type=int, help="Only use the first N files of each suite")
+    run.add_argument("--ocr-dir", default=OCR_SAMPLES_DIR)
+    run.add_argument("--golden-dir", default=OCR_GOLDEN_DIR, help="Golden files scored against the OCR suite")
+    run.add_argument("--no-accuracy", action="store_true", help="Skip accuracy scoring")
+    run.add_argument("--vision-dir", default=VISION_DATASET_DIR)
+    run.add_argument("--use-cache", action="store_true", help="Keep the vision detection cache enabled")
+    run.add_argument("--low-memory", action="store_true", help="OCR suite: grayscale, capped page size, freed pages")
+    run.add_argument("--max-edge", type=int, default=2500, help="Longest page side with --low-memory")
+    run.add_argument("--memory-budget", type=float, help="Peak RSS budget in MB with --low-memory")
+    run.add_argument("--two-pass", action="store_true", help="OCR suite: coarse pass, re-read uncertain/spec regions")
+    run.add_argument("--early-exit", action="store_true", help="OCR suite: stop reading pages once all specs are found")
+    run.add_argument("--max-pages", type=int, help="OCR suite: max pages / DOCX images read per document")
+    run.add_argument("--triage", action="store_true", help="OCR suite: skip PDF pages unlikely to hold specs")
+
+    cmp = sub.add_parser("compare", help="Compare two result files and flag regressions")
+    cmp.add_argument("base")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                     help="Relative change counted as a regression (0.10 = 10%%)")
+    cmp.add_argument("--accuracy-threshold", type=float, default=ACCURACY_THRESHOLD,
+                     help="Absolute accuracy drop counted as a regression (0.01 = 1 point)")
+    cmp.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+
+    startup = sub.add_parser("startup", help="Profile cold-start import cost and check budgets")
+    startup.add_argument("--target", choices=["all"] + list(STARTUP_TARGETS), default="all")
+    startup.add_argument("--budget", type=float, help="Max cold start in seconds (default: per target)")
+    startup.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per target (min is checked)")
+    startup.add_argument("--top", type=int, default=15, help="Packages listed per target")
+    startup.add_argument("--json", action="store_true", help="Print the profiles as JSON")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        run_benchmarks(args)
+        return
+    if args.command == "startup":
+        run_startup(args)
+        return
+
+    with open(args.base, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    rows = compare_results(base, new, threshold=args.threshold, accuracy_threshold=args.accuracy_threshold)
+    if args.json:
+        print(json.dumps(rows, indent=4))
+    else:
+        print_comparison(rows)
+    regressions = [row for row in rows if row["status"] == "REGRESSION"]
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+    print(f"\n✅ No regressions above {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
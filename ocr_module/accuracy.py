@@ -0,0 +1,232 @@
+"""
+Golden-output accuracy harness for the OCR pipeline.
+
+A golden file (data/golden/<document>.json) records what a careful reader
+would extract from one sample document:
+
+    {
+        "file": "test2.png",               # relative to the documents folder
+        "source": "manual",                # or "synthetic" (generated samples)
+        "expected_status": "READY",        # CableValidator status for the specs
+        "specs": {"cable_type": "Copper", "voltage": "450/750 V", ...},
+        "notes": "optional free text"
+    }
+
+`specs` has every SpecificationExtractor field; a field the document does not
+state is null. Values use the corrected, canonical form (SpecCorrector output)
+and operating_temperature is the maximum operating temperature.
+
+Scoring is per field: a predicted value matching the expected one (after
+normalize_value) is a true positive; a wrong value counts as both a false
+positive and a false negative; a value for a null field is a false positive;
+a missing or UNVERIFIABLE value for a stated field is a false negative. The
+validation status is scored separately as agreement with expected_status.
+
+Usage:
+    python accuracy.py                                  # bundled samples
+    python accuracy.py --data-dir out --golden-dir out/golden --output acc.json
+
+benchmark.py runs the same scoring on the OCR suite, so speed-ups are
+reported with their accuracy cost.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# ==========================================
+# ⚙️ SETTINGS
+# ==========================================
+SAMPLES_DIR = os.path.join(current_dir, "data", "raw")
+GOLDEN_DIR = os.path.join(current_dir, "data", "golden")
+
+FIELDS = (
+    "cable_type", "voltage", "current_rating", "insulation", "conductor_count",
+    "conductor_size", "sheath", "operating_temperature", "insulation_resistance", "armor",
+)
+
+# Predicted values that mean "nothing extracted"
+EMPTY_VALUES = ("", "none", "null", "n/a", "unverifiable", "unknown")
+
+_REPLACEMENTS = (
+    ("²", "2"), ("°", ""), ("º", ""), ("ω", "ohm"), ("·", "."), ("aluminium", "aluminum"), ("amps", "a"),
+)
+
+
+def normalize_value(value):
+    """
+    Canonical form used to compare values: lower case, no whitespace, plain
+    units ("6 mm²" == "6mm2", "20 MΩ·km" == "20 mohm.km").
+    :return: str, or None for empty / UNVERIFIABLE values
+    """
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    if text in EMPTY_VALUES:
+        return None
+    for old, new in _REPLACEMENTS:
+        text = text.replace(old, new)
+    return re.sub(r"\s+", "", text)
+
+
+# ==========================================
+# 📂 GOLDEN FILES
+# ==========================================
+def load_golden(golden_dir=GOLDEN_DIR):
+    """
+    :return: {document file: golden dict}, sorted by file name
+    """
+    golden = {}
+    if not os.path.isdir(golden_dir):
+        return golden
+    for name in sorted(os.listdir(golden_dir)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(golden_dir, name), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        entry["specs"] = {field: entry.get("specs", {}).get(field) for field in FIELDS}
+        golden[entry["file"]] = entry
+    return golden
+
+
+# ==========================================
+# 🎯 SCORING
+# ==========================================
+def _rates(tp, fp, fn):
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"tp": tp, "fp": fp, "fn": fn,
+            "precision": round(precision, 4), "recall": round(recall, 4), "f1": round(f1, 4)}
+
+
+def score_document(specs, golden_specs):
+    """
+    :return: {field: 'tp' | 'fp' | 'fn' | 'mismatch' | 'tn'}
+    """
+    outcome = {}
+    for field in FIELDS:
+        expected = normalize_value(golden_specs.get(field))
+        predicted = normalize_value((specs or {}).get(field))
+        if expected is None:
+            outcome[field] = "tn" if predicted is None else "fp"
+        elif predicted is None:
+            outcome[field] = "fn"
+        else:
+            outcome[field] = "tp" if predicted == expected else "mismatch"
+    return outcome
+
+
+def evaluate(predictions, golden):
+    """
+    Scores pipeline output against golden files.
+
+    :param predictions: {document file: (specs, status)}
+    :param golden: load_golden() output
+    :return: dict with overall and per-field precision/recall/F1, status
+             agreement and the per-document differences
+    """
+    counts = {field: [0, 0, 0] for field in FIELDS}
+    documents, agreed = [], 0
+    scored = [name for name in golden if name in predictions]
+
+    for name in scored:
+        specs, status = predictions[name]
+        entry = golden[name]
+        outcome = score_document(specs, entry["specs"])
+        differences = {}
+        for field, result in outcome.items():
+            tp, fp, fn = counts[field]
+            counts[field] = [tp + (result == "tp"),
+                             fp + (result in ("fp", "mismatch")),
+                             fn + (result in ("fn", "mismatch"))]
+            if result not in ("tp", "tn"):
+                differences[field] = {"expected": entry["specs"][field], "predicted": (specs or {}).get(field)}
+        agreed += status == entry["expected_status"]
+        documents.append({
+            "file": name,
+            "source": entry.get("source", "manual"),
+            "status": status,
+            "expected_status": entry["expected_status"],
+            "differences": differences,
+        })
+
+    totals = [sum(values[i] for values in counts.values()) for i in range(3)]
+    return {
+        "documents": len(scored),
+        "not_run": [name for name in golden if name not in predictions],
+        "overall": _rates(*totals),
+        "status_agreement": round(agreed / len(scored), 4) if scored else 0.0,
+        "fields": {field: _rates(*values) for field, values in counts.items()},
+        "details": documents,
+    }
+
+
+def print_report(report, details=False):
+    overall = report["overall"]
+    print(f"📊 {report['documents']} document(s): precision {overall['precision']:.1%}, "
+          f"recall {overall['recall']:.1%}, F1 {overall['f1']:.1%}, "
+          f"status agreement {report['status_agreement']:.1%}")
+    print(f"\n{'Field':<24}{'Precision':>10}{'Recall':>10}{'F1':>10}")
+    for field, rates in report["fields"].items():
+        print(f"{field:<24}{rates['precision']:>10.1%}{rates['recall']:>10.1%}{rates['f1']:>10.1%}")
+    if report["not_run"]:
+        print(f"\n⚠️ No output for: {', '.join(report['not_run'])}")
+    if details:
+        for doc in report["details"]:
+            if not doc["differences"] and doc["status"] == doc["expected_status"]:
+                continue
+            marker = "✅" if doc["status"] == doc["expected_status"] else "❌"
+            print(f"\n{marker} {doc['file']}: {doc['status']} (expected {doc['expected_status']})")
+            for field, diff in doc["differences"].items():
+                print(f"   - {field}: expected {diff['expected']!r}, got {diff['predicted']!r}")
+
+
+# ==========================================
+# 🚀 MAIN
+# ==========================================
+def run_pipeline(golden, data_dir):
+    """Runs extract_and_validate on every golden document found in data_dir."""
+    try:
+        from interface import extract_and_validate
+    except ImportError:
+        from ocr_module.interface import extract_and_validate
+
+    predictions = {}
+    for name in golden:
+        path = os.path.join(data_dir, name)
+        if not os.path.exists(path):
+            continue
+        print(f"🔍 {name}")
+        specs, report = extract_and_validate(path)
+        predictions[name] = (specs, report.get("status"))
+    return predictions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score OCR output against golden files")
+    parser.add_argument("--data-dir", default=SAMPLES_DIR, help="Folder with the documents")
+    parser.add_argument("--golden-dir", default=GOLDEN_DIR, help="Folder with the golden JSON files")
+    parser.add_argument("--output", help="Write the full report as JSON")
+    parser.add_argument("--details", action="store_true", help="List every wrong field per document")
+    args = parser.parse_args(argv)
+
+    golden = load_golden(args.golden_dir)
+    if not golden:
+        print(f"❌ No golden files in {args.golden_dir}")
+        sys.exit(1)
+
+    report = evaluate(run_pipeline(golden, args.data_dir), golden)
+    print_report(report, details=args.details)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+        print(f"📁 Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Warm OCR daemon for the ocr_module command-line tools.
+
+Every `python main.py ...` or `python validation/valid.py --image ...` used to
+start a fresh interpreter and import torch, easyocr, cv2 and spacy before
+reading a single pixel. The daemon keeps one process with those modules and
+the OCR engine loaded, listening on a local Unix socket. When it is running,
+main.py and valid.py forward their arguments to it and just print its output;
+otherwise they run in-process as before.
+
+Usage:
+    python daemon.py start [--langs en] [--socket PATH]   # runs in the foreground
+    python daemon.py status
+    python daemon.py stop
+
+Set SPECSENSE_OCR_SOCKET to change the socket path, or SPECSENSE_NO_DAEMON=1
+to force the CLIs to run in-process.
+"""
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+# This module is imported by the CLIs on every run, so only the standard
+# library is imported at module level. Heavy imports happen in serve().
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+WORKER_ENV = "SPECSENSE_OCR_DAEMON_WORKER"
+CONNECT_TIMEOUT = 0.5
+
+
+def default_socket_path():
+    if os.environ.get("SPECSENSE_OCR_SOCKET"):
+        return os.environ["SPECSENSE_OCR_SOCKET"]
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    return os.path.join(tempfile.gettempdir(), f"specsense-ocr-{uid}.sock")
+
+
+def daemon_supported():
+    return hasattr(socket, "AF_UNIX")
+
+
+# -----------------------------------------------------------------------------
+# CLIENT SIDE
+# -----------------------------------------------------------------------------
+def _connect(socket_path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+    # Requests can run for minutes (large PDFs)
+    sock.settimeout(None)
+    return sock
+
+
+def _request(sock, message):
+    sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+    return sock.makefile("r", encoding="utf-8")
+
+
+def forward_to_daemon(script, argv):
+    """
+    Run a CLI invocation inside the daemon if one is listening.
+
+    :param script: 'main' or 'valid'
+    :param argv: Command-line arguments (without the program name)
+    :return: The exit code, or None if no daemon is available (run in-process).
+    """
+    if not daemon_supported() or os.environ.get(WORKER_ENV) or os.environ.get("SPECSENSE_NO_DAEMON"):
+        return None
+    socket_path = default_socket_path()
+    if not os.path.exists(socket_path):
+        return None
+    sock = _connect(socket_path)
+    if sock is None:
+        return None
+
+    with sock:
+        reader = _request(sock, {"cmd": "run", "script": script, "argv": list(argv), "cwd": os.getcwd()})
+        for line in reader:
+            msg = json.loads(line)
+            if "out" in msg:
+                sys.stdout.write(msg["out"])
+                sys.stdout.flush()
+            elif "exit" in msg:
+                return msg["exit"]
+    # Connection dropped mid-request (daemon stopped): report failure
+    print("[daemon] Connection lost before the request completed.")
+    return 1
+
+
+def send_command(cmd, socket_path=None):
+    sock = _connect(socket_path or default_socket_path())
+    if sock is None:
+        return None
+    with sock:
+        line = _request(sock, {"cmd": cmd}).readline()
+    return json.loads(line) if line else None
+
+
+# -----------------------------------------------------------------------------
+# SERVER SIDE
+# -----------------------------------------------------------------------------
+class _SocketWriter:
+    """File-like object streaming stdout/stderr writes back to the client."""
+    def __init__(self, conn):
+        self.conn = conn
+
+    def write(self, text):
+        if text:
+            self.conn.sendall((json.dumps({"out": text}) + "\n").encode("utf-8"))
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class OCRDaemon:
+    def __init__(self, socket_path, languages):
+        self.socket_path = socket_path
+        self.languages = languages
+        self.started_at = time.time()
+        self.requests = 0
+        self.clis = {}
+        # stdout redirection and chdir are process-wide, so runs are serialized
+        self._run_lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def warm_up(self):
+        """Import the heavy modules and build the OCR engine once."""
+        os.environ[WORKER_ENV] = "1"
+        if current_dir not in sys.path:
+            sys.path.insert(0, current_dir)
+
+        start = time.perf_counter()
+        from src.core_ocr import get_engine
+        get_engine(self.languages)
+
+        import main as main_cli
+        self.clis["main"] = main_cli.main
+
+        # validation/valid.py is a script, not a package module
+        spec = importlib.util.spec_from_file_location("valid_cli", os.path.join(current_dir, "validation", "valid.py"))
+        valid_cli = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(valid_cli)
+        self.clis["valid"] = valid_cli.main
+        print(f"[daemon] Warm-up complete in {time.perf_counter() - start:.1f}s (languages: {self.languages})")
+
+    def run_cli(self, conn, script, argv, cwd):
+        writer = _SocketWriter(conn)
+        code = 0
+        with self._run_lock:
+            self.requests += 1
+            previous_cwd = os.getcwd()
+            try:
+                os.chdir(cwd)
+                with contextlib.redirect_stdout(writer), contextlib.redirect_stderr(writer):
+                    try:
+                        self.clis[script](argv)
+                    except SystemExit as e:
+                        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                    except Exception:
+                        traceback.print_exc()
+                        code = 1
+            finally:
+                os.chdir(previous_cwd)
+        conn.sendall((json.dumps({"exit": code}) + "\n").encode("utf-8"))
+
+    def handle(self, conn):
+        with conn:
+            try:
+                line = conn.makefile("r", encoding="utf-8").readline()
+                if not line:
+                    return
+                msg = json.loads(line)
+                cmd = msg.get("cmd")
+
+                if cmd == "run" and msg.get("script") in self.clis:
+                    self.run_cli(conn, msg["script"], msg.get("argv", []), msg.get("cwd", os.getcwd()))
+                elif cmd == "ping":
+                    reply = {"status": "ok", "pid": os.getpid(), "uptime_s": round(time.time() - self.started_at, 1),
+                             "requests": self.requests, "languages": self.languages}
+                    conn.sendall((json.dumps(reply) + "\n").encode("utf-8"))
+                elif cmd == "shutdown":
+                    conn.sendall((json.dumps({"status": "stopping"}) + "\n").encode("utf-8"))
+                    self._stopping.set()
+                else:
+                    conn.sendall((json.dumps({"out": f"[daemon] Unknown request: {msg}\n"}) + "\n").encode("utf-8"))
+                    conn.sendall((json.dumps({"exit": 2}) + "\n").encode("utf-8"))
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # Client went away
+
+    def serve(self):
+        if os.path.exists(self.socket_path):
+            if send_command("ping", self.socket_path):
+                print(f"[daemon] Already running on {self.socket_path}")
+                return
+            os.unlink(self.socket_path)  # Stale socket from a crashed daemon
+
+        self.warm_up()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        server.listen(8)
+        server.settimeout(0.5)
+        print(f"[daemon] Listening on {self.socket_path} (pid {os.getpid()})")
+
+        try:
+            while not self._stopping.is_set():
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    continue
+                conn.settimeout(None)
+                threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            print("[daemon] Stopped.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warm OCR daemon for main.py / valid.py")
+    parser.add_argument("command", choices=["start", "stop", "status"])
+    parser.add_argument("--socket", default=None, help="Unix socket path (default: $SPECSENSE_OCR_SOCKET or a temp file)")
+    parser.add_argument("--langs", default="en", help="Comma-separated OCR languages to preload")
+    args = parser.parse_args(argv)
+
+    if not daemon_supported():
+        print("❌ Unix sockets are not available on this platform; the CLIs run in-process.")
+        return
+    socket_path = args.socket or default_socket_path()
+
+    if args.command == "start":
+        OCRDaemon(socket_path, args.langs.split(",")).serve()
+    elif args.command == "status":
+        reply = send_command("ping", socket_path)
+        print(json.dumps(reply, indent=4) if reply else f"Not running ({socket_path})")
+    elif args.command == "stop":
+        reply = send_command("shutdown", socket_path)
+        print("Stopping daemon..." if reply else f"Not running ({socket_path})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import contextlib
+import functools
 import os
 import sys
 
@@ -7,14 +9,26 @@ if current_dir not in sys.path:
     sys.path.append(current_dir)
 
 try:
-    from .src.core_ocr import OCREngine
+    from .src.core_ocr import OCREngine, get_engine
     from .src.extraction import SpecificationExtractor, SpecCorrector
     from .src.validation import CableValidator
+    from .src.pipeline import PipelineRunner, Stage
+    from .src.memory import current_rss_mb, peak_rss_mb
+    from .src.records import validate_records, validate_records_frame
+    from .src.spreadsheet import load_spreadsheet_records
+    from .src.io_utils import detect_kind
+    from .src import instrumentation
 except ImportError:
     # Fallback for when running as script vs package
-    from src.core_ocr import OCREngine
+    from src.core_ocr import OCREngine, get_engine
     from src.extraction import SpecificationExtractor, SpecCorrector
     from src.validation import CableValidator
+    from src.pipeline import PipelineRunner, Stage
+    from src.memory import current_rss_mb, peak_rss_mb
+    from src.records import validate_records, validate_records_frame
+    from src.spreadsheet import load_spreadsheet_records
+    from src.io_utils import detect_kind
+    from src import instrumentation
 
 # Import Keyword Tool at module level
 try:
@@ -27,83 +41,391 @@ except ImportError:
         from keyword_tool import CableClassifier, KeywordExtractor
 
 
-def extract_and_validate(image_path):
+# Early exit: fields that must have a value before the remaining pages are
+# skipped (all SpecificationExtractor fields by default)
+EARLY_EXIT_FIELDS = (
+    "cable_type", "voltage", "current_rating", "insulation", "conductor_count",
+    "conductor_size", "sheath", "operating_temperature", "insulation_resistance", "armor",
+)
+
+
+# Documents extract_and_validate_records reads tables from
+RECORD_KINDS = ("docx", "xlsx", "csv")
+
+
+def get_ocr_engine(languages=('en',)):
+    """
+    Returns the shared OCREngine for the given languages (created on first use).
+    """
+    return get_engine(languages)
+
+
+def extract_and_validate(image_path, filename=None, on_page=None, early_exit=None):
     """
     Extracts cable specifications from an image and validates them.
     
     Args:
-        image_path (str): Path to the image file.
+        image_path: Path to the image/PDF/DOCX/XLSX/CSV file, or its contents as
+            bytes / a file-like object (e.g. a Streamlit upload), or a
+            decoded NumPy image array.
+        filename (str): Original filename for in-memory inputs, used to
+            pick the document format.
+        on_page (callable): Optional on_page(index, total, texts) called as
+            each page finishes OCR (texts is the page's list of strings).
+        early_exit (dict): Stop OCR once specs are complete, e.g.
+            {"fields": ("voltage", "conductor_size"), "max_pages": 3}.
+            Extraction runs after each PDF page / DOCX image, and the rest
+            of the document is skipped once every field in "fields"
+            (default EARLY_EXIT_FIELDS) has a value, or after "max_pages"
+            pages. True uses the defaults. report["early_exit"] lists the
+            skipped pages; keywords then come from the pages read.
         
     Returns:
         tuple: (specs_dict, validation_report_dict)
     """
-    if not os.path.exists(image_path):
-        raise FileNotFoundError(f"Image not found: {image_path}")
+    job = stage_decode({"source": image_path, "filename": filename, "on_page": on_page},
+                       early_exit=early_exit)
+    for stage in (stage_render, stage_ocr, stage_extract, stage_correct, stage_validate, stage_keywords):
+        job = stage(job)
+    return job
 
-    try:
-        # 1. Initialize OCR Engine
-        ocr = OCREngine(languages=['en'])
-        
-        # 2. Read Text
-        results = ocr.read_image(image_path, detail=0)
-        full_text = " ".join(results)
-        
-        # 3. Extract Specifications from Text
-        extractor = SpecificationExtractor()
-        raw_specs = extractor.extract_specs(full_text)
-        
-        # 4. Apply Corrections (Fix common OCR errors)
-        corrector = SpecCorrector()
-        corrected_specs, logs = corrector.correct_all(raw_specs)
-        
-        # 5. Validate against Engineering Rules
-        validator = CableValidator()
-        validation_report = validator.validate_cable(corrected_specs)
-        
-        # Add correction logs to report for visibility if needed
-        validation_report['correction_logs'] = logs
-        
-        # =============================================
-        # 6. NEW: Keyword Generation Integration
-        # =============================================
+
+def extract_and_validate_records(source, filename=None, as_frame=False):
+    """
+    Table fast path for catalogs: one validated spec record per product row
+    of the document's spec tables, read cell by cell (no OCR, no text
+    extraction). A table (DOCX table, XLSX worksheet or CSV file) qualifies
+    when a header row names at least two spec fields (see
+    records.HEADER_ALIASES). Spreadsheets are streamed row by row.
+
+    Args:
+        source: Path to a DOCX / XLSX / CSV file, or its contents as
+            bytes / file-like.
+        filename (str): Original filename for in-memory inputs.
+        as_frame (bool): Return a pandas DataFrame (one row per record with
+            the corrected fields and the report columns) instead of dicts.
+
+    Returns:
+        list: [{"table", "row", "specs", "report"}, ...] in document order,
+        where specs are corrected and report is the validation report.
+    """
+    kind = detect_kind(source, filename)
+    if kind not in RECORD_KINDS:
+        raise ValueError(f"Spec records are read from DOCX / XLSX / CSV tables, got {kind}")
+    if isinstance(source, (str, os.PathLike)) and not os.path.exists(source):
+        raise FileNotFoundError(f"Document not found: {source}")
+    if kind == "docx":
         try:
-            classifier = CableClassifier()
-            kw_extractor = KeywordExtractor()
-            
-            category = classifier.classify(full_text)
-            keywords = kw_extractor.extract_keywords(full_text)
-            
-            # Merge into specs
-            corrected_specs['cable_category'] = category
-            if keywords.get('Top Terms'):
-                corrected_specs['top_terms'] = ", ".join(keywords['Top Terms'])
-            if keywords.get('Conductor Type'):
-                corrected_specs['conductor_type_keyword'] = ", ".join(keywords['Conductor Type'])
-
-            # Store full keyword details in report for UI "Generate Keywords" button
-            validation_report['keyword_details'] = {
-                "category": category,
-                "extracted_data": keywords,
-                "full_text_debug": full_text
-            }
+            from .src.docx_utils import load_docx_records
+        except ImportError:
+            from src.docx_utils import load_docx_records
+        records = load_docx_records(source)
+    else:
+        records = load_spreadsheet_records(source, kind)
+    if as_frame:
+        return validate_records_frame(records)
+    return validate_records(records)
 
-        except Exception as kw_error:
-            validation_report.setdefault('warnings', []).append(f"Keyword Gen Failed: {str(kw_error)}")
-            validation_report['keyword_details'] = {
-                "category": "Error",
-                "extracted_data": {},
-                "full_text_debug": full_text
+
+# =============================================
+# Pipeline Stages
+# =============================================
+# extract_and_validate() runs these in sequence; create_document_pipeline()
+# runs the same functions concurrently with bounded queues between them.
+# Each stage takes the job dict from the previous one. Once a stage fails, the
+# job carries the final (specs, error_report) output and later stages pass it on.
+# When instrumentation is enabled, job["metrics"] collects the document's stage
+# timings (across pipeline threads) and ends up in report["metrics"].
+# With instrumentation or the engine's low-memory mode on, report["memory"]
+# holds the process RSS after rendering and after the document finished.
+# With early exit on, report["early_exit"] records the pages OCR skipped;
+# with the engine's page triage on, report["triage"] has the per-page decisions,
+# and with its quality gate on, report["quality"] says which gates triggered.
+# DOCX and spreadsheet spec tables are also validated row by row into
+# report["records"].
+
+def _guarded(func):
+    @functools.wraps(func)
+    def wrapper(job):
+        if "output" in job:
+            return job
+        metrics = job.get("metrics")
+        try:
+            with metrics.activate() if metrics is not None else contextlib.nullcontext():
+                return func(job)
+        except Exception as e:
+            # Return empty specs and an error report
+            error_report = {
+                "status": "ERROR",
+                "valid": False,
+                "errors": [str(e)],
+                "warnings": []
             }
-        # =============================================
+            # Quality-gate rejections say which gates triggered
+            if getattr(e, "quality", None) is not None:
+                error_report["quality"] = e.quality
+            return {"output": ({}, error_report), "metrics": metrics}
+    return wrapper
+
+
+def stage_decode(job, early_exit=None):
+    """Check the input exists (raises FileNotFoundError for a missing path)."""
+    image_path = job["source"]
+    if isinstance(image_path, (str, os.PathLike)) and not os.path.exists(image_path):
+        raise FileNotFoundError(f"Image not found: {image_path}")
+    # A submitted job's own "early_exit" overrides the pipeline-wide setting
+    early_exit = job.pop("early_exit", early_exit)
+    if early_exit:
+        job["early_exit"] = {} if early_exit is True else dict(early_exit)
+    if instrumentation.is_enabled():
+        job.setdefault("metrics", instrumentation.Collector())
+    return job
+
+
+@_guarded
+def stage_render(job):
+    # 1. Initialize OCR Engine
+    ocr = get_ocr_engine(['en'])
+    # 2a. PDF pages / DOCX images / image -> arrays
+    job["rendered"] = ocr.render(job.pop("source"), filename=job["filename"])
+    if instrumentation.is_enabled() or ocr.low_memory:
+        job["rss_after_render_mb"] = current_rss_mb()
+    return job
+
+
+def _specs_complete(texts, fields):
+    """True when every field has a value extracted (and corrected) from texts."""
+    raw_specs = SpecificationExtractor().extract_specs(" ".join(texts))
+    specs, _ = SpecCorrector().correct_all(raw_specs)
+    return all(specs.get(field) not in (None, "", "UNVERIFIABLE") for field in fields)
+
+
+@_guarded
+def stage_ocr(job):
+    # 2b. Read Text (page by page, stopping early once the specs are complete)
+    ocr = get_ocr_engine(['en'])
+    rendered = job.pop("rendered")
+    early_exit = job.get("early_exit")
+    stop = max_pages = None
+    if early_exit is not None:
+        fields = tuple(early_exit.get("fields") or EARLY_EXIT_FIELDS)
+        stop = functools.partial(_specs_complete, fields=fields)
+        max_pages = early_exit.get("max_pages")
+    results = ocr.recognize(rendered, detail=0, on_page=job.pop("on_page", None),
+                            stop=stop, max_pages=max_pages)
+    if rendered.get("triage") is not None:
+        job["triage"] = rendered["triage"]
+    if rendered.get("quality") is not None:
+        job["quality"] = rendered["quality"]
+    if rendered.get("records"):
+        job["records"] = rendered["records"]
+    if early_exit is not None:
+        reasons = {"stop": "fields_found", "max_pages": "page_budget"}
+        job["early_exit"] = {
+            "fields": list(fields),
+            "max_pages": max_pages,
+            "pages": len(rendered["pages"]),
+            "skipped_pages": rendered.get("skipped_pages", []),
+            "reason": reasons.get(rendered.get("stopped")),
+        }
+    job["full_text"] = " ".join(results)
+    return job
+
+
+@_guarded
+def stage_extract(job):
+    # 3. Extract Specifications from Text
+    extractor = SpecificationExtractor()
+    job["raw_specs"] = extractor.extract_specs(job["full_text"])
+    return job
+
+
+@_guarded
+def stage_correct(job):
+    # 4. Apply Corrections (Fix common OCR errors)
+    corrector = SpecCorrector()
+    job["specs"], job["logs"] = corrector.correct_all(job.pop("raw_specs"))
+    return job
+
+
+@_guarded
+def stage_validate(job):
+    # 5. Validate against Engineering Rules
+    validator = CableValidator()
+    validation_report = validator.validate_cable(job["specs"])
+    
+    # Add correction logs to report for visibility if needed
+    validation_report['correction_logs'] = job.pop("logs")
+    # Catalog tables: one validated record per product row
+    if job.get("records"):
+        validation_report['records'] = validate_records(job.pop("records"))
+    job["report"] = validation_report
+    return job
+
+
+@_guarded
+def _keywords(job):
+    full_text = job["full_text"]
+    corrected_specs = job["specs"]
+    validation_report = job["report"]
+
+    # =============================================
+    # 6. NEW: Keyword Generation Integration
+    # =============================================
+    try:
+        classifier = CableClassifier()
+        kw_extractor = KeywordExtractor()
         
-        return corrected_specs, validation_report
+        category = classifier.classify(full_text)
+        keywords = kw_extractor.extract_keywords(full_text)
         
-    except Exception as e:
-        # Return empty specs and an error report
-        error_report = {
-            "status": "ERROR",
-            "valid": False,
-            "errors": [str(e)],
-            "warnings": []
+        # Merge into specs
+        corrected_specs['cable_category'] = category
+        if keywords.get('Top Terms'):
+            corrected_specs['top_terms'] = ", ".join(keywords['Top Terms'])
+        if keywords.get('Conductor Type'):
+            corrected_specs['conductor_type_keyword'] = ", ".join(keywords['Conductor Type'])
+
+        # Store full keyword details in report for UI "Generate Keywords" button
+        validation_report['keyword_details'] = {
+            "category": category,
+            "extracted_data": keywords,
+            "full_text_debug": full_text
+        }
+
+    except Exception as kw_error:
+        validation_report.setdefault('warnings', []).append(f"Keyword Gen Failed: {str(kw_error)}")
+        validation_report['keyword_details'] = {
+            "category": "Error",
+            "extracted_data": {},
+            "full_text_debug": full_text
         }
-        return {}, error_report
\ No newline at end of file
+    # =============================================
+    
+    return {"output": (corrected_specs, validation_report), "metrics": job.get("metrics"),
+            "rss_after_render_mb": job.get("rss_after_render_mb"), "early_exit": job.get("early_exit"),
+            "triage": job.get("triage"), "quality": job.get("quality")}
+
+
+def stage_keywords(job):
+    """Last stage: returns the final (specs, report) tuple."""
+    job = _keywords(job)
+    specs, report = job["output"]
+    if job.get("metrics") is not None:
+        report["metrics"] = job["metrics"].summary()
+    if job.get("early_exit") is not None:
+        report["early_exit"] = job["early_exit"]
+    if job.get("triage") is not None:
+        report["triage"] = job["triage"]
+    if job.get("quality") is not None:
+        report["quality"] = job["quality"]
+    if job.get("rss_after_render_mb") is not None:
+        report["memory"] = {
+            "rss_after_render_mb": job["rss_after_render_mb"],
+            "rss_mb": current_rss_mb(),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+    return specs, report
+
+
+# =============================================
+# Concurrent Document Pipeline
+# =============================================
+DEFAULT_STAGE_WORKERS = {
+    "decode": 1,
+    "render": 2,   # PDF rasterization / image decoding (CPU)
+    "ocr": 1,      # One recognizer: GPU/torch does not benefit from more threads
+    "extract": 1,
+    "correct": 1,
+    "validate": 1,
+    "keyword": 1,
+}
+
+
+def create_document_pipeline(workers=None, queue_size=2, batching=None, low_memory=None, early_exit=None,
+                             quality_gate=None):
+    """
+    Builds a PipelineRunner over the extract_and_validate stages, so rendering
+    of document N+1 overlaps OCR of document N.
+
+    Args:
+        workers (dict): Per-stage worker counts overriding DEFAULT_STAGE_WORKERS.
+        queue_size (int): Capacity of each inter-stage queue (backpressure).
+        batching (dict): Enable cross-document recognition batching on the
+            shared engine, e.g. {"max_batch_size": 64, "max_wait_ms": 10}.
+            Pays off with several "ocr" workers feeding the batcher. Turned
+            off again when the pipeline closes, unless it was already on.
+        low_memory (dict): Enable the engine's memory-aware mode, e.g.
+            {"max_edge": 2500, "budget_mb": 2048} (see OCREngine.enable_low_memory).
+            With a budget, rendering slows down or shrinks pages instead of
+            letting RSS grow past it. The previous setting is restored when
+            the pipeline closes.
+        early_exit (dict): Early-exit settings applied to every document
+            (see extract_and_validate).
+        quality_gate (dict): Enable the engine's image-quality gate, e.g.
+            {"enhance": True} (see OCREngine.enable_quality_gate). The previous
+            setting is restored when the pipeline closes.
+
+    Returns:
+        PipelineRunner: submit({"source": ..., "filename": ...}) returns a
+        Future resolving to exactly what extract_and_validate would return.
+    """
+    counts = dict(DEFAULT_STAGE_WORKERS, **(workers or {}))
+    needs_engine = any(option is not None for option in (batching, low_memory, quality_gate))
+    ocr = get_ocr_engine(['en']) if needs_engine else None
+    close_hooks = []
+    if batching is not None and ocr.batcher is None:
+        ocr.enable_batching(**batching)
+        close_hooks.append(ocr.disable_batching)
+    if low_memory is not None:
+        previous = ocr.low_memory
+        settings = ocr.enable_low_memory(**low_memory)
+
+        def restore_low_memory():
+            # Leave it alone if another pipeline has replaced it since
+            if ocr.low_memory is settings:
+                ocr.low_memory = previous
+        close_hooks.append(restore_low_memory)
+    if quality_gate is not None:
+        previous_gate = ocr.quality_gate
+        gate = ocr.enable_quality_gate(**quality_gate)
+
+        def restore_quality_gate():
+            if ocr.quality_gate is gate:
+                ocr.quality_gate = previous_gate
+        close_hooks.append(restore_quality_gate)
+    funcs = [
+        ("decode", functools.partial(stage_decode, early_exit=early_exit)),
+        ("render", stage_render), ("ocr", stage_ocr),
+        ("extract", stage_extract), ("correct", stage_correct),
+        ("validate", stage_validate), ("keyword", stage_keywords),
+    ]
+    pipe = PipelineRunner([Stage(name, func, workers=counts[name], queue_size=queue_size)
+                           for name, func in funcs])
+    for hook in close_hooks:
+        pipe.add_close_hook(hook)
+    return pipe
+
+
+def extract_and_validate_many(sources, filenames=None, workers=None, queue_size=2, batching=None,
+                              low_memory=None, early_exit=None, quality_gate=None, show_stats=False):
+    """
+    Runs extract_and_validate over many documents through the concurrent pipeline.
+
+    Args:
+        sources (list): Paths, bytes, file-like objects or arrays.
+        filenames (list): Optional original filenames (for in-memory inputs).
+
+    Returns:
+        list: (specs_dict, validation_report_dict) per source, in input order.
+        Like Executor.map, an exception raised for a document is re-raised here.
+    """
+    filenames = filenames or [None] * len(sources)
+    with create_document_pipeline(workers=workers, queue_size=queue_size, batching=batching,
+                                  low_memory=low_memory, early_exit=early_exit,
+                                  quality_gate=quality_gate) as pipe:
+        futures = [pipe.submit({"source": src, "filename": name}) for src, name in zip(sources, filenames)]
+        results = [f.result() for f in futures]
+    if show_stats:
+        print(pipe.format_stats())
+    return results
@@ -5,16 +5,37 @@ import re
 import sys
 from collections import Counter
 
-# Try importing dependencies, handle if missing
+# PyPDF2 and python-docx are imported by the readers that need them, so
+# importing this module (e.g. from the OCR interface) stays cheap.
+
+# Stage timings (optional: the tool also runs standalone)
+try:
+    from ..src.instrumentation import instrument, text_input
+except ImportError:
+    try:
+        from src.instrumentation import instrument, text_input
+    except ImportError:
+        def instrument(name, counters=None):
+            return lambda func: func
+        text_input = None
+
+# Streaming DOCX reader (falls back to python-docx when running standalone)
 try:
-    import PyPDF2
+    from ..src.docx_stream import iter_docx
 except ImportError:
-    PyPDF2 = None
+    try:
+        from src.docx_stream import iter_docx
+    except ImportError:
+        iter_docx = None
 
+# Streaming XLSX / CSV reader (optional: the tool also runs standalone)
 try:
-    import docx
+    from ..src.spreadsheet import iter_spreadsheet
 except ImportError:
-    docx = None
+    try:
+        from src.spreadsheet import iter_spreadsheet
+    except ImportError:
+        iter_spreadsheet = None
 
 
 # -----------------------------------------------------------------------------
@@ -32,7 +53,9 @@ class InputHandler:
             return f"Error reading text file: {e}"
 
     def read_pdf(self, file_path):
-        if not PyPDF2:
+        try:
+            import PyPDF2
+        except ImportError:
             return "Error: PyPDF2 library not installed. Cannot read PDF."
         try:
             text = ""
@@ -45,7 +68,16 @@ class InputHandler:
             return f"Error reading PDF: {e}"
 
     def read_docx(self, file_path):
-        if not docx:
+        if iter_docx is not None:
+            # Paragraphs and table rows, streamed in document order
+            try:
+                return "\n".join(item["text"] if item["type"] == "paragraph" else " ".join(item["cells"])
+                                 for item in iter_docx(file_path))
+            except Exception as e:
+                return f"Error reading DOCX: {e}"
+        try:
+            import docx
+        except ImportError:
             return "Error: python-docx library not installed. Cannot read DOCX."
         try:
             doc = docx.Document(file_path)
@@ -54,6 +86,18 @@ class InputHandler:
         except Exception as e:
             return f"Error reading DOCX: {e}"
 
+    def read_spreadsheet(self, file_path, kind):
+        if iter_spreadsheet is None:
+            return f"Error: spreadsheet reader not available. Cannot read {kind.upper()}."
+        try:
+            # One line per row, cells separated by spaces
+            return "\n".join(" ".join(cell for cell in item["cells"] if cell)
+                             for item in iter_spreadsheet(file_path, kind))
+        except ImportError:
+            return "Error: openpyxl library not installed. Cannot read XLSX."
+        except Exception as e:
+            return f"Error reading {kind.upper()}: {e}"
+
     def read_json(self, file_path):
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -71,6 +115,10 @@ class InputHandler:
             return self.read_pdf(file_path)
         elif ext == '.docx':
             return self.read_docx(file_path)
+        elif ext in ('.xlsx', '.xlsm'):
+            return self.read_spreadsheet(file_path, 'xlsx')
+        elif ext == '.csv':
+            return self.read_spreadsheet(file_path, 'csv')
         elif ext == '.json':
             return self.read_json(file_path)
         else:
@@ -137,6 +185,7 @@ class KeywordExtractor:
         
         return text
 
+    @instrument("keywords.extract", counters=text_input)
     def extract_keywords(self, text):
         # Pre-process text to fix OCR errors
         text = self.preprocess_text(text)
@@ -203,6 +252,7 @@ class CableClassifier:
             ]
         }
 
+    @instrument("keywords.classify", counters=text_input)
     def classify(self, text):
         text_lower = text.lower()
         detected_categories = []
@@ -1,7 +1,19 @@
 import argparse
 import os
+import sys
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Thin client: if a warm daemon is running (see daemon.py), let it do the work
+    from daemon import forward_to_daemon
+    exit_code = forward_to_daemon("main", argv)
+    if exit_code is not None:
+        if exit_code:
+            sys.exit(exit_code)
+        return
 
-def main():
     parser = argparse.ArgumentParser(description="Cable Specification OCR System")
     parser.add_argument("--image", required=True, help="Path to input image")
     parser.add_argument("--mode", choices=["text", "table"], default="text", help="Operation mode: 'text' for specs/text extraction, 'table' for table extraction")
@@ -11,7 +23,7 @@ def main():
     parser.add_argument("--langs", default="en", help="Comma-separated list of languages (e.g., 'en,ar')")
     parser.add_argument("--use-spacy", action="store_true", help="Use SpaCy for robust specification extraction")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     print(f"DEBUG: Received image path: '{args.image}'")
     print(f"DEBUG: Absolute path: '{os.path.abspath(args.image)}'")
@@ -25,11 +37,12 @@ def main():
     languages = args.langs.split(',')
     
     # Lazy imports
-    from src.core_ocr import OCREngine
+    from src.core_ocr import get_engine
     from src.extraction import SpecificationExtractor
     from src.table_engine import TableExtractor
 
-    ocr = OCREngine(languages=languages)
+    # Shared engine: created once, stays loaded when running inside the daemon
+    ocr = get_engine(languages)
 
     if args.mode == "text":
         print(f"Reading text from: {args.image} ...")
@@ -42,8 +55,8 @@ def main():
         
         if args.use_spacy:
             print("(Using SpaCy Extractor)")
-            from src.spacy_extraction import SpacyExtractor
-            extractor = SpacyExtractor()
+            from src.spacy_extraction import get_spacy_extractor
+            extractor = get_spacy_extractor()
         else:
             print("(Using Standard Regex Extractor)")
             extractor = SpecificationExtractor()
@@ -0,0 +1,153 @@
+import threading
+import time
+from concurrent.futures import Future
+
+
+def recognize_batch(reader, crops, max_width, batch_size=64, ignore_char=None):
+    """
+    One recognition pass over pre-cropped text boxes [(box, crop), ...],
+    the same call reader.readtext makes after detection.
+    :return: [(box, text, confidence), ...] in input order
+    """
+    from easyocr.recognition import get_text
+    if ignore_char is None:
+        ignore_char = ''.join(set(reader.character) - set(reader.lang_char))
+    return get_text(
+        reader.character, reader.imgH, int(max_width),
+        reader.recognizer, reader.converter, crops,
+        ignore_char, 'greedy', 5, batch_size,
+        0.1, 0.5, 0.003, 0, reader.device,
+    )
+
+
+class RecognitionBatcher:
+    """
+    Dynamic batching layer for the EasyOCR recognizer.
+
+    Each caller still runs text *detection* on its own page, but the cropped
+    text boxes are handed to a single background thread that groups crops
+    from several in-flight pages/documents into one recognition pass. A batch
+    is sent when it reaches `max_batch_size` crops or when the oldest crop
+    has waited `max_wait_ms`, trading a few milliseconds of latency for far
+    fuller recognizer batches when many small documents arrive at once.
+
+    Results are identical in format to `reader.readtext`. Because crops in a
+    batch are padded to a common width, confidences can differ marginally
+    from unbatched CPU recognition (same as EasyOCR's own GPU batch mode).
+    """
+    def __init__(self, reader, max_batch_size=64, max_wait_ms=10):
+        # Lazy import, like OCREngine, so importing this module stays cheap
+        from easyocr.utils import get_image_list, reformat_input
+        self._get_image_list = get_image_list
+        self._reformat_input = reformat_input
+
+        self.reader = reader
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.ignore_char = ''.join(set(reader.character) - set(reader.lang_char))
+
+        self._pending = []
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.batches = 0
+        self.crops = 0
+
+        self._thread = threading.Thread(target=self._run, name="ocr-batcher", daemon=True)
+        self._thread.start()
+
+    # --- Public API ---
+    def readtext(self, image, detail=1):
+        """
+        Drop-in replacement for reader.readtext(image, detail=detail).
+        Blocks until this page's crops have been recognized.
+        """
+        img, img_cv_grey = self._reformat_input(image)
+        horizontal_list, free_list = self.reader.detect(img, reformat=False)
+        # detect() returns one list per input image
+        horizontal_list, free_list = horizontal_list[0], free_list[0]
+
+        image_list, max_width = self._get_image_list(horizontal_list, free_list, img_cv_grey,
+                                                     model_height=self.reader.imgH)
+        result = self.recognize_crops(image_list, max_width).result() if image_list else []
+
+        if detail == 0:
+            return [item[1] for item in result]
+        return result
+
+    def recognize_crops(self, image_list, max_width):
+        """
+        Queue pre-cropped boxes [(box, crop), ...] for recognition.
+        :return: Future resolving to [(box, text, confidence), ...] in input order.
+        """
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("RecognitionBatcher is closed")
+            self._pending.append((time.perf_counter(), image_list, max_width, future))
+            self._cond.notify()
+        return future
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "crops": self.crops,
+            "avg_batch_size": round(self.crops / self.batches, 1) if self.batches else 0.0,
+        }
+
+    # --- Background worker ---
+    def _collect(self):
+        """Wait for a full batch or for the oldest request's deadline."""
+        with self._cond:
+            while True:
+                if not self._pending:
+                    if self._closed:
+                        return None
+                    self._cond.wait()
+                    continue
+
+                queued = sum(len(req[1]) for req in self._pending)
+                deadline = self._pending[0][0] + self.max_wait
+                remaining = deadline - time.perf_counter()
+                if queued >= self.max_batch_size or remaining <= 0 or self._closed:
+                    break
+                self._cond.wait(timeout=remaining)
+
+            # Take whole requests until the batch is full (a request is never split)
+            batch, size = [], 0
+            while self._pending and (not batch or size + len(self._pending[0][1]) <= self.max_batch_size):
+                request = self._pending.pop(0)
+                batch.append(request)
+                size += len(request[1])
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+
+            crops = [crop for req in batch for crop in req[1]]
+            max_width = max(req[2] for req in batch)
+            try:
+                results = recognize_batch(self.reader, crops, max_width,
+                                          batch_size=self.max_batch_size, ignore_char=self.ignore_char)
+            except Exception as e:
+                for req in batch:
+                    req[3].set_exception(e)
+                continue
+
+            self.batches += 1
+            self.crops += len(crops)
+
+            # Route results back to their owners
+            offset = 0
+            for _, image_list, _, future in batch:
+                future.set_result(results[offset:offset + len(image_list)])
+                offset += len(image_list)
@@ -1,13 +1,70 @@
-import cv2
-import numpy as np
+import importlib
 import os
+import re
+import threading
 try:
-    from src.pdf_utils import convert_pdf_to_images
-    from src.docx_utils import process_docx
+    from .io_utils import as_buffer, detect_kind, is_path
+    from .batching import RecognitionBatcher, recognize_batch
+    from .instrumentation import byte_size, count_words, instrument
+    from .memory import MemoryBudget
+    from .triage import TRIAGE_THUMB_EDGE, triage_pages
+    from .quality import ImageQualityError, apply_quality_gate
 except ImportError:
     # Fallback if running from root or different context
-    from pdf_utils import convert_pdf_to_images
-    from docx_utils import process_docx
+    from io_utils import as_buffer, detect_kind, is_path
+    from batching import RecognitionBatcher, recognize_batch
+    from instrumentation import byte_size, count_words, instrument
+    from memory import MemoryBudget
+    from triage import TRIAGE_THUMB_EDGE, triage_pages
+    from quality import ImageQualityError, apply_quality_gate
+
+# cv2, numpy, PyMuPDF (pdf_utils) and PIL (docx_utils) are imported on
+# first use, so importing this module (and the interface) stays cheap for
+# callers that only validate specs.
+
+
+def _sibling(name):
+    """
+    Imports a module of this package on first use, under the same package
+    name as this module (or top-level when src/ itself is on sys.path), so
+    no second copy of it gets loaded.
+    """
+    if __package__:
+        return importlib.import_module(f".{name}", __package__)
+    return importlib.import_module(name)
+
+
+# Low-memory mode: longest page side in pixels (A4 at 2x zoom is ~1684)
+LOW_MEMORY_MAX_EDGE = 2500
+
+# Two-pass mode: long edge of the coarse pass, and the text re-read at full
+# resolution (low confidence, or digits with a unit like "6 mm2", "0.6/1kV")
+TWO_PASS_COARSE_EDGE = 1280
+TWO_PASS_MIN_CONFIDENCE = 0.6
+SPEC_VALUE_PATTERN = re.compile(
+    r"\d[\d\s./x×,]*\s*(?:mm|k?v|a(?:mps?)?|°\s*c?|c|m?ω|ohm|km)(?![a-z])", re.IGNORECASE)
+
+
+def _read_counts(results, args, kwargs):
+    return {"words": count_words(results), "bytes": byte_size(args[1] if len(args) > 1 else kwargs.get("image_path"))}
+
+
+def _render_counts(rendered, args, kwargs):
+    return {"pages": len(rendered["pages"]), "bytes": byte_size(args[1] if len(args) > 1 else kwargs.get("image_path"))}
+
+
+def _refine_counts(results, args, kwargs):
+    return {"words": count_words(results)}
+
+
+def _read_images_counts(results, args, kwargs):
+    return {"pages": len(results), "words": sum(count_words(r) for r in results)}
+
+
+def _recognize_counts(results, args, kwargs):
+    rendered = args[1] if len(args) > 1 else kwargs["rendered"]
+    return {"pages": len(rendered["pages"]), "words": count_words(results)}
+
 
 class OCREngine:
     def __init__(self, languages=['en'], gpu=True):
@@ -28,45 +85,458 @@ class OCREngine:
         print(f"Models will be stored in: {model_dir}")
         
         self.reader = easyocr.Reader(languages, gpu=gpu, model_storage_directory=model_dir, download_enabled=True)
+        self.batcher = None
+        self.low_memory = None
+        self.two_pass = None
+        self.triage = None
+        self.quality_gate = None
+
+    def enable_batching(self, max_batch_size=64, max_wait_ms=10):
+        """
+        Route recognition through a RecognitionBatcher, so text crops from
+        pages read concurrently (e.g. by several pipeline OCR workers) share
+        recognizer batches. Detection still runs per page.
+        :param max_batch_size: Max crops per recognition pass
+        :param max_wait_ms: Max time a crop waits for the batch to fill
+        """
+        if self.batcher is None:
+            self.batcher = RecognitionBatcher(self.reader, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        return self.batcher
+
+    def disable_batching(self):
+        if self.batcher is not None:
+            self.batcher.close()
+            self.batcher = None
+
+    def enable_low_memory(self, max_edge=LOW_MEMORY_MAX_EDGE, budget_mb=None, grayscale=True):
+        """
+        Memory-aware rendering for large documents: grayscale pages (EasyOCR
+        reads grayscale anyway), a cap on the longest page side, and an
+        optional peak-RSS budget. Near the budget, pages are rendered at
+        lower resolution; over it, new documents wait until the ones in
+        flight have been recognized and freed.
+        :param max_edge: Longest page side in pixels (None: no cap)
+        :param budget_mb: Peak RSS budget in MB (None: no budget)
+        :param grayscale: Render and decode pages as single-channel images
+        """
+        self.low_memory = {
+            "grayscale": grayscale,
+            "max_edge": max_edge,
+            "budget": MemoryBudget(budget_mb) if budget_mb else None,
+        }
+        return self.low_memory
+
+    def disable_low_memory(self):
+        self.low_memory = None
+
+    def enable_two_pass(self, coarse_edge=TWO_PASS_COARSE_EDGE, min_confidence=TWO_PASS_MIN_CONFIDENCE,
+                        refine_specs=True):
+        """
+        Coarse-to-fine reading: each page is first read downscaled to
+        `coarse_edge` pixels (long side). Only regions read with confidence
+        below `min_confidence`, or whose text looks like a spec value
+        (digits plus a unit) when `refine_specs` is set, are re-recognized
+        from the full-resolution page. Pages already near the coarse size are
+        read once at full resolution. Boxes are returned in full-resolution
+        coordinates either way.
+        """
+        self.two_pass = {"coarse_edge": coarse_edge, "min_confidence": min_confidence,
+                         "refine_specs": refine_specs, "regions": 0, "refined": 0}
+        return self.two_pass
+
+    def disable_two_pass(self):
+        self.two_pass = None
+
+    def enable_triage(self, thresholds=None, thumb_edge=TRIAGE_THUMB_EDGE, rank=False):
+        """
+        Page triage for PDFs: before rendering at full resolution, every page
+        is scored from cheap signals (text-layer density and spec terms, edge
+        and table-line density of a thumbnail, table-grid cells) and pages
+        scoring below the threshold are not rendered or OCRed. At least one
+        page is always read.
+        :param thresholds: Overrides for triage.TRIAGE_THRESHOLDS
+        :param thumb_edge: Longest thumbnail side in pixels
+        :param rank: OCR kept pages best-first (only pays off with early exit).
+                     Results are returned in page order either way.
+        """
+        self.triage = {"thresholds": thresholds or {}, "thumb_edge": thumb_edge, "rank": rank,
+                       "pages": 0, "skipped": 0}
+        return self.triage
+
+    def disable_triage(self):
+        self.triage = None
+
+    def enable_quality_gate(self, thresholds=None, enhance=True):
+        """
+        Checks single images (uploads, arrays) before OCR: tiny or blurry
+        images raise quality.ImageQualityError at render time; under/over-
+        exposed, low-contrast or skewed ones are enhanced (CLAHE, deskew)
+        first. The report is stored in rendered['quality'].
+        :param thresholds: Overrides for quality.QUALITY_THRESHOLDS
+        :param enhance: Enhance flagged images (False: only report)
+        """
+        self.quality_gate = {"thresholds": thresholds or {}, "enhance": enhance,
+                             "checked": 0, "rejected": 0, "enhanced": 0}
+        return self.quality_gate
+
+    def disable_quality_gate(self):
+        self.quality_gate = None
+
+    def _check_quality(self, img, rendered):
+        """Runs the quality gate (when enabled) on a decoded image."""
+        settings = self.quality_gate
+        if settings is None:
+            return img
+        settings["checked"] += 1
+        try:
+            img, rendered["quality"] = apply_quality_gate(img, settings["thresholds"], enhance=settings["enhance"])
+        except ImageQualityError:
+            settings["rejected"] += 1
+            raise
+        settings["enhanced"] += rendered["quality"]["enhanced"]
+        return img
+
+    def _readtext(self, image, detail=1):
+        if self.two_pass is not None:
+            return self._readtext_two_pass(image, detail)
+        if self.batcher is not None:
+            return self.batcher.readtext(image, detail=detail)
+        return self.reader.readtext(image, detail=detail)
+
+    def _readtext_two_pass(self, image, detail):
+        import cv2
+        from easyocr.utils import reformat_input
+
+        settings = self.two_pass
+        img, img_cv_grey = reformat_input(image)
+        scale = settings["coarse_edge"] / max(img.shape[:2])
+        if scale > 0.8:
+            # Too small to gain from a coarse pass
+            results = self.batcher.readtext(img, detail=1) if self.batcher else self.reader.readtext(img, detail=1)
+        else:
+            small = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            coarse = self.batcher.readtext(small, detail=1) if self.batcher else self.reader.readtext(small, detail=1)
+            results = self._refine(coarse, scale, img_cv_grey)
+        if detail == 0:
+            return [item[1] for item in results]
+        return results
+
+    @instrument("ocr.refine", counters=_refine_counts)
+    def _refine(self, coarse, scale, img_cv_grey):
+        """
+        Maps coarse results to full-resolution boxes and re-recognizes the
+        uncertain / spec-value regions there (EasyOCR crops each box and
+        resizes it to the recognizer height, so small text is upscaled).
+        """
+        settings = self.two_pass
+        height, width = img_cv_grey.shape[:2]
+        results, refine = [], []
+        for points, text, confidence in coarse:
+            xs = [p[0] / scale for p in points]
+            ys = [p[1] / scale for p in points]
+            pad = max(2, int((max(ys) - min(ys)) * 0.15))
+            x_min, x_max = max(0, int(min(xs)) - pad), min(width, int(max(xs)) + pad)
+            y_min, y_max = max(0, int(min(ys)) - pad), min(height, int(max(ys)) + pad)
+            box = [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+            results.append((box, text, confidence))
+            if confidence < settings["min_confidence"] or (
+                    settings["refine_specs"] and SPEC_VALUE_PATTERN.search(text)):
+                refine.append(len(results) - 1)
+
+        settings["regions"] += len(results)
+        settings["refined"] += len(refine)
+        if not refine:
+            return results
+
+        # Cropped one box at a time: get_image_list sorts its crops by y and
+        # drops empty ones, and recognition returns crops in input order, so
+        # this keeps every crop tied to its result index
+        from easyocr.utils import get_image_list
+        crops, indices, max_width = [], [], 0
+        for index in refine:
+            (x_min, y_min), (x_max, y_max) = results[index][0][0], results[index][0][2]
+            image_list, crop_width = get_image_list([[x_min, x_max, y_min, y_max]], [], img_cv_grey,
+                                                    model_height=self.reader.imgH)
+            if image_list:
+                crops.extend(image_list)
+                indices.append(index)
+                max_width = max(max_width, crop_width)
+        if not crops:
+            return results
+
+        if self.batcher is not None:
+            fine = self.batcher.recognize_crops(crops, max_width).result()
+        else:
+            # reader.recognize's defaults (one crop per recognizer batch)
+            fine = recognize_batch(self.reader, crops, max_width, batch_size=1)
+
+        for index, (_, text, confidence) in zip(indices, fine):
+            if confidence >= results[index][2]:
+                results[index] = (results[index][0], text, confidence)
+        return results
 
-    def read_image(self, image_path, detail=1):
+    @instrument("ocr.read_image", counters=_read_counts)
+    def read_image(self, image_path, detail=1, filename=None):
         """
-        Read text from an image or PDF file.
-        :param image_path: Path to the image or PDF
+        Read text from an image, PDF, DOCX, or the cells of an XLSX / CSV.
+        :param image_path: Path to the file, its contents as bytes / file-like
+                           object (e.g. an upload buffer), or a decoded NumPy array
         :param detail: Detail level (1 for boxes and text, 0 for text only)
+        :param filename: Optional original filename, used to pick the format
+                         of in-memory inputs (otherwise sniffed from content)
         :return: Reading results
         """
-        if image_path.lower().endswith('.pdf'):
-            print(f"Detected PDF: {image_path}. Converting to images...")
-            images = convert_pdf_to_images(image_path)
-            all_results = []
-            for i, img in enumerate(images):
-                print(f"Processing page {i+1}/{len(images)}...")
-                results = self.reader.readtext(img, detail=detail)
-                all_results.extend(results)
-            return all_results
+        return self.recognize(self.render(image_path, filename=filename), detail=detail)
+
+    @instrument("ocr.render", counters=_render_counts)
+    def render(self, image_path, filename=None):
+        """
+        First half of read_image: turn the input into page images, without OCR.
+        Split out so a pipeline can render the next document while the
+        recognizer is busy with the current one.
+        :return: dict with 'kind', 'pages' (arrays, or a path for EasyOCR to
+                 load itself) and 'results' (digital text, e.g. DOCX paragraphs);
+                 for DOCX and spreadsheets also 'records', the rows of their
+                 spec tables (records.TableRecords)
+        """
+        budget = self.low_memory and self.low_memory["budget"]
+        if not budget:
+            return self._render(image_path, filename)
+        # Held until recognize() has freed this document's pages
+        budget.admit()
+        try:
+            rendered = self._render(image_path, filename, scale=budget.scale())
+        except BaseException:
+            budget.release()
+            raise
+        rendered["budget"] = budget
+        return rendered
+
+    def _render(self, image_path, filename=None, scale=1.0):
+        settings = self.low_memory or {}
+        grayscale = settings.get("grayscale", False)
+        max_edge = int(settings["max_edge"] * scale) if settings.get("max_edge") else None
+
+        kind = detect_kind(image_path, filename)
+        label = filename or (image_path if is_path(image_path) else "<memory>")
+        rendered = {"kind": kind, "pages": [], "results": []}
+
+        if kind == "array":
+            rendered["pages"] = [self._check_quality(image_path, rendered)]
+            return rendered
+
+        if kind == "pdf":
+            pdf_utils = _sibling("pdf_utils")
+            keep = None
+            if self.triage is not None:
+                if not is_path(image_path):
+                    # Read once: the previews and the render both open the PDF
+                    image_path = as_buffer(image_path)
+                previews = pdf_utils.preview_pdf_pages(image_path, max_edge=self.triage["thumb_edge"])
+                if previews:
+                    keep, rendered["triage"] = triage_pages(
+                        previews, self.triage["thresholds"], rank=self.triage["rank"])
+                    rendered["page_numbers"] = keep
+                    self.triage["pages"] += len(previews)
+                    self.triage["skipped"] += len(previews) - len(keep)
+                del previews
+            print(f"Detected PDF: {label}. Converting to images...")
+            rendered["pages"] = pdf_utils.convert_pdf_to_images(
+                image_path, zoom=2.0 * scale, grayscale=grayscale, max_edge=max_edge, pages=keep)
+            return rendered
             
-        elif image_path.lower().endswith('.docx'):
-            print(f"Detected DOCX: {image_path}. extracting text and images...")
-            return process_docx(image_path, self, detail=detail)
+        elif kind == "docx":
+            print(f"Detected DOCX: {label}. extracting text and images...")
+            try:
+                rendered["records"] = []
+                rendered["results"], rendered["pages"] = _sibling("docx_utils").load_docx(
+                    image_path, grayscale=grayscale, max_edge=max_edge, records=rendered["records"])
+            except Exception as e:
+                print(f"Error processing DOCX: {e}")
+            return rendered
+
+        elif kind in ("xlsx", "csv"):
+            # Catalog spreadsheets are read as cells, never rendered to pixels
+            print(f"Detected {kind.upper()}: {label}. Reading cells...")
+            rendered["records"] = []
+            rendered["results"] = _sibling("spreadsheet").load_spreadsheet(
+                image_path, kind, records=rendered["records"])
+            return rendered
+
+        import cv2
+        import numpy as np
+
+        flags = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
+
+        if not is_path(image_path):
+            # Decode straight from the upload buffer (np.frombuffer does not copy)
+            stream = np.frombuffer(as_buffer(image_path), dtype=np.uint8)
+            img = cv2.imdecode(stream, flags)
+            if img is None:
+                raise ValueError("Image decoding failed (Result is None).")
+            rendered["pages"] = [self._check_quality(_shrink(img, max_edge, scale), rendered)]
+            return rendered
 
         # Robust Image Loading for Windows paths
         try:
             # Try reading as byte stream first to handle non-standard paths
             if os.path.exists(image_path):
-                 import numpy as np
                  stream = np.fromfile(image_path, dtype=np.uint8)
-                 img = cv2.imdecode(stream, cv2.IMREAD_COLOR)
+                 img = cv2.imdecode(stream, flags)
                  if img is not None:
-                     return self.reader.readtext(img, detail=detail)
+                     rendered["pages"] = [self._check_quality(_shrink(img, max_edge, scale), rendered)]
+                     return rendered
+        except ImageQualityError:
+            raise
         except Exception as e:
             print(f"Warning: Robust image read failed ({e}), falling back to direct path...")
 
-        return self.reader.readtext(image_path, detail=detail)
+        rendered["pages"] = [image_path]
+        return rendered
+
+    @instrument("ocr.recognize", counters=_recognize_counts)
+    def recognize(self, rendered, detail=1, on_page=None, stop=None, max_pages=None):
+        """
+        Second half of read_image: run OCR on the pages produced by render().
+        :param on_page: Optional callback on_page(index, total, results), called
+                        as each page (PDF page, DOCX image, or the single image)
+                        finishes, e.g. to stream partial results.
+        :param stop: Optional stop(texts) called before each PDF page / DOCX
+                     image with the text read so far (DOCX text included);
+                     returning True skips the remaining pages.
+        :param max_pages: Max PDF pages / DOCX images to OCR (None: all).
+        Skipped page numbers (document pages, also after triage) end up in
+        rendered['skipped_pages'] and the reason ('stop' or 'max_pages') in
+        rendered['stopped'].
+        Each page buffer is released as soon as it has been read.
+        """
+        try:
+            return self._recognize(rendered, detail, on_page, stop, max_pages)
+        finally:
+            budget = rendered.pop("budget", None)
+            if budget is not None:
+                budget.release()
+
+    def _recognize(self, rendered, detail, on_page, stop=None, max_pages=None):
+        pages = rendered["pages"]
+        numbers = rendered.get("page_numbers") or range(len(pages))
+        rendered["skipped_pages"], rendered["stopped"] = [], None
+
+        def until(index, results):
+            if max_pages is not None and index >= max_pages:
+                rendered["stopped"] = "max_pages"
+            elif stop is not None and stop([r if isinstance(r, str) else r[1] for r in results]):
+                rendered["stopped"] = "stop"
+            else:
+                return False
+            rendered["skipped_pages"] = [numbers[j] for j in range(index, len(pages))]
+            return True
+
+        if rendered["kind"] == "pdf":
+            all_results, by_page = [], {}
+            for i, img in enumerate(pages):
+                if until(i, all_results):
+                    pages[i:] = [None] * (len(pages) - i)
+                    break
+                print(f"Processing page {numbers[i]+1} ({i+1}/{len(pages)})...")
+                results = self._readtext(img, detail=detail)
+                pages[i] = img = None
+                all_results.extend(results)
+                by_page[numbers[i]] = results
+                if on_page:
+                    on_page(i, len(pages), results)
+            # Ranked triage reads pages best-first; extraction takes the first
+            # match, so hand the text back in document order
+            return [r for number in sorted(by_page) for r in by_page[number]]
+
+        if rendered["kind"] == "docx":
+            docx_utils = _sibling("docx_utils")
+            text_results = rendered["results"]
+            docx_stop = None
+            if stop is not None or max_pages is not None:
+                docx_stop = lambda i, ocr_results: until(i, text_results + ocr_results)
+            results = text_results + docx_utils.ocr_docx_images(
+                pages, self, detail=detail, on_page=on_page, stop=docx_stop)
+            return docx_utils.finalize_results(results, detail)
+
+        if rendered["kind"] in ("xlsx", "csv"):
+            results = rendered["results"]
+            return [r[1] for r in results] if detail == 0 else results
+
+        results = self._readtext(pages[0], detail=detail)
+        pages[0] = None
+        if on_page:
+            on_page(0, 1, results)
+        return results
 
     def read_image_from_array(self, image_array, detail=1):
         """
         Read text from an image array (NumPy array).
         Useful when cropping images or processing before reading.
         """
-        return self.reader.readtext(image_array, detail=detail)
+        return self._readtext(image_array, detail=detail)
+
+    @instrument("ocr.read_images", counters=_read_images_counts)
+    def read_images(self, images, detail=1):
+        """
+        Read several images (e.g. the embedded images of a DOCX) with a single
+        recognition pass: text is detected per image, then the crops of all
+        images are recognized together (through the batcher when enabled).
+        :return: List of per-image results, as read_image_from_array returns them
+        """
+        if self.two_pass is not None or len(images) < 2:
+            return [self._readtext(img, detail=detail) for img in images]
+
+        from easyocr.utils import get_image_list, reformat_input
+
+        crops = []
+        for img in images:
+            img, img_cv_grey = reformat_input(img)
+            horizontal_list, free_list = self.reader.detect(img, reformat=False)
+            crops.append(get_image_list(horizontal_list[0], free_list[0], img_cv_grey,
+                                        model_height=self.reader.imgH))
+
+        if self.batcher is not None:
+            futures = [self.batcher.recognize_crops(*item) if item[0] else None for item in crops]
+            results = [future.result() if future else [] for future in futures]
+        else:
+            flat = [crop for image_list, _ in crops for crop in image_list]
+            max_width = max((width for image_list, width in crops if image_list), default=0)
+            recognized = recognize_batch(self.reader, flat, max_width) if flat else []
+            results, offset = [], 0
+            for image_list, _ in crops:
+                results.append(recognized[offset:offset + len(image_list)])
+                offset += len(image_list)
+
+        if detail == 0:
+            return [[item[1] for item in result] for result in results]
+        return results
+
+
+def _shrink(img, max_edge=None, scale=1.0):
+    """
+    Downscales an image so its longest side is at most max_edge (already
+    scaled by the memory budget), or by `scale` when there is no cap.
+    """
+    factor = min(1.0, max_edge / max(img.shape[:2])) if max_edge else scale
+    if factor >= 1.0:
+        return img
+    import cv2
+    return cv2.resize(img, None, fx=factor, fy=factor, interpolation=cv2.INTER_AREA)
+
+
+# Loading EasyOCR takes seconds, so one engine per language set is created on
+# first use and reused afterwards (by the interface, the CLIs and the daemon).
+_shared_engines = {}
+_shared_lock = threading.Lock()
+
+
+def get_engine(languages=('en',), gpu=True):
+    """
+    Returns a shared OCREngine for the given languages, creating it on first use.
+    """
+    key = (tuple(languages), gpu)
+    with _shared_lock:
+        if key not in _shared_engines:
+            _shared_engines[key] = OCREngine(languages=list(key[0]), gpu=gpu)
+        return _shared_engines[key]
@@ -0,0 +1,136 @@
+import io
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+
+# Streaming DOCX reader: walks word/document.xml straight from the zip with an
+# incremental parser, so a 500-page catalog is never held as a full document
+# tree (python-docx / lxml) and callers can start on the first paragraphs
+# while the rest is still being read. Standard library only.
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+R_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+DOCUMENT_PART = "word/document.xml"
+DOCUMENT_RELS = "word/_rels/document.xml.rels"
+
+# Run-level elements that stand for characters in paragraph text. Only
+# mapped inside a w:r: w:tab also defines tab stops in w:pPr/w:tabs.
+_RUN_CHARS = {W + "tab": "\t", W + "br": "\n", W + "cr": "\n"}
+
+
+def open_package(docx_source):
+    """
+    Open a DOCX zip from a path or from memory (bytes / file-like).
+    """
+    if isinstance(docx_source, (bytes, bytearray)):
+        docx_source = io.BytesIO(docx_source)
+    elif isinstance(docx_source, memoryview):
+        docx_source = io.BytesIO(docx_source.tobytes())
+    return zipfile.ZipFile(docx_source)
+
+
+def iter_docx(docx_source):
+    """
+    Yields the body of a DOCX in document order:
+
+        {"type": "paragraph", "text": "..."}
+        {"type": "row", "table": 0, "row": 3, "cells": ["Voltage", "0.6/1 kV"]}
+
+    Paragraphs inside table cells are not yielded on their own; a cell's
+    text is its paragraphs joined with newlines (as python-docx cell.text).
+    Nested tables are numbered in the order they start and yield their own
+    rows. Text boxes are read once (the legacy fallback copy is skipped):
+    each of their paragraphs is yielded on its own, just before the
+    paragraph that anchors the box (python-docx paragraph.text leaves
+    text-box text out).
+
+    :param docx_source: Path to the .docx file, or its contents as bytes / file-like.
+    """
+    with open_package(docx_source) as package, package.open(DOCUMENT_PART) as stream:
+        body = None
+        paragraphs = []     # stack of text buffers (text boxes nest paragraphs)
+        tables = []         # stack of {"table", "row", "cells", "cell"} for open tables
+        table_count = 0
+        runs = 0            # depth inside w:r (text boxes nest runs)
+        skip = 0            # depth inside mc:Fallback
+
+        for event, elem in ET.iterparse(stream, events=("start", "end")):
+            tag = elem.tag
+            if tag == MC_FALLBACK:
+                skip += 1 if event == "start" else -1
+                continue
+            if skip:
+                if event == "end":
+                    elem.clear()
+                continue
+
+            if event == "start":
+                if tag == W + "body":
+                    body = elem
+                elif tag == W + "p":
+                    paragraphs.append([])
+                elif tag == W + "r":
+                    runs += 1
+                elif tag == W + "tbl":
+                    tables.append({"table": table_count, "row": 0, "cells": None, "cell": None})
+                    table_count += 1
+                elif tag == W + "tr" and tables:
+                    tables[-1]["cells"] = []
+                elif tag == W + "tc" and tables:
+                    tables[-1]["cell"] = []
+                continue
+
+            # --- end events ---
+            if tag == W + "t" and paragraphs:
+                paragraphs[-1].append(elem.text or "")
+            elif tag in _RUN_CHARS and runs and paragraphs:
+                paragraphs[-1].append(_RUN_CHARS[tag])
+            elif tag == W + "r":
+                runs -= 1
+            elif tag == W + "p" and paragraphs:
+                text = "".join(paragraphs.pop())
+                if tables and tables[-1]["cell"] is not None:
+                    tables[-1]["cell"].append(text)
+                else:
+                    yield {"type": "paragraph", "text": text}
+            elif tag == W + "tc" and tables and tables[-1]["cell"] is not None:
+                table = tables[-1]
+                table["cells"].append("\n".join(table["cell"]))
+                table["cell"] = None
+            elif tag == W + "tr" and tables and tables[-1]["cells"] is not None:
+                table = tables[-1]
+                yield {"type": "row", "table": table["table"], "row": table["row"], "cells": table["cells"]}
+                table["row"] += 1
+                table["cells"] = None
+                elem.clear()    # a catalog can be one long table
+            elif tag == W + "tbl" and tables:
+                tables.pop()
+
+            # Finished top-level blocks are dropped, so memory stays flat
+            if tag in (W + "p", W + "tbl", W + "sectPr") and not paragraphs and not tables and body is not None:
+                body.clear()
+
+
+def iter_docx_images(docx_source):
+    """
+    Yields the raw bytes of each image referenced by the main document part
+    (the same relationships python-docx lists in doc.part.rels).
+    """
+    with open_package(docx_source) as package:
+        try:
+            rels = ET.fromstring(package.read(DOCUMENT_RELS))
+        except KeyError:
+            return
+        names = set(package.namelist())
+        for rel in rels.iter(R_NS + "Relationship"):
+            if not rel.get("Type", "").endswith("/image") or rel.get("TargetMode") == "External":
+                continue
+            target = rel.get("Target", "")
+            if target.startswith("/"):
+                name = target.lstrip("/")
+            else:
+                name = posixpath.normpath(posixpath.join(posixpath.dirname(DOCUMENT_PART), target))
+            if name in names:
+                yield package.read(name)
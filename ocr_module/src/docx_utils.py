@@ -1,64 +1,222 @@
-import docx
+import hashlib
 import io
 import numpy as np
 import cv2
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
+try:
+    from .instrumentation import byte_size, count_words, instrument
+    from .docx_stream import iter_docx, iter_docx_images
+    from .records import TableRecords
+except ImportError:
+    from instrumentation import byte_size, count_words, instrument
+    from docx_stream import iter_docx, iter_docx_images
+    from records import TableRecords
 
+# Text and images are streamed from the zip (docx_stream.py); python-docx is
+# only imported by open_docx() for callers that want the full object model.
+
+# Embedded images with a side below MIN_IMAGE_SIDE pixels or an aspect ratio
+# above MAX_IMAGE_ASPECT are icons, bullets and rules: not worth OCR
+MIN_IMAGE_SIDE = 48
+MAX_IMAGE_ASPECT = 10.0
+
+# Threads decoding embedded images (PIL releases the GIL while decoding)
+DECODE_WORKERS = 4
+
+
+def _load_counts(loaded, args, kwargs):
+    text_results, images = loaded
+    return {"pages": len(images), "words": count_words(text_results), "bytes": byte_size(args[0])}
+
+
+def _process_counts(results, args, kwargs):
+    return {"words": count_words(results), "bytes": byte_size(args[0])}
+
+
+def _records_counts(records, args, kwargs):
+    return {"bytes": byte_size(args[0])}
+
+
+def open_docx(docx_source):
+    """
+    Open a DOCX from a path or from memory (bytes / file-like).
+    """
+    import docx
+    if isinstance(docx_source, (bytes, bytearray, memoryview)):
+        docx_source = io.BytesIO(docx_source)
+    return docx.Document(docx_source)
+
+
+def iter_docx_results(docx_path, records=None):
+    """
+    Stream the digital text of a DOCX as EasyOCR-format results, in document
+    order: one per non-empty paragraph and one per non-empty table cell.
+    :param records: Optional list that collects the rows of spec tables as
+                    records (records.TableRecords) from the same pass.
+    """
+    tables = TableRecords(records) if records is not None else None
+    for item in iter_docx(docx_path):
+        if tables is not None and item["type"] == "row":
+            tables.add(item)
+        texts = [item["text"]] if item["type"] == "paragraph" else item["cells"]
+        for text in texts:
+            if text.strip():
+                # Create a "fake" OCR result for valid text
+                # Bbox is dummy [[0,0], [0,0], [0,0], [0,0]]
+                # Confidence is 1.0 because it's digital text
+                yield ([[0,0], [1,0], [1,1], [0,1]], text.strip(), 1.0)
+
+
+@instrument("docx.records", counters=_records_counts)
+def load_docx_records(docx_path):
+    """
+    Table fast path: raw spec records from the DOCX tables whose header row
+    names spec fields, one per product row. No text is extracted from the
+    paragraphs and no image is decoded.
+    :return: [{"table", "row", "specs"}, ...] (validate with records.validate_records)
+    """
+    tables = TableRecords()
+    for item in iter_docx(docx_path):
+        if item["type"] == "row":
+            tables.add(item)
+    return tables.records
+
+
+@instrument("docx.load", counters=_load_counts)
+def load_docx(docx_path, grayscale=False, max_edge=None, records=None):
+    """
+    Parse a DOCX into digital text and decoded embedded images, without OCR.
+
+    :param docx_path: Path to the .docx file, or its contents as bytes / file-like.
+    :param grayscale: Decode images as single-channel arrays.
+    :param max_edge: Optional cap in pixels on the longest side of an image
+                     (JPEGs are then decoded at reduced size directly).
+    :param records: Optional list to collect spec-table rows into (see
+                    load_docx_records); the table text is still returned.
+    :return: (text_results, images) where text_results are in EasyOCR format
+             and images is a list of RGB (or grayscale) numpy arrays.
+             Identical images (e.g. a logo on every page) are returned once,
+             and icons / rules (MIN_IMAGE_SIDE, MAX_IMAGE_ASPECT) are skipped.
+    """
+    # 1-2. Text from paragraphs and table cells (streamed, document order)
+    text_results = list(iter_docx_results(docx_path, records))
+
+    # 3. Extract Images (Advanced)
+    # Image relationships of the main document part, read from the zip
+    blobs, seen, duplicates = [], set(), 0
+    for image_data in iter_docx_images(docx_path):
+        # The same picture pasted several times is stored once per copy
+        digest = hashlib.blake2b(image_data, digest_size=16).digest()
+        if digest in seen:
+            duplicates += 1
+            continue
+        seen.add(digest)
+        blobs.append(image_data)
+
+    # 4. Decode the distinct images in parallel (input order is kept)
+    if len(blobs) > 1:
+        with ThreadPoolExecutor(max_workers=min(DECODE_WORKERS, len(blobs))) as pool:
+            decoded = list(pool.map(lambda blob: decode_image(blob, grayscale, max_edge), blobs))
+    else:
+        decoded = [decode_image(blob, grayscale, max_edge) for blob in blobs]
+    images = [img for img in decoded if img is not None]
+
+    if blobs:
+        print(f"DOCX images: {len(blobs) + duplicates} embedded, {duplicates} duplicate(s), "
+              f"{len(blobs) - len(images)} skipped, {len(images)} to OCR")
+    return text_results, images
+
+
+def decode_image(image_data, grayscale=False, max_edge=None):
+    """
+    Decode one embedded image to a numpy array.
+    :return: Array, or None for icons / rules (checked from the header,
+             before decoding) and unreadable images.
+    """
+    try:
+        # Using PIL first to handle formats safely
+        pil_img = Image.open(io.BytesIO(image_data))
+        width, height = pil_img.size
+        if min(width, height) < MIN_IMAGE_SIDE or max(width, height) > MAX_IMAGE_ASPECT * min(width, height):
+            return None
+        if max_edge:
+            pil_img.draft(pil_img.mode, (max_edge, max_edge))
+            pil_img.thumbnail((max_edge, max_edge))
+        pil_img = pil_img.convert('L' if grayscale else 'RGB')
+        return np.array(pil_img)
+    except Exception as img_e:
+        print(f"Failed to process an embedded image: {img_e}")
+        return None
+
+
+def ocr_docx_images(images, ocr_engine, detail=1, on_page=None, stop=None):
+    """
+    Run OCR on the embedded images returned by load_docx. Without `stop`,
+    all images go through one batched recognition pass (OCREngine.read_images).
+    :param on_page: Optional callback on_page(index, total, results) per image.
+    :param stop: Optional stop(index, results) called before each image with
+                 the results so far; returning True skips the remaining images
+                 (images are then read one by one).
+    """
+    results = []
+    if stop is None and len(images) > 1 and hasattr(ocr_engine, "read_images"):
+        print(f"Running OCR on {len(images)} embedded images in one batch...")
+        try:
+            per_image = ocr_engine.read_images(images, detail=detail)
+        except Exception as img_e:
+            print(f"Batched image OCR failed ({img_e}), reading images one by one...")
+        else:
+            images[:] = [None] * len(images)
+            for i, ocr_results in enumerate(per_image):
+                results.extend(ocr_results)
+                if on_page:
+                    on_page(i, len(per_image), ocr_results)
+            return results
+
+    for i, img_array in enumerate(images):
+        if stop is not None and stop(i, results):
+            images[i:] = [None] * (len(images) - i)
+            break
+        try:
+            print(f"Found embedded image of size {img_array.shape}, running OCR...")
+            ocr_results = ocr_engine.read_image_from_array(img_array, detail=detail)
+            results.extend(ocr_results)
+            if on_page:
+                on_page(i, len(images), ocr_results)
+        except Exception as img_e:
+            print(f"Failed to process an embedded image: {img_e}")
+        finally:
+            # Free the decoded image as soon as it has been read
+            images[i] = img_array = None
+    return results
+
+
+def finalize_results(results, detail):
+    # Filter results based on detail level
+    if detail == 0:
+        # Return only the text string (OCR results already are strings at
+        # detail=0; only the DOCX text tuples need unpacking)
+        return [r if isinstance(r, str) else r[1] for r in results]
+    else:
+        return results
+
+
+@instrument("docx.process", counters=_process_counts)
 def process_docx(docx_path, ocr_engine, detail=1):
     """
     Extract text and images from a DOCX file.
     
-    :param docx_path: Path to the .docx file.
+    :param docx_path: Path to the .docx file, or its contents as bytes / file-like.
     :param ocr_engine: Instance of OCREngine to process embedded images.
     :param detail: Detail level for OCR results.
     :return: List of results in EasyOCR format: [([[x,y]..], text, prob), ...]
     """
-    results = []
-    
     try:
-        doc = docx.Document(docx_path)
-        
-        # 1. Extract Text from Paragraphs
-        for para in doc.paragraphs:
-            if para.text.strip():
-                # Create a "fake" OCR result for valid text
-                # Bbox is dummy [[0,0], [0,0], [0,0], [0,0]]
-                # Confidence is 1.0 because it's digital text
-                results.append(([[0,0], [1,0], [1,1], [0,1]], para.text.strip(), 1.0))
-                
-        # 2. Extract Text from Tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip():
-                         results.append(([[0,0], [1,0], [1,1], [0,1]], cell.text.strip(), 1.0))
-
-        # 3. Extract Images (Advanced)
-        # Iterate through relationships to find image parts
-        # This covers images embedded in the document
-        for rel in doc.part.rels.values():
-            if "image" in rel.target_ref:
-                try:
-                    image_data = rel.target_part.blob
-                    # Convert bytes to numpy array
-                    # using PIL first to handle formats safely
-                    pil_img = Image.open(io.BytesIO(image_data))
-                    pil_img = pil_img.convert('RGB')
-                    img_array = np.array(pil_img)
-                    
-                    print(f"Found embedded image of size {img_array.shape}, running OCR...")
-                    ocr_results = ocr_engine.read_image_from_array(img_array, detail=detail)
-                    results.extend(ocr_results)
-                except Exception as img_e:
-                    print(f"Failed to process an embedded image: {img_e}")
-
+        text_results, images = load_docx(docx_path)
+        results = text_results + ocr_docx_images(images, ocr_engine, detail=detail)
     except Exception as e:
         print(f"Error processing DOCX: {e}")
         return []
 
-    # Filter results based on detail level
-    if detail == 0:
-        # Return only the text string
-        return [r[1] for r in results]
-    else:
-        return results
+    return finalize_results(results, detail)
@@ -1,4 +1,8 @@
 import re
+try:
+    from .instrumentation import instrument, text_input
+except ImportError:
+    from instrumentation import instrument, text_input
 
 class SpecificationExtractor:
     def __init__(self):
@@ -89,6 +93,7 @@ class SpecificationExtractor:
         
         return text
 
+    @instrument("extract.specs", counters=text_input)
     def extract_specs(self, text):
         """
         Extract specifications from full text (English Only).
@@ -136,7 +141,7 @@ class SpecificationExtractor:
             val = specs["conductor_size"]
             val = val.replace(" ", "")
             val = val.replace("mh", "mm").replace("?", "2")
-            if "mm" in val and not val.endswith("2"): # Append 2 if missing (e.g. 6mm -> 6mm2)
+            if "mm" in val and not val.endswith(("2", "²")): # Append 2 if missing (e.g. 6mm -> 6mm2)
                  val += "2"
             specs["conductor_size"] = val
 
@@ -325,6 +330,7 @@ class SpecCorrector:
             self.log("Resistance", orig, val, "Unit Formatting")
         return val
 
+    @instrument("extract.correct")
     def correct_all(self, specs):
         new_specs = specs.copy()
         self.corrections_log = []
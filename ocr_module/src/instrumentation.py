@@ -0,0 +1,243 @@
+import contextlib
+import contextvars
+import functools
+import os
+import threading
+import time
+from collections import deque
+
+# ==========================================
+# ⚙️ SETTINGS
+# ==========================================
+# Disabled by default: an instrumented call then costs one global lookup.
+# Enable with SPECSENSE_METRICS=1 or instrumentation.enable().
+_enabled = os.environ.get("SPECSENSE_METRICS", "").lower() in ("1", "true", "yes")
+
+# Recent wall times kept per stage for percentiles
+SAMPLE_WINDOW = 1024
+
+COUNTERS = ("pages", "words", "bytes")
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+# ==========================================
+# 📊 STATISTICS
+# ==========================================
+class StageStats:
+    """Accumulated timings and counters for one instrumented stage."""
+
+    def __init__(self, keep_samples=True):
+        self.calls = 0
+        self.errors = 0
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.wall_max = 0.0
+        self.counts = dict.fromkeys(COUNTERS, 0)
+        self.samples = deque(maxlen=SAMPLE_WINDOW) if keep_samples else None
+
+    def add(self, wall, cpu, ok, counts):
+        self.calls += 1
+        if not ok:
+            self.errors += 1
+        self.wall_seconds += wall
+        self.cpu_seconds += cpu
+        self.wall_max = max(self.wall_max, wall)
+        for key, value in counts.items():
+            self.counts[key] = self.counts.get(key, 0) + value
+        if self.samples is not None:
+            self.samples.append(wall)
+
+    def percentile(self, q):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1))))]
+
+    def to_dict(self):
+        info = {
+            "calls": self.calls,
+            "errors": self.errors,
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "wall_max": round(self.wall_max, 6),
+            **self.counts,
+        }
+        if self.samples is not None:
+            info["wall_p50"] = round(self.percentile(50), 6)
+            info["wall_p95"] = round(self.percentile(95), 6)
+        return info
+
+
+class Collector:
+    """
+    Per-document timings. Activate it around the work for one report; every
+    instrumented call made in that context is recorded here as well as in the
+    process-wide registry.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, wall, cpu, ok, counts):
+        with self._lock:
+            if name not in self.stages:
+                self.stages[name] = StageStats(keep_samples=False)
+            self.stages[name].add(wall, cpu, ok, counts)
+
+    @contextlib.contextmanager
+    def activate(self):
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def summary(self):
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self.stages.items()}
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+_current = contextvars.ContextVar("specsense_collector", default=None)
+
+
+def record(name, wall, cpu=0.0, ok=True, **counts):
+    """Adds one observation to the registry (and the active Collector, if any)."""
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = StageStats()
+        _registry[name].add(wall, cpu, ok, counts)
+    collector = _current.get()
+    if collector is not None:
+        collector.add(name, wall, cpu, ok, counts)
+
+
+def instrument(name, counters=None):
+    """
+    Decorator recording wall time, CPU time (of the calling thread) and
+    optional counters for every call while instrumentation is enabled.
+
+    :param name: Stage name, e.g. "ocr.render"
+    :param counters: Optional counters(result, args, kwargs) -> dict with any
+                     of 'pages', 'words', 'bytes'
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            wall, cpu = time.perf_counter(), time.thread_time()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                record(name, time.perf_counter() - wall, time.thread_time() - cpu, ok=False)
+                raise
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            counts = {}
+            if counters is not None:
+                try:
+                    counts = counters(result, args, kwargs)
+                except Exception:
+                    counts = {}  # Counting must never break the instrumented call
+            record(name, wall, cpu, ok=True, **counts)
+            return result
+        return wrapper
+    return decorator
+
+
+# ==========================================
+# 🔢 COUNTER HELPERS
+# ==========================================
+def count_words(results):
+    """Words in OCR output: strings or EasyOCR (box, text, conf) tuples."""
+    if isinstance(results, str):
+        return len(results.split())
+    total = 0
+    for item in results or ():
+        text = item[1] if isinstance(item, (tuple, list)) and len(item) > 1 else item
+        total += len(str(text).split())
+    return total
+
+
+def text_input(result, args, kwargs):
+    """Counters for functions taking text: words and bytes of the first str argument."""
+    text = next((a for a in args if isinstance(a, str)), "")
+    return {"words": len(text.split()), "bytes": len(text.encode("utf-8"))}
+
+
+def byte_size(source):
+    """Size in bytes of a path, buffer, file-like object or NumPy array (0 if unknown)."""
+    try:
+        if isinstance(source, (str, os.PathLike)):
+            return os.path.getsize(source)
+        if isinstance(source, (bytes, bytearray)):
+            return len(source)
+        if isinstance(source, memoryview):
+            return source.nbytes
+        if hasattr(source, "nbytes"):
+            return int(source.nbytes)
+        if hasattr(source, "getbuffer"):
+            return source.getbuffer().nbytes
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+# ==========================================
+# 📤 EXPORT
+# ==========================================
+def snapshot():
+    """Process-wide stats per stage, as plain dicts."""
+    with _registry_lock:
+        return {name: stats.to_dict() for name, stats in _registry.items()}
+
+
+def reset():
+    with _registry_lock:
+        _registry.clear()
+
+
+def export_prometheus(prefix="specsense"):
+    """Registry in the Prometheus text exposition format."""
+    stats = snapshot()
+    metrics = [
+        ("stage_calls_total", "counter", "Calls per stage", "calls"),
+        ("stage_errors_total", "counter", "Calls that raised an exception", "errors"),
+        ("stage_wall_seconds_total", "counter", "Wall-clock time spent in the stage", "wall_seconds"),
+        ("stage_cpu_seconds_total", "counter", "CPU time of the calling thread", "cpu_seconds"),
+        ("stage_pages_total", "counter", "Pages processed", "pages"),
+        ("stage_words_total", "counter", "Words produced or consumed", "words"),
+        ("stage_bytes_total", "counter", "Input bytes processed", "bytes"),
+        ("stage_wall_seconds_p95", "gauge", "95th percentile wall time of recent calls", "wall_p95"),
+    ]
+    lines = []
+    for metric, kind, help_text, field in metrics:
+        name = f"{prefix}_{metric}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for stage, values in sorted(stats.items()):
+            lines.append(f'{name}{{stage="{stage}"}} {values.get(field, 0)}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path, prefix="specsense"):
+    """Writes the export atomically (e.g. for node_exporter's textfile collector)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(export_prometheus(prefix))
+    os.replace(tmp_path, path)
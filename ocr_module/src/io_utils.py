@@ -0,0 +1,82 @@
+import io
+import os
+import zipfile
+
+# Magic bytes used to recognise in-memory uploads that come without a filename
+PDF_MAGIC = b"%PDF"
+ZIP_MAGIC = b"PK\x03\x04"  # DOCX and XLSX are zip containers
+
+# Spreadsheet catalogs: read as cells (src/spreadsheet.py), never rendered
+SPREADSHEET_EXTENSIONS = {".xlsx": "xlsx", ".xlsm": "xlsx", ".csv": "csv"}
+
+
+def is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+
+def as_buffer(source):
+    """
+    Return the raw bytes of an in-memory source without copying where possible.
+
+    :param source: bytes, bytearray, memoryview or a file-like object
+                   (e.g. io.BytesIO or Streamlit's UploadedFile).
+    :return: bytes-like object.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return source
+    # BytesIO (and UploadedFile) expose their buffer directly: zero copy
+    if hasattr(source, "getbuffer"):
+        return source.getbuffer()
+    if hasattr(source, "read"):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return source.read()
+    raise TypeError(f"Unsupported input type: {type(source).__name__}")
+
+
+def detect_kind(source, filename=None):
+    """
+    Decide how a document should be read: 'pdf', 'docx', 'xlsx', 'csv',
+    'image' or 'array'.
+
+    The extension of `filename` (or of the path itself) wins; in-memory
+    buffers without a name are recognised from their leading magic bytes.
+    """
+    if hasattr(source, "shape") and hasattr(source, "dtype"):
+        return "array"
+
+    name = filename
+    if name is None and is_path(source):
+        name = os.fspath(source)
+    if name is None:
+        name = getattr(source, "name", None)
+
+    if name:
+        ext = os.path.splitext(str(name))[1].lower()
+        if ext == ".pdf":
+            return "pdf"
+        if ext == ".docx":
+            return "docx"
+        if ext in SPREADSHEET_EXTENSIONS:
+            return SPREADSHEET_EXTENSIONS[ext]
+        if is_path(source):
+            return "image"
+
+    if not is_path(source):
+        head = bytes(as_buffer(source)[:4])
+        if head.startswith(PDF_MAGIC):
+            return "pdf"
+        if head.startswith(ZIP_MAGIC):
+            return _zip_kind(source)
+    return "image"
+
+
+def _zip_kind(source):
+    """'xlsx' for a workbook, else 'docx' (only the zip directory is read)."""
+    try:
+        with zipfile.ZipFile(io.BytesIO(as_buffer(source))) as package:
+            if "xl/workbook.xml" in package.namelist():
+                return "xlsx"
+    except zipfile.BadZipFile:
+        pass
+    return "docx"
@@ -0,0 +1,93 @@
+import os
+import sys
+import threading
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB (None if unavailable)."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil  # macOS / Windows
+        return round(psutil.Process().memory_info().rss / (1024 * 1024), 1)
+    except ImportError:
+        return None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None if unavailable)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+    except ImportError:
+        pass
+    try:
+        import psutil  # Windows
+        info = psutil.Process().memory_info()
+        return round(getattr(info, "peak_wset", info.rss) / (1024 * 1024), 1)
+    except ImportError:
+        return None
+
+
+class MemoryBudget:
+    """
+    Keeps the process near a peak RSS limit by trading speed for memory:
+
+    - resolution: scale() shrinks rendering (long edge / zoom) linearly from
+      1.0 at `soft_ratio` of the limit down to `min_scale` at the limit.
+    - concurrency: admit() holds back a new document while RSS is over the
+      limit and other documents are still in flight; release() is called
+      when a document's pages are freed. One document is always admitted,
+      so work never stalls.
+    """
+
+    def __init__(self, limit_mb, soft_ratio=0.8, min_scale=0.5, poll_seconds=0.05):
+        self.limit_mb = limit_mb
+        self.soft_mb = limit_mb * soft_ratio
+        self.min_scale = min_scale
+        self.poll_seconds = poll_seconds
+        self.in_flight = 0
+        self.throttled = 0
+        self.downscaled = 0
+        self._cond = threading.Condition()
+
+    def scale(self):
+        rss = current_rss_mb()
+        if rss is None or rss <= self.soft_mb:
+            return 1.0
+        self.downscaled += 1
+        over = min(1.0, (rss - self.soft_mb) / max(self.limit_mb - self.soft_mb, 1e-6))
+        return 1.0 - (1.0 - self.min_scale) * over
+
+    def _over_limit(self):
+        rss = current_rss_mb()
+        return rss is not None and rss > self.limit_mb
+
+    def admit(self):
+        with self._cond:
+            if self.in_flight and self._over_limit():
+                self.throttled += 1
+                while self.in_flight and self._over_limit():
+                    # RSS falls without a notification (GC, freed buffers), so poll
+                    self._cond.wait(self.poll_seconds)
+            self.in_flight += 1
+
+    def release(self):
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._cond.notify_all()
+
+    def stats(self):
+        return {
+            "limit_mb": self.limit_mb,
+            "rss_mb": current_rss_mb(),
+            "in_flight": self.in_flight,
+            "throttled": self.throttled,
+            "downscaled": self.downscaled,
+        }
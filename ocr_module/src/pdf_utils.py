@@ -1,30 +1,62 @@
+import os
 import fitz  # PyMuPDF
 import numpy as np
+try:
+    from .instrumentation import byte_size, instrument
+except ImportError:
+    from instrumentation import byte_size, instrument
 
-def convert_pdf_to_images(pdf_path, zoom=2.0):
+
+def _pdf_counts(images, args, kwargs):
+    return {"pages": len(images), "bytes": byte_size(args[0] if args else kwargs.get("pdf_path"))}
+
+
+def open_pdf(pdf_source):
+    """
+    Open a PDF from a path or from memory (bytes / file-like) without
+    writing it to disk first.
+    """
+    if isinstance(pdf_source, (str, os.PathLike)):
+        return fitz.open(pdf_source)
+    if hasattr(pdf_source, "getbuffer"):
+        pdf_source = pdf_source.getbuffer()
+    elif hasattr(pdf_source, "read"):
+        pdf_source = pdf_source.read()
+    if isinstance(pdf_source, memoryview):
+        pdf_source = pdf_source.tobytes()
+    return fitz.open(stream=pdf_source, filetype="pdf")
+
+
+@instrument("pdf.convert", counters=_pdf_counts)
+def convert_pdf_to_images(pdf_path, zoom=2.0, grayscale=False, max_edge=None, pages=None):
     """
     Convert a PDF file to a list of images (numpy arrays).
     
-    :param pdf_path: Path to the PDF file.
+    :param pdf_path: Path to the PDF file, or its contents as bytes / file-like.
     :param zoom: Zoom factor for higher resolution (default 2.0).
-    :return: List of numpy arrays representing images.
+    :param grayscale: Render single-channel pages (a third of the RGB memory).
+    :param max_edge: Optional cap in pixels on the longest side of a page;
+                     the zoom is lowered for pages that would exceed it.
+    :param pages: Optional page indices to render, in this order (default: all).
+    :return: List of numpy arrays representing images (H, W, 3), or (H, W)
+             when grayscale.
     """
     images = []
+    colorspace = fitz.csGRAY if grayscale else fitz.csRGB
     try:
-        doc = fitz.open(pdf_path)
-        mat = fitz.Matrix(zoom, zoom)  # Transformation matrix for higher resolution
+        doc = open_pdf(pdf_path)
         
-        for page in doc:
-            pix = page.get_pixmap(matrix=mat)
-            # Convert to numpy array (H, W, 3)
-            # fitz returns data as bytes, we need to reshape
-            img_array = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.h, pix.w, pix.n)
-            
-            # If alpha channel exists (4 channels), drop it to get RGB
-            if pix.n == 4:
-                img_array = img_array[..., :3]
-            
-            images.append(img_array)
+        for page in (doc if pages is None else (doc[i] for i in pages)):
+            page_zoom = zoom
+            if max_edge:
+                page_zoom = min(zoom, max_edge / max(page.rect.width, page.rect.height))
+            mat = fitz.Matrix(page_zoom, page_zoom)  # Transformation matrix for higher resolution
+            # alpha=False: PyMuPDF renders without an alpha channel, so the
+            # array is contiguous and nothing has to be sliced off
+            pix = page.get_pixmap(matrix=mat, colorspace=colorspace, alpha=False)
+            shape = (pix.h, pix.w) if pix.n == 1 else (pix.h, pix.w, pix.n)
+            images.append(np.frombuffer(pix.samples, dtype=np.uint8).reshape(shape))
+            del pix
             
         doc.close()
     except Exception as e:
@@ -32,3 +64,27 @@ def convert_pdf_to_images(pdf_path, zoom=2.0):
         return []
     
     return images
+
+
+@instrument("pdf.preview", counters=_pdf_counts)
+def preview_pdf_pages(pdf_path, max_edge=400):
+    """
+    Cheap look at every page for triage: the text layer and a small
+    grayscale thumbnail (longest side max_edge pixels).
+
+    :return: List of dicts with 'text' (str) and 'image' (H, W) numpy array.
+    """
+    previews = []
+    try:
+        doc = open_pdf(pdf_path)
+        for page in doc:
+            zoom = max_edge / max(page.rect.width, page.rect.height)
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+            image = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.h, pix.w)
+            previews.append({"text": page.get_text("text"), "image": image})
+            del pix
+        doc.close()
+    except Exception as e:
+        print(f"Error previewing PDF pages: {e}")
+        return []
+    return previews
@@ -0,0 +1,185 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+_STOP = object()
+
+
+class Stage:
+    """
+    One step of a pipeline.
+    :param name: Display name (used in stats).
+    :param func: Callable taking the item from the previous stage and returning
+                 the item for the next one.
+    :param workers: Number of threads running this stage.
+    :param queue_size: Capacity of the input queue. When it is full the
+                       previous stage blocks (backpressure).
+    """
+    def __init__(self, name, func, workers=1, queue_size=2):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.queue = queue.Queue(maxsize=max(1, queue_size))
+
+        self._lock = threading.Lock()
+        self._alive = self.workers
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.max_depth = 0
+
+    def record(self, seconds, ok):
+        with self._lock:
+            self.busy_seconds += seconds
+            if ok:
+                self.processed += 1
+            else:
+                self.failed += 1
+
+    def worker_exited(self):
+        """Returns True for the last worker of the stage to exit."""
+        with self._lock:
+            self._alive -= 1
+            return self._alive == 0
+
+
+class PipelineRunner:
+    """
+    Runs items through a chain of stages connected by bounded queues, each
+    stage with its own thread pool, so slow and fast stages overlap.
+
+    Usage:
+        with PipelineRunner([Stage("a", f), Stage("b", g, workers=2)]) as pipe:
+            futures = [pipe.submit(x) for x in items]
+            results = [f.result() for f in futures]
+
+    The value returned by the last stage becomes the future's result; an
+    exception raised by any stage becomes the future's exception.
+    """
+    def __init__(self, stages):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self._threads = []
+        self._started_at = None
+        self._closed = False
+        self._close_hooks = []
+
+    # --- Lifecycle ---
+    def start(self):
+        self._started_at = time.perf_counter()
+        for index, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                t = threading.Thread(target=self._work, args=(index,), name=f"{stage.name}-{n}", daemon=True)
+                t.start()
+                self._threads.append(t)
+        return self
+
+    def submit(self, item):
+        """
+        Queue an item for the first stage. Blocks while the first queue is full.
+        :return: concurrent.futures.Future resolving to the last stage's output.
+        """
+        if self._closed:
+            raise RuntimeError("Pipeline is closed")
+        if self._started_at is None:
+            self.start()
+        future = Future()
+        future.set_running_or_notify_cancel()
+        self._put(self.stages[0], (future, item))
+        return future
+
+    def add_close_hook(self, func):
+        """Call func() once every worker has stopped (e.g. to undo engine settings made for this pipeline)."""
+        self._close_hooks.append(func)
+
+    def close(self, wait=True):
+        """Let queued items finish, then stop all workers and run the close hooks."""
+        if self._closed:
+            return
+        self._closed = True
+        first = self.stages[0]
+        for _ in range(first.workers):
+            first.queue.put(_STOP)
+        if wait:
+            self._finish()
+        elif self._close_hooks:
+            threading.Thread(target=self._finish, name="pipeline-close", daemon=True).start()
+
+    def _finish(self):
+        for t in self._threads:
+            t.join()
+        for hook in reversed(self._close_hooks):
+            hook()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --- Workers ---
+    def _put(self, stage, entry):
+        stage.queue.put(entry)
+        depth = stage.queue.qsize()
+        if depth > stage.max_depth:
+            stage.max_depth = depth
+
+    def _work(self, index):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+
+        while True:
+            entry = stage.queue.get()
+            if entry is _STOP:
+                # The last worker of this stage shuts the next stage down,
+                # after every item it produced has been queued.
+                if stage.worker_exited() and next_stage is not None:
+                    for _ in range(next_stage.workers):
+                        next_stage.queue.put(_STOP)
+                return
+
+            future, item = entry
+            start = time.perf_counter()
+            try:
+                output = stage.func(item)
+            except BaseException as e:
+                stage.record(time.perf_counter() - start, ok=False)
+                future.set_exception(e)
+                continue
+            stage.record(time.perf_counter() - start, ok=True)
+
+            if next_stage is None:
+                future.set_result(output)
+            else:
+                self._put(next_stage, (future, output))
+
+    # --- Monitoring ---
+    def stats(self):
+        """
+        Per-stage queue depth and utilization.
+        utilization = busy time / (wall time * workers), i.e. 1.0 means the
+        stage never waited for input.
+        """
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        report = {}
+        for stage in self.stages:
+            capacity = elapsed * stage.workers
+            report[stage.name] = {
+                "workers": stage.workers,
+                "queue_depth": stage.queue.qsize(),
+                "max_queue_depth": stage.max_depth,
+                "processed": stage.processed,
+                "failed": stage.failed,
+                "busy_seconds": round(stage.busy_seconds, 3),
+                "utilization": round(stage.busy_seconds / capacity, 3) if capacity > 0 else 0.0,
+            }
+        return report
+
+    def format_stats(self):
+        lines = [f"{'Stage':<12}{'Workers':>8}{'Queue':>7}{'Max Q':>7}{'Done':>7}{'Failed':>8}{'Util':>7}"]
+        for name, s in self.stats().items():
+            lines.append(f"{name:<12}{s['workers']:>8}{s['queue_depth']:>7}{s['max_queue_depth']:>7}"
+                         f"{s['processed']:>7}{s['failed']:>8}{s['utilization']:>7.0%}")
+        return "\n".join(lines)
@@ -0,0 +1,162 @@
+import time
+try:
+    from .instrumentation import instrument
+except ImportError:
+    from instrumentation import instrument
+
+# Image-quality gate: millisecond checks on a decoded image before the
+# expensive OCR / YOLO run. Every failed check is a named gate. "too_small"
+# and "blurry" reject the image (nothing to recover); the exposure, contrast
+# and skew gates route it through enhance_image() instead.
+# cv2 and numpy are imported on first use.
+
+# The checks run on a copy whose long side is at most this many pixels, which
+# keeps them fast and makes sharpness comparable across resolutions
+QUALITY_ANALYSIS_EDGE = 1024
+
+QUALITY_THRESHOLDS = {
+    "min_pixels": 100_000,      # width x height, ~320x320 (too_small). Area, not the
+                                # short side: banner-shaped spec crops (1002x312) are legible
+    "min_sharpness": 25.0,      # variance of the Laplacian (blurry)
+    "min_brightness": 35,       # mean gray level (underexposed); dark-theme screenshots sit near 45
+    "max_brightness": 245,      # mean gray level (overexposed)
+    "min_contrast": 60,         # 5th-95th percentile gray spread (low_contrast)
+    "max_skew_degrees": 1.0,    # dominant line angle (skewed); None: no skew check
+}
+
+REJECT_GATES = ("too_small", "blurry")
+
+
+class ImageQualityError(ValueError):
+    """Raised when an image fails a reject gate; .quality holds the report."""
+
+    def __init__(self, quality):
+        self.quality = quality
+        super().__init__("Image rejected by quality gate: " + "; ".join(quality["reasons"]))
+
+
+def _gray(img):
+    import cv2
+    if img.ndim == 2:
+        return img
+    return cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY if img.shape[2] == 4 else cv2.COLOR_BGR2GRAY)
+
+
+def estimate_skew(gray):
+    """
+    Quick skew estimate in degrees: median angle of the long, near-horizontal
+    line segments (text baselines, table rules). 0.0 when none are found.
+    """
+    import cv2
+    import numpy as np
+
+    edges = cv2.Canny(gray, 50, 150)
+    lines = cv2.HoughLinesP(edges, 1, np.pi / 180, threshold=80,
+                            minLineLength=max(20, gray.shape[1] // 8), maxLineGap=10)
+    if lines is None:
+        return 0.0
+    angles = [np.degrees(np.arctan2(y2 - y1, x2 - x1)) for x1, y1, x2, y2 in lines.reshape(-1, 4)]
+    angles = [a for a in angles if abs(a) < 30]
+    return round(float(np.median(angles)), 2) if angles else 0.0
+
+
+@instrument("quality.assess")
+def assess_quality(img, thresholds=None):
+    """
+    Measures resolution, sharpness, exposure, contrast and (optionally) skew.
+    :param img: Decoded image (BGR, BGRA or grayscale numpy array).
+    :param thresholds: Overrides for QUALITY_THRESHOLDS.
+    :return: dict with the measurements, the triggered 'gates', readable
+             'reasons' and the 'action': 'pass', 'enhance' or 'reject'
+    """
+    import cv2
+    import numpy as np
+
+    start = time.perf_counter()
+    t = dict(QUALITY_THRESHOLDS, **(thresholds or {}))
+    height, width = img.shape[:2]
+    gray = _gray(img)
+    factor = QUALITY_ANALYSIS_EDGE / max(height, width)
+    if factor < 1.0:
+        gray = cv2.resize(gray, None, fx=factor, fy=factor, interpolation=cv2.INTER_AREA)
+
+    sharpness = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+    brightness = float(gray.mean())
+    low, high = np.percentile(gray, (5, 95))
+    contrast = float(high - low)
+    skew = estimate_skew(gray) if t["max_skew_degrees"] is not None else None
+
+    gates, reasons = [], []
+
+    def gate(name, failed, reason):
+        if failed:
+            gates.append(name)
+            reasons.append(f"{name} ({reason})")
+
+    gate("too_small", height * width < t["min_pixels"], f"{width}x{height} px < {t['min_pixels']} px")
+    gate("blurry", sharpness < t["min_sharpness"], f"sharpness {sharpness:.1f} < {t['min_sharpness']}")
+    gate("underexposed", brightness < t["min_brightness"], f"brightness {brightness:.0f} < {t['min_brightness']}")
+    gate("overexposed", brightness > t["max_brightness"], f"brightness {brightness:.0f} > {t['max_brightness']}")
+    gate("low_contrast", contrast < t["min_contrast"], f"contrast {contrast:.0f} < {t['min_contrast']}")
+    gate("skewed", skew is not None and abs(skew) > t["max_skew_degrees"],
+         f"{skew}° > {t['max_skew_degrees']}°")
+
+    if any(g in REJECT_GATES for g in gates):
+        action = "reject"
+    else:
+        action = "enhance" if gates else "pass"
+    return {
+        "width": width,
+        "height": height,
+        "sharpness": round(sharpness, 1),
+        "brightness": round(brightness, 1),
+        "contrast": round(contrast, 1),
+        "skew_degrees": skew,
+        "gates": gates,
+        "reasons": reasons,
+        "action": action,
+        "enhanced": False,
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+
+
+def enhance_image(img, quality):
+    """
+    Fixes what the enhance gates flagged: rotates skewed images level and
+    normalizes exposure / contrast with CLAHE (on the L channel for colour).
+    :return: New array (the input is not modified)
+    """
+    import cv2
+
+    gates = quality["gates"]
+    if "skewed" in gates:
+        height, width = img.shape[:2]
+        matrix = cv2.getRotationMatrix2D((width / 2, height / 2), quality["skew_degrees"], 1.0)
+        img = cv2.warpAffine(img, matrix, (width, height), flags=cv2.INTER_LINEAR,
+                             borderMode=cv2.BORDER_REPLICATE)
+
+    if any(g in gates for g in ("underexposed", "overexposed", "low_contrast")):
+        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        if img.ndim == 2:
+            img = clahe.apply(img)
+        else:
+            lab = cv2.cvtColor(img[:, :, :3], cv2.COLOR_BGR2LAB)
+            lab[:, :, 0] = clahe.apply(lab[:, :, 0])
+            img = cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
+    return img
+
+
+def apply_quality_gate(img, thresholds=None, enhance=True):
+    """
+    Runs the gate on a decoded image.
+    :param enhance: Route images that failed an enhance gate through enhance_image().
+    :return: (image to use, quality report)
+    :raises ImageQualityError: The image failed a reject gate.
+    """
+    quality = assess_quality(img, thresholds)
+    if quality["action"] == "reject":
+        raise ImageQualityError(quality)
+    if quality["action"] == "enhance" and enhance:
+        img = enhance_image(img, quality)
+        quality["enhanced"] = True
+    return img, quality
@@ -0,0 +1,248 @@
+import copy
+import re
+try:
+    from .extraction import SpecificationExtractor, SpecCorrector
+    from .validation import CableValidator
+    from .instrumentation import instrument
+except ImportError:
+    from extraction import SpecificationExtractor, SpecCorrector
+    from validation import CableValidator
+    from instrumentation import instrument
+
+# Spec records: catalog tables read cell by cell (e.g. DOCX tables) map their
+# columns straight to SpecificationExtractor fields, one record per row, so
+# nothing is joined into one long text and rescanned with the extraction
+# regexes. Each row then goes through the usual clean / correct / validate.
+
+# Header texts (lowercase, punctuation and units removed) per field
+HEADER_ALIASES = {
+    "cable_type": ("cable type", "conductor material", "conductor", "material", "metal"),
+    "voltage": ("voltage", "rated voltage", "voltage rating", "nominal voltage", "uo u", "u0 u"),
+    "current_rating": ("current", "current rating", "rated current", "ampacity", "amps",
+                       "current carrying capacity"),
+    "insulation": ("insulation", "insulation material", "insulation type"),
+    "conductor_count": ("cores", "no of cores", "number of cores", "core count", "conductors",
+                        "no of conductors", "number of conductors"),
+    "conductor_size": ("size", "conductor size", "cross section", "cross sectional area", "csa",
+                       "nominal cross section", "nominal area", "no of cores x size",
+                       "cores x cross section", "cores x size"),
+    "sheath": ("sheath", "outer sheath", "sheath material", "jacket", "outer jacket"),
+    "operating_temperature": ("temperature", "operating temperature", "max operating temperature",
+                              "conductor temperature", "max conductor temperature", "temp"),
+    "insulation_resistance": ("insulation resistance", "min insulation resistance", "ir"),
+    "armor": ("armor", "armour", "armoring", "armouring", "armor type", "armour type"),
+}
+_FIELD_BY_HEADER = {alias: field for field, aliases in HEADER_ALIASES.items() for alias in aliases}
+
+# A row is a header when at least this many of its cells name a field
+MIN_HEADER_FIELDS = 2
+
+# "Cross-section (mm²)", "Voltage [kV]"
+_HEADER_UNIT = re.compile(r"[\(\[]\s*([^\)\]]*?)\s*[\)\]]")
+_NUMBER_ONLY = re.compile(r"^\d[\d\s.,/]*$")
+
+
+def split_header(text):
+    """
+    :return: (normalized header name, unit or None), e.g.
+             "Cross-Section (mm²)" -> ("cross section", "mm²")
+    """
+    match = _HEADER_UNIT.search(text)
+    unit = (match.group(1) or None) if match else None
+    name = _HEADER_UNIT.sub(" ", text).lower()
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", name).split()), unit
+
+
+def map_header(cells):
+    """
+    :return: {column: (field, unit)} when the row is a spec header, else None
+    """
+    columns, fields = {}, set()
+    for column, cell in enumerate(cells):
+        name, unit = split_header(cell)
+        field = _FIELD_BY_HEADER.get(name)
+        if field and field not in fields:
+            columns[column] = (field, unit)
+            fields.add(field)
+    return columns if len(columns) >= MIN_HEADER_FIELDS else None
+
+
+class TableRecords:
+    """
+    Builds spec records from table rows as they stream past:
+    {"table": 0, "row": 3, "cells": [...]} (docx_stream.iter_docx rows).
+
+    The first row of a table that names MIN_HEADER_FIELDS fields is its
+    header; every later row with values under MIN_HEADER_FIELDS of its
+    mapped columns becomes {"table", "row", "specs"} with the raw cell values
+    (a bare number gets the header's unit). Repeated header rows and blank or
+    section rows are skipped.
+    """
+    def __init__(self, records=None):
+        self.records = records if records is not None else []
+        self._headers = {}
+
+    def add(self, row):
+        """:return: True when the row was used (header or record)"""
+        table, cells = row["table"], row["cells"]
+        header = self._headers.get(table)
+        if header is None:
+            columns = map_header(cells)
+            if columns is None:
+                return False
+            self._headers[table] = (cells, columns)
+            return True
+
+        header_cells, columns = header
+        if cells == header_cells:
+            return True     # header repeated after a page break
+        specs = dict.fromkeys(HEADER_ALIASES)
+        for column, (field, unit) in columns.items():
+            value = cells[column].strip() if column < len(cells) else ""
+            if not value:
+                continue
+            if unit and _NUMBER_ONLY.match(value):
+                value = f"{value} {unit}"
+            specs[field] = value
+        if sum(value is not None for value in specs.values()) < MIN_HEADER_FIELDS:
+            return False    # blank or section row ("3 core cables")
+        self.records.append({"table": table, "row": row["row"], "specs": specs})
+        return True
+
+
+@instrument("records.validate")
+def validate_records(records):
+    """
+    Cleans, corrects and validates raw spec records in bulk: one extractor,
+    corrector and validator for all rows, and identical rows (the same
+    product listed twice) are validated once. From VECTORIZED_MIN_ROWS
+    records on (with pandas installed) validate_records_frame corrects each
+    column's distinct values once, with the same rules and results.
+    :param records: [{"table", "row", "specs"}, ...] (TableRecords.records)
+    :return: [{"table", "row", "specs", "report"}, ...] where specs are
+             corrected and report is CableValidator's (with correction_logs)
+    """
+    if len(records) >= VECTORIZED_MIN_ROWS:
+        try:
+            frame = validate_records_frame(records)
+        except ImportError:
+            pass
+        else:
+            return frame_results(frame)
+
+    extractor, corrector, validator = SpecificationExtractor(), SpecCorrector(), CableValidator()
+    seen = {}
+    results = []
+    for record in records:
+        key = tuple(record["specs"].items())
+        if key not in seen:
+            specs, logs = corrector.correct_all(extractor.clean_specs(dict(record["specs"])))
+            report = validator.validate_cable(specs)
+            report["correction_logs"] = logs
+            seen[key] = (specs, report)
+        specs, report = seen[key]
+        results.append({"table": record["table"], "row": record["row"],
+                        "specs": dict(specs), "report": copy.deepcopy(report)})
+    return results
+
+
+# =============================================
+# Vectorized path (large catalogs)
+# =============================================
+# From this many records on (with pandas installed), validate_records
+# corrects each column group over its distinct values only and validates
+# each distinct corrected spec once.
+VECTORIZED_MIN_ROWS = 5000
+
+FIELDS = tuple(HEADER_ALIASES)
+
+# Fields that clean_specs / SpecCorrector only ever correct together, in
+# SpecCorrector's log order. Each group is corrected independently of the
+# others with the same methods validate_records uses, so both paths share one
+# set of rules. insulation is never corrected.
+_FRAME_GROUPS = (
+    ("conductor_size", "conductor_count"),
+    ("voltage",),
+    ("armor",),
+    ("insulation_resistance",),
+    ("operating_temperature",),
+    ("current_rating",),
+    ("cable_type",),
+    ("sheath",),
+)
+
+
+def correct_frame(frame):
+    """
+    clean_specs + SpecCorrector.correct_all on every row of a records frame
+    (one column of raw values per field, None when missing). A catalog
+    repeats a handful of values per column (voltages, sizes, materials), so
+    each column group is corrected once per distinct value and the results
+    are mapped back to the rows.
+    :return: (corrected frame, list of correction logs per row)
+    """
+    import numpy as np
+    import pandas as pd
+
+    extractor, corrector = SpecificationExtractor(), SpecCorrector()
+    columns = {field: frame[field].to_numpy(dtype=object) for field in frame.columns}
+    group_logs = []
+    for fields in _FRAME_GROUPS:
+        keys = pd.Series(list(zip(*(columns[field] for field in fields))), dtype=object)
+        codes, distinct = pd.factorize(keys, use_na_sentinel=False)
+        corrected = {field: np.empty(len(distinct), dtype=object) for field in fields}
+        logs = np.empty(len(distinct), dtype=object)
+        for index, values in enumerate(distinct):
+            specs, logs[index] = corrector.correct_all(extractor.clean_specs(dict(zip(fields, values))))
+            for field in fields:
+                corrected[field][index] = specs.get(field)
+        for field in fields:
+            columns[field] = corrected[field][codes]
+        group_logs.append(logs[codes])
+
+    # Object columns keep None for missing values (no string dtype inference)
+    frame = pd.DataFrame(columns, index=frame.index, dtype=object)
+    row_logs = [[message for logs in messages for message in logs] for messages in zip(*group_logs)]
+    return frame, row_logs
+
+
+@instrument("records.validate_frame")
+def validate_records_frame(records):
+    """
+    Vectorized validate_records for large catalogs.
+    :param records: [{"table", "row", "specs"}, ...] (TableRecords.records)
+    :return: pandas DataFrame, one row per record: table, row, the corrected
+             spec fields, and status / valid / errors / missing /
+             correction_logs from the validation report
+    """
+    import pandas as pd
+
+    frame = pd.DataFrame([record["specs"] for record in records], columns=list(FIELDS), dtype=object)
+    frame = frame.where(frame.notna(), None)
+    frame, row_logs = correct_frame(frame)
+
+    validator = CableValidator()
+    reports = {}
+    keys = list(frame.itertuples(index=False, name=None))
+    for key in set(keys):
+        reports[key] = validator.validate_cable(dict(zip(FIELDS, key)))
+
+    frame.insert(0, "table", [record["table"] for record in records])
+    frame.insert(1, "row", [record["row"] for record in records])
+    for name in ("status", "valid", "errors", "missing"):
+        frame[name] = [reports[key][name] for key in keys]
+    frame["correction_logs"] = row_logs
+    return frame
+
+
+def frame_results(frame):
+    """validate_records_frame output as validate_records' list of dicts."""
+    results = []
+    columns = ["table", "row", *FIELDS, "valid", "status", "errors", "missing", "correction_logs"]
+    for values in frame[columns].itertuples(index=False, name=None):
+        specs = dict(zip(FIELDS, values[2:2 + len(FIELDS)]))
+        # Rows with the same spec share their report's lists in the frame
+        report = copy.deepcopy(dict(zip(("valid", "status", "errors", "missing", "correction_logs"),
+                                        values[2 + len(FIELDS):])))
+        results.append({"table": values[0], "row": values[1], "specs": specs, "report": report})
+    return results
@@ -181,3 +181,15 @@ class SpacyExtractor:
         if t in ["cu", "copper"]: return "Copper"
         if t in ["al", "aluminum", "aluminium"]: return "Aluminum"
         return text.title()
+
+
+_shared_extractors = {}
+
+
+def get_spacy_extractor(model="en_core_web_sm"):
+    """
+    Returns a shared SpacyExtractor, loading the SpaCy model only once per process.
+    """
+    if model not in _shared_extractors:
+        _shared_extractors[model] = SpacyExtractor(model)
+    return _shared_extractors[model]
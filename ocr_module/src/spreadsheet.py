@@ -0,0 +1,120 @@
+import csv
+import datetime
+import io
+try:
+    from .io_utils import as_buffer, is_path
+    from .instrumentation import byte_size, count_words, instrument
+    from .records import TableRecords
+except ImportError:
+    from io_utils import as_buffer, is_path
+    from instrumentation import byte_size, count_words, instrument
+    from records import TableRecords
+
+# Spreadsheet catalogs (XLSX / CSV): read row by row as cells, never rendered
+# to pixels. Rows have the same shape as docx_stream.iter_docx table rows, so
+# records.TableRecords maps their columns to spec fields the same way.
+# openpyxl is imported on first use.
+
+# Bytes of a CSV looked at to guess its delimiter
+CSV_SNIFF_BYTES = 64 * 1024
+CSV_DELIMITERS = ",;\t|"
+
+
+def _load_counts(results, args, kwargs):
+    return {"words": count_words(results), "bytes": byte_size(args[0])}
+
+
+def _cell_text(value):
+    """Cell value as the text shown in the sheet ("16" rather than "16.0")."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value).strip()
+
+
+def iter_xlsx(source):
+    """
+    Yields {"table": sheet, "row": n, "cells": [...]} for every row of every
+    worksheet, streamed with openpyxl's read-only mode (cached values, not
+    formulas).
+    :param source: Path to the .xlsx file, or its contents as bytes / file-like.
+    """
+    import openpyxl
+
+    if not is_path(source):
+        source = io.BytesIO(as_buffer(source))
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        for sheet, worksheet in enumerate(workbook.worksheets):
+            for row, values in enumerate(worksheet.iter_rows(values_only=True)):
+                yield {"type": "row", "table": sheet, "row": row, "cells": [_cell_text(v) for v in values]}
+    finally:
+        # Read-only workbooks keep the file open until closed
+        workbook.close()
+
+
+def iter_csv(source):
+    """
+    Yields {"table": 0, "row": n, "cells": [...]} for every CSV row. The
+    delimiter (comma, semicolon, tab or pipe) is guessed from the start of
+    the file.
+    :param source: Path to the .csv file, or its contents as bytes / file-like.
+    """
+    if is_path(source):
+        stream = open(source, "r", encoding="utf-8-sig", errors="replace", newline="")
+    else:
+        stream = io.TextIOWrapper(io.BytesIO(as_buffer(source)), encoding="utf-8-sig",
+                                  errors="replace", newline="")
+    with stream:
+        sample = stream.read(CSV_SNIFF_BYTES)
+        stream.seek(0)
+        if len(sample) == CSV_SNIFF_BYTES:
+            sample = sample[:sample.rfind("\n") + 1] or sample   # whole lines only
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=CSV_DELIMITERS)
+        except csv.Error:
+            dialect = csv.excel
+        for row, cells in enumerate(csv.reader(stream, dialect)):
+            yield {"type": "row", "table": 0, "row": row, "cells": [cell.strip() for cell in cells]}
+
+
+def iter_spreadsheet(source, kind):
+    """Rows of an 'xlsx' or 'csv' source (see iter_xlsx / iter_csv)."""
+    return iter_xlsx(source) if kind == "xlsx" else iter_csv(source)
+
+
+@instrument("spreadsheet.load", counters=_load_counts)
+def load_spreadsheet(source, kind, records=None):
+    """
+    Reads a spreadsheet as digital text, like load_docx does for Word tables.
+    :param kind: 'xlsx' or 'csv' (io_utils.detect_kind)
+    :param records: Optional list that collects spec-table rows as records
+                    (records.TableRecords) from the same pass.
+    :return: EasyOCR-format results, one per non-empty cell, row by row
+    """
+    tables = TableRecords(records) if records is not None else None
+    results = []
+    for item in iter_spreadsheet(source, kind):
+        if tables is not None:
+            tables.add(item)
+        for text in item["cells"]:
+            if text:
+                # Digital text: dummy box, full confidence
+                results.append(([[0,0], [1,0], [1,1], [0,1]], text, 1.0))
+    return results
+
+
+@instrument("spreadsheet.records")
+def load_spreadsheet_records(source, kind):
+    """
+    Raw spec records from every sheet whose header row names spec fields,
+    one per product row.
+    :return: [{"table", "row", "specs"}, ...] (validate with records.validate_records)
+    """
+    tables = TableRecords()
+    for item in iter_spreadsheet(source, kind):
+        tables.add(item)
+    return tables.records
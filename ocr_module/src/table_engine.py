@@ -1,8 +1,48 @@
 import cv2
 import numpy as np
-import pandas as pd
 from .core_ocr import OCREngine
 
+# pandas is imported in extract_table(), so page triage can reuse detect_grid()
+# without loading it.
+
+
+def detect_grid(gray, min_cell=(20, 10)):
+    """
+    Find the ruling lines of a table and the cells they enclose.
+    :param gray: Grayscale image (numpy array).
+    :param min_cell: Smallest (width, height) kept as a cell; smaller boxes are noise.
+    :return: (grid, cells) where grid is the binary line mask and cells is a
+             list of (x, y, w, h) boxes.
+    """
+    thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
+    thresh = 255 - thresh # Invert colors
+
+    # Detect horizontal and vertical lines
+    rows = gray.shape[0]
+    vertical_size = max(1, rows // 30)
+    vertical_structure = cv2.getStructuringElement(cv2.MORPH_RECT, (1, vertical_size))
+    vertical = cv2.erode(thresh, vertical_structure)
+    vertical = cv2.dilate(vertical, vertical_structure)
+
+    cols = gray.shape[1]
+    horizontal_size = max(1, cols // 30)
+    horizontal_structure = cv2.getStructuringElement(cv2.MORPH_RECT, (horizontal_size, 1))
+    horizontal = cv2.erode(thresh, horizontal_structure)
+    horizontal = cv2.dilate(horizontal, horizontal_structure)
+
+    # Combine lines to get the grid
+    grid = cv2.add(horizontal, vertical)
+
+    # Find cells (Contours), filtering out very small ones
+    contours, _ = cv2.findContours(grid, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    cells = []
+    for cnt in contours:
+        x, y, w, h = cv2.boundingRect(cnt)
+        if w > min_cell[0] and h > min_cell[1]: # Ignore noise
+            cells.append((x, y, w, h))
+    return grid, cells
+
+
 class TableExtractor:
     def __init__(self, ocr_engine):
         self.ocr = ocr_engine
@@ -17,34 +57,9 @@ class TableExtractor:
 
         # 1. Convert to grayscale and process
         gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
-        thresh = 255 - thresh # Invert colors
-
-        # 2. Detect horizontal and vertical lines
-        rows = gray.shape[0]
-        vertical_size = rows // 30
-        vertical_structure = cv2.getStructuringElement(cv2.MORPH_RECT, (1, vertical_size))
-        vertical = cv2.erode(thresh, vertical_structure)
-        vertical = cv2.dilate(vertical, vertical_structure)
-
-        cols = gray.shape[1]
-        horizontal_size = cols // 30
-        horizontal_structure = cv2.getStructuringElement(cv2.MORPH_RECT, (horizontal_size, 1))
-        horizontal = cv2.erode(thresh, horizontal_structure)
-        horizontal = cv2.dilate(horizontal, horizontal_structure)
-
-        # 3. Combine lines to get the grid
-        grid = cv2.add(horizontal, vertical)
-        
-        # 4. Find cells (Contours)
-        contours, _ = cv2.findContours(grid, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
 
-        # Filter out very small contours
-        cells = []
-        for cnt in contours:
-            x, y, w, h = cv2.boundingRect(cnt)
-            if w > 20 and h > 10: # Ignore noise
-                cells.append((x, y, w, h))
+        # 2-4. Detect the ruling lines and the cells between them
+        _, cells = detect_grid(gray)
 
         # 5. Sort cells (Top-to-bottom, then Left-to-right)
         # This sort is simple and might need improvement for complex tables
@@ -78,5 +93,6 @@ class TableExtractor:
             data.append(row_data)
 
         # Convert to DataFrame
+        import pandas as pd
         df = pd.DataFrame(data)
         return df
@@ -0,0 +1,109 @@
+import re
+
+# Page triage: cheap signals per page, measured before any OCR, to rank pages
+# and skip the ones unlikely to hold specifications (covers, photos,
+# marketing and legal pages). cv2 and the table morphology are imported on
+# first use.
+
+# Longest side of the thumbnail the pixel signals are measured on
+TRIAGE_THUMB_EDGE = 400
+
+# Tunable thresholds (override any of them in OCREngine.enable_triage)
+TRIAGE_THRESHOLDS = {
+    "min_score": 0.3,           # pages scoring below this are skipped
+    "min_text_chars": 50,       # text layer shorter than this counts as "no text layer"
+    "spec_terms": 3,            # spec terms in the text layer for a full term score
+    "line_density": 0.02,       # share of table-line pixels for a full line score
+    "grid_cells": 4,            # cells that make the page a table
+    "min_edge_density": 0.01,   # below: blank page
+    "max_edge_density": 0.25,   # above: photo / artwork rather than text
+}
+
+# Spec vocabulary looked for in the text layer
+SPEC_TERMS = re.compile(
+    r"\d\s*(?:mm2|mm²|k?v|a|°c|mω|ohm)\b|\b(?:xlpe|pvc|lszh|swa|sta|awa|conductor|insulation|sheath|"
+    r"armou?r|voltage|cores?|rated|resistance)\b",
+    re.IGNORECASE)
+
+
+def page_signals(text, thumbnail):
+    """
+    Measures the triage signals of one page.
+    :param text: Text layer of the page ('' for scanned pages).
+    :param thumbnail: Grayscale thumbnail (numpy array).
+    :return: dict with text_chars, spec_terms, edge_density, line_density and grid_cells
+    """
+    import cv2
+    try:
+        from .table_engine import detect_grid
+    except ImportError:
+        from table_engine import detect_grid
+
+    text = (text or "").strip()
+    area = float(thumbnail.shape[0] * thumbnail.shape[1]) or 1.0
+    edges = cv2.Canny(thumbnail, 50, 150)
+    # TableExtractor's 20x10 px noise floor is meant for A4 at 2x zoom (~1684 px)
+    factor = max(thumbnail.shape[:2]) / 1684.0
+    grid, cells = detect_grid(thumbnail, min_cell=(20 * factor, 10 * factor))
+    return {
+        "text_chars": len(text),
+        "spec_terms": len(SPEC_TERMS.findall(text)),
+        "edge_density": round(cv2.countNonZero(edges) / area, 4),
+        "line_density": round(cv2.countNonZero(grid) / area, 4),
+        "grid_cells": len(cells),
+    }
+
+
+def score_page(signals, thresholds=TRIAGE_THRESHOLDS):
+    """
+    Combines the signals into a 0..1 likelihood that the page holds specs.
+    Pages with a text layer are judged mostly on spec terms; scanned pages
+    on table structure and text-like edge density.
+    """
+    t = thresholds
+    if signals["grid_cells"] >= t["grid_cells"]:
+        table = 1.0
+    else:
+        table = min(1.0, signals["line_density"] / t["line_density"])
+    textlike = 1.0 if t["min_edge_density"] <= signals["edge_density"] <= t["max_edge_density"] else 0.0
+
+    if signals["text_chars"] >= t["min_text_chars"]:
+        terms = min(1.0, signals["spec_terms"] / t["spec_terms"])
+        score = 0.5 * terms + 0.3 * table + 0.2 * textlike
+    else:
+        score = 0.6 * table + 0.4 * textlike
+    return round(score, 3)
+
+
+def triage_pages(previews, thresholds=TRIAGE_THRESHOLDS, rank=False):
+    """
+    Decides which pages to OCR.
+    :param previews: [{'text': ..., 'image': thumbnail}, ...] per page
+                     (pdf_utils.preview_pdf_pages)
+    :param rank: Order kept pages by score (best first) instead of page order.
+    :return: (keep, decisions) where keep is the list of page indices to OCR
+             (never empty when there are pages) and decisions has one dict per
+             page with its signals, score and 'ocr' / 'skip' decision.
+    """
+    t = dict(TRIAGE_THRESHOLDS, **(thresholds or {}))
+    decisions = []
+    for index, preview in enumerate(previews):
+        signals = page_signals(preview["text"], preview["image"])
+        score = score_page(signals, t)
+        decisions.append(dict(signals, page=index, score=score,
+                              decision="ocr" if score >= t["min_score"] else "skip"))
+
+    keep = [d["page"] for d in decisions if d["decision"] == "ocr"]
+    if not keep and decisions:
+        # Never skip a whole document: keep its most promising page
+        best = max(decisions, key=lambda d: d["score"])
+        best["decision"] = "ocr"
+        keep = [best["page"]]
+    if rank:
+        keep.sort(key=lambda i: -decisions[i]["score"])
+
+    for d in decisions:
+        print(f"Triage page {d['page'] + 1}/{len(decisions)}: {d['decision']} (score {d['score']:.2f}, "
+              f"text {d['text_chars']} chars / {d['spec_terms']} terms, edges {d['edge_density']:.3f}, "
+              f"lines {d['line_density']:.3f}, {d['grid_cells']} cells)")
+    return keep, decisions
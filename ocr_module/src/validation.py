@@ -1,4 +1,8 @@
 import re
+try:
+    from .instrumentation import instrument
+except ImportError:
+    from instrumentation import instrument
 
 class CableValidator:
     def __init__(self):
@@ -16,6 +20,7 @@ class CableValidator:
         if nums: return float(nums[0])
         return None
 
+    @instrument("validate.cable")
     def validate_cable(self, specs):
         violations = []
         missing_data = []
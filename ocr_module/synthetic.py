@@ -0,0 +1,471 @@
+"""
+Synthetic cable datasheet generator for load, scale and accuracy testing.
+
+Renders spec sheets with known ground truth as PNG (one page), multi-page
+PDF (scan-like page images) and DOCX (digital text and a Word table, or the
+rendered table embedded as a picture). Each sheet has a title, a description
+and parameter tables using the labels and units SpecificationExtractor
+targets, plus distractor rows (diameter, weight, standard).
+
+Noise is controllable:
+    --noise       OCR-style text corruption (O/0, S/5, l/1 swaps, spaced digits)
+    --scan-noise  page skew, blur and speckle on rendered pages
+
+Ground truth is written to <out>/golden/<file>.json in the format read by
+accuracy.py (source "synthetic"), with the expected status computed by
+CableValidator. --invalid-rate makes a share of the sheets break one
+engineering rule, so they are expected to be NOT READY.
+
+Generation is deterministic for a given --seed and runs offline.
+
+Usage:
+    python synthetic.py --out data/synthetic --count 1000 --workers 4
+    python accuracy.py --data-dir data/synthetic --golden-dir data/synthetic/golden
+    python ../benchmark.py run --suite ocr --ocr-dir ocr_module/data/synthetic \\
+        --golden-dir ocr_module/data/synthetic/golden
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import random
+import sys
+import textwrap
+
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+try:
+    from .src.validation import CableValidator
+except ImportError:
+    from src.validation import CableValidator
+
+# ==========================================
+# ⚙️ SETTINGS
+# ==========================================
+OUTPUT_DIR = os.path.join(current_dir, "data", "synthetic")
+FORMATS = ("png", "pdf", "docx")
+
+PAGE_SIZE = (1240, 1754)       # A4 at 150 DPI
+PAGE_MARGIN = 90
+FONT_SIZE = 28
+TITLE_FONT_SIZE = 46
+FONT_CANDIDATES = ("DejaVuSans.ttf", "arial.ttf", "Arial.ttf", "LiberationSans-Regular.ttf")
+
+# (size mm², copper current A); aluminum carries ~78% of the copper rating
+SIZE_CURRENTS = (
+    (1.5, 18), (2.5, 24), (4, 32), (6, 41), (10, 57), (16, 76), (25, 101), (35, 125),
+    (50, 151), (70, 192), (95, 232), (120, 269), (150, 300), (185, 341), (240, 400),
+)
+LOW_VOLTAGES = ("300/500 V", "450/750 V", "0.6/1 kV", "600/1000 V")
+HIGH_VOLTAGES = ("3.6/6 kV", "6/10 kV", "12/20 kV")
+SHEATHS = ("PVC", "LSZH", "HDPE", "MDPE")
+ARMORS = {
+    None: None,
+    "SWA": "Steel Wire Armor",
+    "STA": "Steel Tape Armor",
+    "AWA": "Aluminum Wire Armor",
+}
+RESISTANCES = ("20 MΩ·km", "100 MΩ·km", "500 MΩ·km")
+SERIES = ("NYY", "NYCY", "N2XY", "NA2XY", "N2XRY", "H07RN", "YSLY", "NHXMH")
+
+DESCRIPTIONS = (
+    "Power and control cable for fixed installation indoors, outdoors and in cable ducts.",
+    "Designed for distribution networks, industrial plants and power stations.",
+    "Suitable for direct burial where mechanical protection is required.",
+    "Flame retardant construction tested according to international standards.",
+)
+NOTES = (
+    "Installation: observe the minimum bending radius during laying and pulling.",
+    "Storage: keep drums upright and protect cable ends against moisture.",
+    "Handling: do not install when the ambient temperature is below the limit.",
+    "Terminations: use fittings approved for the conductor material.",
+)
+
+# OCR-style confusions applied by add_ocr_noise
+CONFUSIONS = {
+    "O": "0", "0": "O", "o": "0", "S": "5", "5": "S", "s": "5",
+    "l": "1", "1": "l", "I": "1", "e": "3", "a": "@", "B": "8",
+}
+
+# One broken rule per invalid sheet
+INVALID_KINDS = ("temperature", "pvc_high_voltage", "overload", "nonstandard_size", "armor")
+
+
+# ==========================================
+# 🎲 GROUND TRUTH
+# ==========================================
+def sample_specs(rng, invalid_rate=0.0):
+    """
+    Random but consistent cable specs in corrected, canonical form (the
+    golden-file format), plus rendering hints.
+    :return: (specs, hints)
+    """
+    material = rng.choice(("Copper", "Copper", "Aluminum"))
+    high_voltage = rng.random() < 0.2
+    insulation = "XLPE" if high_voltage else rng.choice(("PVC", "XLPE"))
+    sizes = [pair for pair in SIZE_CURRENTS if material == "Copper" or pair[0] >= 16]
+    size, current = rng.choice(sizes)
+    if material == "Aluminum":
+        current = int(round(current * 0.78))
+    cores = 1 if high_voltage else rng.choice((1, 2, 3, 4, 5))
+    armor_code = rng.choice(list(ARMORS))
+
+    specs = {
+        "cable_type": material,
+        "voltage": rng.choice(HIGH_VOLTAGES if high_voltage else LOW_VOLTAGES),
+        "current_rating": f"{current}A",
+        "insulation": insulation,
+        "conductor_count": str(cores),
+        "conductor_size": f"{size:g} mm²",
+        "sheath": rng.choice(SHEATHS),
+        "operating_temperature": "90°C" if insulation == "XLPE" else "70°C",
+        "insulation_resistance": rng.choice(RESISTANCES),
+        "armor": ARMORS[armor_code],
+    }
+    hints = {"armor_code": armor_code, "invalid": None}
+
+    if rng.random() < invalid_rate:
+        kind = rng.choice(INVALID_KINDS)
+        hints["invalid"] = kind
+        if kind == "temperature":
+            specs["operating_temperature"] = f"{rng.choice((130, 150, 250))}°C"
+        elif kind == "pvc_high_voltage":
+            specs["voltage"], specs["insulation"] = rng.choice(HIGH_VOLTAGES), "PVC"
+        elif kind == "overload":
+            specs["current_rating"] = f"{int(size * rng.choice((40, 60)))}A"
+        elif kind == "nonstandard_size":
+            specs["conductor_size"] = f"{rng.choice((7, 13, 22))} mm²"
+        else:
+            specs["armor"], hints["armor_code"] = "Plastic Foam Armor", None
+
+    return specs, hints
+
+
+def expected_status(specs):
+    return CableValidator().validate_cable(specs)["status"]
+
+
+# ==========================================
+# 🔤 TEXT AND NOISE
+# ==========================================
+def add_ocr_noise(text, rate, rng):
+    """
+    Corrupts text the way OCR does: character confusions (O/0, S/5, l/1, ...)
+    and digits split by a space ("32 A" -> "3 2 A"), each at `rate`.
+    """
+    if rate <= 0:
+        return text
+    out = []
+    for i, ch in enumerate(text):
+        if ch in CONFUSIONS and rng.random() < rate:
+            ch = CONFUSIONS[ch]
+        out.append(ch)
+        if ch.isdigit() and i + 1 < len(text) and text[i + 1].isdigit() and rng.random() < rate:
+            out.append(" ")
+    return "".join(out)
+
+
+def _render_value(field, value, rng, hints):
+    """Document spelling of a ground-truth value (units and abbreviations vary)."""
+    if value is None:
+        return None
+    if field == "voltage":
+        return value.replace(" ", "") if rng.random() < 0.5 else value
+    if field == "current_rating":
+        return value[:-1] + rng.choice(("A", " A", " Amps"))
+    if field == "conductor_size":
+        return value.replace("mm²", "mm2") if rng.random() < 0.3 else value
+    if field == "armor" and hints["armor_code"] and rng.random() < 0.5:
+        return f"{value} ({hints['armor_code']})"
+    if field == "insulation_resistance" and rng.random() < 0.3:
+        return value.replace("·", ".")
+    return value
+
+
+def build_sheet(specs, hints, rng, noise=0.0):
+    """
+    Text content of one datasheet.
+    :return: {"title", "description", "sections": [(heading, [(label, value), ...]), ...], "notes"}
+    """
+    value = {field: _render_value(field, v, rng, hints) for field, v in specs.items()}
+
+    if rng.random() < 0.5:
+        cores_rows = [("Number of Cores", f"{specs['conductor_count']} Cores"),
+                      ("Nominal Cross-Section", value["conductor_size"])]
+    else:
+        cores_rows = [("Cores x Cross-Section", f"{specs['conductor_count']}x{value['conductor_size']}")]
+    temperature = value["operating_temperature"]
+    if rng.random() < 0.3:
+        temperature = f"{rng.choice(('-5', '-15', '-20'))}°C to {temperature}"
+
+    construction = [("Conductor Material", value["cable_type"])] + cores_rows + [
+        ("Insulation", value["insulation"]),
+        ("Outer Sheath", value["sheath"]),
+        ("Armour", value["armor"] or "None"),
+    ]
+    electrical = [
+        ("Rated Voltage (Uo/U)", value["voltage"]),
+        ("Current Rating", value["current_rating"]),
+        ("Max. Operating Temperature", temperature),
+        ("Insulation Resistance", value["insulation_resistance"]),
+    ]
+    # Distractors with numbers and units the extractor must not pick up
+    mechanical = [
+        ("Overall Diameter", f"{rng.uniform(8, 60):.1f} mm"),
+        ("Weight", f"{rng.randint(120, 9000)} kg/km"),
+        ("Standard", rng.choice(("IEC 60502-1", "IEC 60227", "BS 6724", "VDE 0276-603"))),
+    ]
+    sections = [("Construction", construction), ("Electrical Data", electrical), ("Mechanical Data", mechanical)]
+
+    def noisy(text):
+        return add_ocr_noise(text, noise, rng)
+
+    return {
+        "title": noisy(f"{specs['cable_type']} Power Cable {rng.choice(SERIES)}"),
+        "description": noisy(" ".join(rng.sample(DESCRIPTIONS, 2))),
+        "sections": [(noisy(heading), [(noisy(label), noisy(text)) for label, text in rows])
+                     for heading, rows in sections],
+        "notes": [noisy(note) for note in rng.sample(NOTES, 2)],
+    }
+
+
+# ==========================================
+# 🖼️ PAGE RENDERING
+# ==========================================
+_fonts = {}
+
+
+def get_font(size):
+    """TrueType font with the ², ° and Ω glyphs when available (cached)."""
+    if size not in _fonts:
+        font = None
+        for name in FONT_CANDIDATES:
+            try:
+                font = ImageFont.truetype(name, size)
+                break
+            except OSError:
+                continue
+        if font is None:
+            try:
+                font = ImageFont.load_default(size=size)
+            except TypeError:  # Pillow < 10.1
+                font = ImageFont.load_default()
+        _fonts[size] = font
+    return _fonts[size]
+
+
+def _line_height(font):
+    left, top, right, bottom = font.getbbox("Ag°²")
+    return bottom - top
+
+
+def _draw_table(draw, rows, top, font):
+    """Two-column grid table. :return: y below the table"""
+    left, right = PAGE_MARGIN, PAGE_SIZE[0] - PAGE_MARGIN
+    split = left + int((right - left) * 0.5)
+    row_height = _line_height(font) + 24
+    for label, text in rows:
+        draw.rectangle([left, top, right, top + row_height], outline=0, width=2)
+        draw.line([split, top, split, top + row_height], fill=0, width=2)
+        draw.text((left + 14, top + 12), label, fill=0, font=font)
+        draw.text((split + 14, top + 12), text, fill=0, font=font)
+        top += row_height
+    return top
+
+
+def _draw_paragraph(draw, text, top, font, width_chars=70):
+    for line in textwrap.wrap(text, width_chars):
+        draw.text((PAGE_MARGIN, top), line, fill=0, font=font)
+        top += _line_height(font) + 10
+    return top
+
+
+def _apply_scan_noise(page, level, rng):
+    """Skew, blur and speckle proportional to `level` (0..1)."""
+    if level <= 0:
+        return page
+    page = page.rotate(rng.uniform(-1.5, 1.5) * level, resample=Image.BICUBIC, fillcolor=255)
+    page = page.filter(ImageFilter.GaussianBlur(radius=0.3 + level))
+    speckle = Image.effect_noise(page.size, 40 + 60 * level)
+    return Image.blend(page, speckle, 0.08 * level)
+
+
+def render_pages(sheet, pages=1, scan_noise=0.0, rng=None):
+    """
+    Grayscale page images of a sheet; the sections are spread over `pages`
+    pages (the last pages carry only notes when there are more pages than
+    sections).
+    """
+    rng = rng or random.Random(0)
+    font, title_font = get_font(FONT_SIZE), get_font(TITLE_FONT_SIZE)
+    sections = sheet["sections"]
+    pages = max(1, pages)
+    per_page = -(-len(sections) // pages)
+
+    images = []
+    for index in range(pages):
+        page = Image.new("L", PAGE_SIZE, 255)
+        draw = ImageDraw.Draw(page)
+        top = PAGE_MARGIN
+        if index == 0:
+            draw.text((PAGE_MARGIN, top), sheet["title"], fill=0, font=title_font)
+            top += _line_height(title_font) + 30
+            top = _draw_paragraph(draw, sheet["description"], top, font) + 20
+        for heading, rows in sections[index * per_page:(index + 1) * per_page]:
+            draw.text((PAGE_MARGIN, top), heading, fill=0, font=title_font)
+            top = _draw_table(draw, rows, top + _line_height(title_font) + 20, font) + 40
+        if index == pages - 1:
+            for note in sheet["notes"]:
+                top = _draw_paragraph(draw, note, top, font) + 10
+        images.append(_apply_scan_noise(page, scan_noise, rng))
+    return images
+
+
+# ==========================================
+# 💾 WRITERS
+# ==========================================
+def write_png(path, sheet, options, rng):
+    render_pages(sheet, 1, options["scan_noise"], rng)[0].save(path, optimize=True)
+
+
+def write_pdf(path, sheet, options, rng):
+    """Multi-page, scan-like PDF (one page image per page)."""
+    images = render_pages(sheet, options["pages"], options["scan_noise"], rng)
+    images[0].save(path, "PDF", resolution=150, save_all=True, append_images=images[1:])
+
+
+def write_docx(path, sheet, options, rng):
+    """
+    Heading, description and one Word table per section (digital text), or
+    with options["docx_images"] the sections as embedded page pictures.
+    """
+    import docx
+    from docx.shared import Inches
+
+    document = docx.Document()
+    document.add_heading(sheet["title"], level=1)
+    document.add_paragraph(sheet["description"])
+    if options["docx_images"]:
+        body = dict(sheet, title="", description="", notes=[])
+        for image in render_pages(body, options["pages"], options["scan_noise"], rng):
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG")
+            buffer.seek(0)
+            document.add_picture(buffer, width=Inches(6))
+    else:
+        for heading, rows in sheet["sections"]:
+            document.add_heading(heading, level=2)
+            table = document.add_table(rows=0, cols=2)
+            table.style = "Table Grid"
+            for label, text in rows:
+                cells = table.add_row().cells
+                cells[0].text, cells[1].text = label, text
+    for note in sheet["notes"]:
+        document.add_paragraph(note)
+    document.save(path)
+
+
+WRITERS = {"png": write_png, "pdf": write_pdf, "docx": write_docx}
+
+
+def generate_document(index, options):
+    """
+    Writes document number `index` and its golden file. Seeded from
+    (seed, index), so any range of a corpus can be regenerated on its own.
+    :return: golden dict
+    """
+    rng = random.Random(f"{options['seed']}-{index}")
+    fmt = options["formats"][index % len(options["formats"])]
+    specs, hints = sample_specs(rng, options["invalid_rate"])
+    sheet = build_sheet(specs, hints, rng, options["noise"])
+
+    name = f"synthetic_{index:06d}.{fmt}"
+    WRITERS[fmt](os.path.join(options["out"], name), sheet, options, rng)
+
+    golden = {
+        "file": name,
+        "source": "synthetic",
+        "expected_status": expected_status(specs),
+        "specs": specs,
+        "notes": f"format={fmt}, noise={options['noise']}, scan_noise={options['scan_noise']}"
+                 + (f", invalid={hints['invalid']}" if hints["invalid"] else ""),
+    }
+    with open(os.path.join(options["out"], "golden", f"{name}.json"), "w", encoding="utf-8") as f:
+        json.dump(golden, f, indent=4, ensure_ascii=False)
+    return golden
+
+
+def _generate(args):
+    return generate_document(*args)
+
+
+def generate_corpus(options, workers=1):
+    """
+    Generates options["count"] documents into options["out"].
+    :return: {"documents": n, "by_format": {...}, "by_status": {...}}
+    """
+    os.makedirs(os.path.join(options["out"], "golden"), exist_ok=True)
+    jobs = [(options["start"] + i, options) for i in range(options["count"])]
+    summary = {"documents": 0, "by_format": {}, "by_status": {}}
+
+    def add(golden):
+        fmt = golden["file"].rsplit(".", 1)[-1]
+        summary["documents"] += 1
+        summary["by_format"][fmt] = summary["by_format"].get(fmt, 0) + 1
+        summary["by_status"][golden["expected_status"]] = summary["by_status"].get(golden["expected_status"], 0) + 1
+        if summary["documents"] % 100 == 0:
+            print(f"   {summary['documents']}/{len(jobs)} documents")
+
+    if workers > 1:
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            for golden in pool.imap_unordered(_generate, jobs, chunksize=16):
+                add(golden)
+    else:
+        for job in jobs:
+            add(_generate(job))
+    return summary
+
+
+# ==========================================
+# 🚀 MAIN
+# ==========================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic cable datasheets with ground truth")
+    parser.add_argument("--out", default=OUTPUT_DIR, help="Output folder (golden files go to <out>/golden)")
+    parser.add_argument("--count", type=int, default=100, help="Number of documents")
+    parser.add_argument("--start", type=int, default=0, help="Index of the first document")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS),
+                        help="Formats used in rotation")
+    parser.add_argument("--pages", type=int, default=2, help="Pages per PDF (and per DOCX with --docx-images)")
+    parser.add_argument("--noise", type=float, default=0.0, help="OCR-style character noise rate (0..1)")
+    parser.add_argument("--scan-noise", type=float, default=0.0, help="Skew/blur/speckle level (0..1)")
+    parser.add_argument("--invalid-rate", type=float, default=0.1, help="Share of sheets breaking a rule")
+    parser.add_argument("--docx-images", action="store_true", help="Embed DOCX tables as pictures (OCR path)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    options = {
+        "out": args.out,
+        "count": args.count,
+        "start": args.start,
+        "formats": args.formats,
+        "pages": max(1, args.pages),
+        "noise": args.noise,
+        "scan_noise": args.scan_noise,
+        "invalid_rate": args.invalid_rate,
+        "docx_images": args.docx_images,
+        "seed": args.seed,
+    }
+    print(f"🏭 Generating {args.count} datasheet(s) in {args.out} ...")
+    summary = generate_corpus(options, workers=max(1, args.workers))
+    print(f"✅ {summary['documents']} document(s): {summary['by_format']}, expected status {summary['by_status']}")
+
+
+if __name__ == "__main__":
+    main()
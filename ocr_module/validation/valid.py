@@ -2,7 +2,6 @@ import os
 import sys
 import argparse
 import json
-import pandas as pd
 
 # Add the project root to sys.path to allow importing from src
 # Assuming valid.py is in o:\OCR Model\validation\valid.py
@@ -20,14 +19,15 @@ except ImportError:
     sys.exit(1)
 
 # Lazy import wrapper for OCR components
-def get_ocr_engine_class():
+def get_ocr_engine_factory():
     try:
         # We need to import OCREngine from the original script or move it to a shared place?
         # The user's original valid.py had OCREngine inline.
         # But main.py imports it from src.core_ocr.
         # So we should use src.core_ocr here too to be consistent!
-        from src.core_ocr import OCREngine
-        return OCREngine
+        # get_engine returns a shared engine, which stays loaded inside the daemon.
+        from src.core_ocr import get_engine
+        return get_engine
     except ImportError as e:
         print(f"❌ Error importing OCR Engine: {e}")
         return None
@@ -81,14 +81,26 @@ class ReportGenerator:
 # -----------------------------------------------------------------------------
 # MAIN EXECUTION
 # -----------------------------------------------------------------------------
-def main():
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Thin client: if a warm daemon is running (see daemon.py), let it do the work
+    from daemon import forward_to_daemon
+    exit_code = forward_to_daemon("valid", argv)
+    if exit_code is not None:
+        if exit_code:
+            sys.exit(exit_code)
+        return
+
     parser = argparse.ArgumentParser(description="Cable Specification Validation Tool")
     parser.add_argument("--image", help="Path to input image/PDF/DOCX. If omitted, checks validation/latest_specs.json")
     parser.add_argument("--mode", choices=["text", "table", "full", "test", "validate_json"], default="full", 
                        help="Operation mode. 'full' does OCR+Validation (if image provided). 'validate_json' is default if no image.")
     parser.add_argument("--langs", default="en", help="Comma-separated list of languages (e.g., 'en,ar')")
+    parser.add_argument("--specs", help="Specs JSON checked when no image is given (default: validation/latest_specs.json)")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Import Keyword Tool (lazy load)
     # Since we added project_root to sys.path, we can import from keyword_gen_module
@@ -107,7 +119,7 @@ def main():
 
     # Scenario 1: No image provided -> Check latest_specs.json
     if not args.image:
-        json_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'latest_specs.json')
+        json_path = args.specs or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'latest_specs.json')
         if os.path.exists(json_path):
             print(f"📢 No image provided. Checking latest output: {json_path}")
             try:
@@ -208,12 +220,12 @@ def main():
         return
 
     # Initialize Engine (Lazy Load)
-    OCREngine = get_ocr_engine_class()
-    if not OCREngine:
+    get_engine = get_ocr_engine_factory()
+    if not get_engine:
         return
 
     languages = args.langs.split(',')
-    ocr = OCREngine(languages=languages)
+    ocr = get_engine(languages)
 
     if args.mode == "text" or args.mode == "full":
         # Text extraction
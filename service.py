@@ -0,0 +1,503 @@
+"""
+SpecSense headless batch service.
+
+Exposes the two analysis entry points as asynchronous jobs over HTTP, so other
+systems (e.g. the MES) can submit work concurrently without the Streamlit UI:
+
+    POST /jobs/document?filename=spec.pdf   body: raw file bytes  -> extract_and_validate
+    POST /jobs/cable?filename=cut.jpg       body: raw image bytes -> analyze_cable_image
+    GET  /jobs/<id>                         poll status / result
+    GET  /jobs/<id>/events                  NDJSON stream: page results as they complete, then the result
+    GET  /health                            workers, queue depth, job counts
+
+Jobs wait in a bounded queue (a full queue answers 503) and are run by a pool
+of warm worker processes that load the OCR engine and YOLO model once. A job
+exceeding its timeout has its worker killed and replaced, so one slow PDF
+never holds a worker (or the other jobs) hostage.
+
+Usage:
+    python service.py --port 8600 --workers 2 --queue-size 32 --timeout 300
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# ==========================================
+# ⚙️ SERVICE SETTINGS
+# ==========================================
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8600
+DEFAULT_WORKERS = 2
+QUEUE_SIZE = 32                      # Jobs waiting for a worker (beyond this: 503)
+JOB_TIMEOUT = 300                    # Seconds per job, after which the worker is replaced
+MAX_JOB_TIMEOUT = 1800               # Upper bound for the per-request ?timeout= override
+MAX_UPLOAD_BYTES = 100 * 1024 * 1024
+FINISHED_JOB_TTL = 3600              # Seconds finished jobs stay pollable
+JOB_TYPES = ("document", "cable")
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+
+
+# ==========================================
+# 👷 WORKER PROCESS
+# ==========================================
+def _to_json(value):
+    """Round-trips a result through JSON so only plain types cross the pipe."""
+    return json.loads(json.dumps(value, default=str))
+
+
+def _warm_up(job_types):
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    if "document" in job_types:
+        from ocr_module.interface import get_ocr_engine
+        get_ocr_engine(['en'])
+    if "cable" in job_types:
+        from vision_module.interface import load_model
+        load_model()
+
+
+def run_job(job_type, payload, filename, emit):
+    """
+    Runs one job in the worker. `emit(event, data)` sends partial results.
+    :return: JSON-ready result dict
+    """
+    if job_type == "document":
+        from ocr_module.interface import extract_and_validate
+
+        def on_page(index, total, texts):
+            emit("page", {"page": index + 1, "pages": total, "text": " ".join(texts)})
+
+        specs, report = extract_and_validate(payload, filename=filename, on_page=on_page)
+        return {"specs": specs, "report": report}
+
+    from vision_module.interface import analyze_cable_image
+    _, rows = analyze_cable_image(payload)
+    return {"detections": rows}
+
+
+def worker_main(conn, job_types):
+    """
+    Worker process loop: warm up once, then run jobs sent over `conn` until
+    a None message (or a closed pipe) arrives.
+    """
+    try:
+        _warm_up(job_types)
+    except Exception as e:
+        # Jobs will report the load error themselves; keep the worker alive
+        print(f"[service] Worker {os.getpid()} warm-up failed: {e}")
+    conn.send(("ready", os.getpid()))
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if message is None:
+            return
+
+        job_type, payload, filename = message
+        try:
+            result = run_job(job_type, payload, filename, lambda event, data: conn.send((event, _to_json(data))))
+            conn.send(("result", _to_json(result)))
+        except Exception as e:
+            traceback.print_exc()
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+# ==========================================
+# 📋 JOBS
+# ==========================================
+class Job:
+    def __init__(self, job_type, payload, filename, timeout):
+        self.id = uuid.uuid4().hex
+        self.type = job_type
+        self.payload = payload
+        self.filename = filename
+        self.timeout = timeout
+        self.status = "queued"
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.events = [{"event": "queued", "id": self.id}]
+        self._cond = threading.Condition()
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed", "timeout")
+
+    def add_event(self, event, data):
+        with self._cond:
+            self.events.append({"event": event, **(data if isinstance(data, dict) else {"data": data})})
+            self._cond.notify_all()
+
+    def start(self):
+        self.started_at = time.time()
+        self.status = "running"
+        self.add_event("started", {"started_at": self.started_at})
+
+    def finish(self, status, result=None, error=None):
+        self.payload = None  # Free the upload as soon as possible
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+        self.status = status
+        self.add_event(status, {"result": result} if result is not None else {"error": error})
+
+    def wait_events(self, start, timeout=1.0):
+        """Events after index `start`, blocking up to `timeout` when none are new."""
+        with self._cond:
+            if len(self.events) <= start and not self.done:
+                self._cond.wait(timeout)
+            return self.events[start:]
+
+    def to_dict(self):
+        info = {
+            "id": self.id,
+            "type": self.type,
+            "filename": self.filename,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "pages_done": sum(1 for e in self.events if e["event"] == "page"),
+        }
+        if self.result is not None:
+            info["result"] = self.result
+        if self.error is not None:
+            info["error"] = self.error
+        return info
+
+
+# ==========================================
+# 🏭 WORKER POOL
+# ==========================================
+class WorkerSlot:
+    """
+    Supervises one worker process from a thread in the server: takes jobs
+    from the shared queue, relays the worker's events, enforces the timeout
+    and respawns the process when it is killed or crashes.
+    """
+    def __init__(self, index, jobs, job_types, ctx):
+        self.index = index
+        self.jobs = jobs
+        self.job_types = job_types
+        self.ctx = ctx
+        self.process = None
+        self.conn = None
+        self.current = None
+        self.completed = 0
+        self.restarts = 0
+        self.ready = False
+        self._stopping = False
+        self.thread = threading.Thread(target=self._run, name=f"worker-slot-{index}", daemon=True)
+
+    def _spawn(self):
+        self.ready = False
+        parent_conn, child_conn = self.ctx.Pipe()
+        self.process = self.ctx.Process(target=worker_main, args=(child_conn, self.job_types), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        # Warm-up (model loading) is not counted against any job's timeout
+        try:
+            self.conn.recv()
+            self.ready = True
+        except EOFError:
+            time.sleep(1.0)  # Worker died during start-up; back off before respawning
+
+    def _kill(self):
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+        if self.process is not None:
+            self.process.join(5)
+        if self.conn is not None:
+            self.conn.close()
+        self.process = self.conn = None
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self._stopping = True
+        if self.conn is not None and self.current is None:
+            try:
+                self.conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+        if self.process is not None:
+            self.process.join(5)
+        self._kill()
+
+    def _run(self):
+        while not self._stopping:
+            if self.process is None or not self.process.is_alive():
+                if self.process is not None:
+                    self.restarts += 1
+                    self._kill()
+                self._spawn()
+                continue
+
+            try:
+                job = self.jobs.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if job is None:
+                return
+
+            self.current = job
+            job.start()
+            try:
+                self._execute(job)
+            finally:
+                self.current = None
+                self.completed += 1
+
+    def _execute(self, job):
+        try:
+            self.conn.send((job.type, job.payload, job.filename))
+        except (OSError, BrokenPipeError):
+            job.finish("failed", error="Worker process is not available")
+            self._kill()
+            return
+
+        deadline = time.monotonic() + job.timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"[service] Job {job.id} exceeded {job.timeout}s; restarting worker {self.index}.")
+                self._kill()
+                self.restarts += 1
+                job.finish("timeout", error=f"Job exceeded its {job.timeout}s timeout")
+                return
+            try:
+                if not self.conn.poll(min(remaining, 1.0)):
+                    continue
+                event, data = self.conn.recv()
+            except (EOFError, OSError):
+                self._kill()
+                self.restarts += 1
+                job.finish("failed", error="Worker process crashed while running the job")
+                return
+
+            if event == "result":
+                job.finish("done", result=data)
+                return
+            if event == "error":
+                job.finish("failed", error=data)
+                return
+            job.add_event(event, data)
+
+    def info(self):
+        return {
+            "index": self.index,
+            "pid": self.process.pid if self.process is not None else None,
+            "ready": self.ready,
+            "busy": self.current is not None,
+            "current_job": self.current.id if self.current is not None else None,
+            "completed": self.completed,
+            "restarts": self.restarts,
+        }
+
+
+class JobService:
+    def __init__(self, workers=DEFAULT_WORKERS, queue_size=QUEUE_SIZE, timeout=JOB_TIMEOUT, job_types=JOB_TYPES):
+        self.timeout = timeout
+        self.job_types = tuple(job_types)
+        self.queue = queue.Queue(maxsize=max(1, queue_size))
+        self.jobs = {}
+        self._lock = threading.Lock()
+        # "spawn": torch/CUDA state must not be inherited through fork
+        ctx = multiprocessing.get_context("spawn")
+        self.slots = [WorkerSlot(i, self.queue, self.job_types, ctx) for i in range(max(1, workers))]
+
+    def start(self):
+        for slot in self.slots:
+            slot.start()
+        return self
+
+    def stop(self):
+        for slot in self.slots:
+            slot.stop()
+
+    def submit(self, job_type, payload, filename=None, timeout=None):
+        """
+        :return: The queued Job, or None if the queue is full.
+        """
+        timeout = min(timeout or self.timeout, MAX_JOB_TIMEOUT)
+        job = Job(job_type, payload, filename, timeout)
+        with self._lock:
+            self._purge()
+            self.jobs[job.id] = job
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                del self.jobs[job.id]
+            return None
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def _purge(self):
+        cutoff = time.time() - FINISHED_JOB_TTL
+        for job_id in [j.id for j in self.jobs.values() if j.done and j.finished_at < cutoff]:
+            del self.jobs[job_id]
+
+    def health(self):
+        with self._lock:
+            counts = {}
+            for job in self.jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "status": "ok" if any(slot.ready for slot in self.slots) else "starting",
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "jobs": counts,
+            "workers": [slot.info() for slot in self.slots],
+        }
+
+
+# ==========================================
+# 🌐 HTTP API
+# ==========================================
+class ServiceHandler(BaseHTTPRequestHandler):
+    service = None  # Set by make_server()
+
+    def _send_json(self, code, body):
+        data = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _job_or_404(self, job_id):
+        job = self.service.get(job_id)
+        if job is None:
+            self._send_json(404, {"error": f"Unknown job: {job_id}"})
+        return job
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] != "jobs" or parts[1] not in self.service.job_types:
+            routes = " or ".join(f"POST /jobs/{t}" for t in self.service.job_types)
+            return self._send_json(404, {"error": f"Use {routes}"})
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            return self._send_json(400, {"error": "Empty request body (send the raw file bytes)"})
+        if length > MAX_UPLOAD_BYTES:
+            return self._send_json(413, {"error": f"Upload exceeds {MAX_UPLOAD_BYTES} bytes"})
+        payload = self.rfile.read(length)
+
+        query = parse_qs(url.query)
+        filename = query.get("filename", [None])[0]
+        try:
+            timeout = float(query["timeout"][0]) if "timeout" in query else None
+        except ValueError:
+            return self._send_json(400, {"error": "timeout must be a number of seconds"})
+
+        job = self.service.submit(parts[1], payload, filename=filename, timeout=timeout)
+        if job is None:
+            self.send_response(503)
+            self.send_header("Retry-After", "5")
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(json.dumps({"error": "Job queue is full, retry later"}).encode("utf-8"))
+            return
+        self._send_json(202, {"id": job.id, "status": job.status,
+                              "poll": f"/jobs/{job.id}", "events": f"/jobs/{job.id}/events"})
+
+    def do_GET(self):
+        parts = urlparse(self.path).path.strip("/").split("/")
+
+        if parts == ["health"]:
+            return self._send_json(200, self.service.health())
+
+        if len(parts) == 2 and parts[0] == "jobs":
+            job = self._job_or_404(parts[1])
+            if job is not None:
+                self._send_json(200, job.to_dict())
+            return
+
+        if len(parts) == 3 and parts[0] == "jobs" and parts[2] == "events":
+            job = self._job_or_404(parts[1])
+            if job is not None:
+                self._stream_events(job)
+            return
+
+        self._send_json(404, {"error": "Not found"})
+
+    def _stream_events(self, job):
+        # HTTP/1.0 style stream: no Content-Length, the body ends when we close
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        sent = 0
+        try:
+            while True:
+                events = job.wait_events(sent)
+                for event in events:
+                    self.wfile.write((json.dumps(event, default=str) + "\n").encode("utf-8"))
+                sent += len(events)
+                self.wfile.flush()
+                if job.done and sent >= len(job.events):
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client stopped listening; the job keeps running
+
+    def log_message(self, fmt, *args):
+        print(f"[service] {self.address_string()} {fmt % args}")
+
+
+def make_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    handler = type("BoundServiceHandler", (ServiceHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SpecSense headless batch service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Warm worker processes")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help="Max jobs waiting for a worker")
+    parser.add_argument("--timeout", type=float, default=JOB_TIMEOUT, help="Default per-job timeout (seconds)")
+    parser.add_argument("--only", choices=JOB_TYPES, help="Serve (and warm up) a single job type")
+    args = parser.parse_args(argv)
+
+    job_types = (args.only,) if args.only else JOB_TYPES
+    service = JobService(workers=args.workers, queue_size=args.queue_size,
+                         timeout=args.timeout, job_types=job_types).start()
+    server = make_server(service, args.host, args.port)
+    print(f"🚀 SpecSense service on http://{args.host}:{args.port} "
+          f"({args.workers} workers, queue {args.queue_size}, timeout {args.timeout:.0f}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+        print("🛑 Service stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Compact per-session storage for the Streamlit app's OCR results.
+
+Each processed document is kept as a small record instead of the original
+upload: parsed specs, the validation report, a downscaled JPEG thumbnail and
+the raw OCR text compressed with zlib (spilled to a temp file when large and
+loaded only when the debug view asks for it). A session's records are capped
+in size; the oldest documents are evicted first.
+"""
+import json
+import os
+import tempfile
+import uuid
+import weakref
+import zlib
+from collections import OrderedDict
+
+# ==========================================
+# ⚙️ STORAGE SETTINGS
+# ==========================================
+SESSION_MEMORY_CAP = 64 * 1024 * 1024   # Bytes of results kept per session
+THUMBNAIL_MAX_EDGE = 320                # Pixels (longest side)
+THUMBNAIL_QUALITY = 80                  # JPEG quality
+SPILL_THRESHOLD = 256 * 1024            # Compressed text above this goes to disk
+SPILL_DIR = os.path.join(tempfile.gettempdir(), "specsense_spill")
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class CompactText:
+    """OCR text held zlib-compressed in memory, or in a spill file on disk."""
+
+    def __init__(self, text):
+        data = zlib.compress(text.encode("utf-8"), 6)
+        self.chars = len(text)
+        self._data = None
+        self._path = None
+        if len(data) > SPILL_THRESHOLD:
+            os.makedirs(SPILL_DIR, exist_ok=True)
+            self._path = os.path.join(SPILL_DIR, f"{uuid.uuid4().hex}.z")
+            with open(self._path, "wb") as f:
+                f.write(data)
+            # Delete the spill file when the record is evicted or the session ends
+            self._finalizer = weakref.finalize(self, _remove_file, self._path)
+        else:
+            self._data = data
+
+    @property
+    def nbytes(self):
+        """Bytes held in memory."""
+        return len(self._data) if self._data is not None else 0
+
+    def load(self):
+        if self._data is not None:
+            return zlib.decompress(self._data).decode("utf-8")
+        try:
+            with open(self._path, "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8")
+        except OSError:
+            return "OCR text is no longer available."
+
+    def discard(self):
+        if self._path is not None:
+            self._finalizer()
+
+
+def make_thumbnail(data, max_edge=THUMBNAIL_MAX_EDGE):
+    """
+    Downscaled JPEG of an encoded image.
+    :return: JPEG bytes, or None if the data is not a decodable image.
+    """
+    import cv2
+    import numpy as np
+
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        return None
+    scale = max_edge / max(img.shape[:2])
+    if scale < 1:
+        img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    ok, buf = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, THUMBNAIL_QUALITY])
+    return buf.tobytes() if ok else None
+
+
+def compact_record(specs, report, size, suffix, thumbnail=None):
+    """
+    Builds the stored record for one document. The raw OCR text is moved out
+    of report['keyword_details'] into a CompactText under 'ocr_text'.
+    """
+    report = dict(report)
+    text = ""
+    if isinstance(report.get("keyword_details"), dict):
+        report["keyword_details"] = dict(report["keyword_details"])
+        text = report["keyword_details"].pop("full_text_debug", "") or ""
+
+    record = {
+        "specs": specs,
+        "report": report,
+        "size": size,
+        "suffix": suffix,
+        "thumbnail": thumbnail,
+        "ocr_text": CompactText(text),
+    }
+    record["nbytes"] = (len(json.dumps([specs, report], default=str))
+                        + len(thumbnail or b"") + record["ocr_text"].nbytes)
+    return record
+
+
+class SessionResults:
+    """
+    Ordered document name -> record map with a memory cap. Adding a record
+    evicts the oldest ones until the total fits (the newest is always kept).
+    """
+
+    def __init__(self, cap=SESSION_MEMORY_CAP):
+        self.cap = cap
+        self.nbytes = 0
+        self.evicted = []
+        self._records = OrderedDict()
+
+    def __setitem__(self, name, record):
+        self.pop(name, None)
+        if name in self.evicted:
+            self.evicted.remove(name)
+        self._records[name] = record
+        self.nbytes += record["nbytes"]
+        while self.nbytes > self.cap and len(self._records) > 1:
+            oldest = next(iter(self._records))
+            self.pop(oldest)
+            self.evicted.append(oldest)
+
+    def pop(self, name, *default):
+        if name not in self._records:
+            if default:
+                return default[0]
+            raise KeyError(name)
+        record = self._records.pop(name)
+        self.nbytes -= record["nbytes"]
+        record["ocr_text"].discard()
+        return record
+
+    def __delitem__(self, name):
+        self.pop(name)
+
+    def __getitem__(self, name):
+        return self._records[name]
+
+    def get(self, name, default=None):
+        return self._records.get(name, default)
+
+    def __contains__(self, name):
+        return name in self._records
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def items(self):
+        return self._records.items()
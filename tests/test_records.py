@@ -0,0 +1,103 @@
+"""
+validate_records switches to the vectorized pandas path for large catalogs;
+both paths must give the same specs, reports and correction logs.
+"""
+import os
+import sys
+
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from ocr_module.src import records
+
+pytest.importorskip("pandas")
+
+FIELDS = records.FIELDS
+
+# Raw cell values as they come out of DOCX / XLSX tables and OCR
+ROWS = [
+    # Clean catalog row
+    {"cable_type": "Copper", "voltage": "0.6/1kV", "current_rating": "32 A", "insulation": "XLPE",
+     "conductor_count": "4", "conductor_size": "16mm2", "sheath": "PVC", "operating_temperature": "90 C",
+     "insulation_resistance": "20MOkm", "armor": "SWA"},
+    # Everything missing except two fields
+    {"cable_type": None, "voltage": "450/750V", "current_rating": None, "insulation": None,
+     "conductor_count": None, "conductor_size": "6 mm", "sheath": None, "operating_temperature": None,
+     "insulation_resistance": None, "armor": None},
+    # NxS size, with and without a matching core count
+    {"cable_type": "Cu", "voltage": "0.6/1 KV", "current_rating": "1 2 0A", "insulation": "PVC",
+     "conductor_count": None, "conductor_size": "4x16 mm2", "sheath": "hdpe jacket",
+     "operating_temperature": "7 0 C", "insulation_resistance": "100 MΩ km", "armor": "awa"},
+    {"cable_type": "Aluminium", "voltage": "6.35/11kv", "current_rating": "250A", "insulation": "XLPE",
+     "conductor_count": "3", "conductor_size": "3x95", "sheath": "PVC Sheath",
+     "operating_temperature": "90°C", "insulation_resistance": "50MΩkm", "armor": "Steel Tape Armour"},
+    {"cable_type": "Al", "voltage": "1.8/3kV", "current_rating": "63A", "insulation": "XLPE",
+     "conductor_count": 4, "conductor_size": "4X25mm²", "sheath": "LSZH",
+     "operating_temperature": "-", "insulation_resistance": "", "armor": "STA"},
+    # OCR-confused values
+    {"cable_type": "C0pper", "voltage": "4S0/7S0 V", "current_rating": "3 2 A", "insulation": "PVC",
+     "conductor_count": "2", "conductor_size": "2.5mh?", "sheath": "pvc", "operating_temperature": "4 c",
+     "insulation_resistance": "20 MO.km", "armor": "Stee1 Wire Armox"},
+    {"cable_type": "copper", "voltage": "600/1000V", "current_rating": "16A", "insulation": "PVC",
+     "conductor_count": "1", "conductor_size": "1.5Mm2", "sheath": "PVC", "operating_temperature": "2c",
+     "insulation_resistance": "armox", "armor": "Armox"},
+    {"cable_type": "CU", "voltage": "0.6/1kV", "current_rating": "40A", "insulation": "XLPE",
+     "conductor_count": "5", "conductor_size": "10 mM2", "sheath": "MDPE", "operating_temperature": "105 c.",
+     "insulation_resistance": "5MΩ km", "armor": "none"},
+    # Invalid rows (validator errors)
+    {"cable_type": "Fiber Optic", "voltage": "230V AC/DC", "current_rating": "500A", "insulation": "Foam",
+     "conductor_count": "2", "conductor_size": "1 mm2", "sheath": "Plastic", "operating_temperature": "150 C",
+     "insulation_resistance": "0 MΩkm", "armor": "Wood"},
+    {"cable_type": "?", "voltage": "0.6/33kV", "current_rating": "10A", "insulation": "Paper",
+     "conductor_count": "0", "conductor_size": "0.05mm2", "sheath": "Glass", "operating_temperature": "-60 C",
+     "insulation_resistance": "UNVERIFIABLE", "armor": "Paint"},
+]
+
+
+def _records(rows, repeat=1):
+    out = []
+    for n in range(repeat):
+        for i, specs in enumerate(rows):
+            out.append({"table": n, "row": i + 1, "specs": dict(specs)})
+    return out
+
+
+def _scalar(recs, monkeypatch):
+    monkeypatch.setattr(records, "VECTORIZED_MIN_ROWS", len(recs) + 1)
+    return records.validate_records(recs)
+
+
+def _vectorized(recs, monkeypatch):
+    monkeypatch.setattr(records, "VECTORIZED_MIN_ROWS", 0)
+    return records.validate_records(recs)
+
+
+def _normalized(results):
+    # Both paths may only differ in dict key order
+    return [{"table": r["table"], "row": r["row"],
+             "specs": {field: r["specs"].get(field) for field in FIELDS},
+             "report": {key: r["report"][key] for key in sorted(r["report"])}} for r in results]
+
+
+@pytest.mark.parametrize("index", range(len(ROWS)))
+def test_paths_agree_per_row(index, monkeypatch):
+    recs = _records([ROWS[index]])
+    assert _normalized(_vectorized(recs, monkeypatch)) == _normalized(_scalar(recs, monkeypatch))
+
+
+def test_paths_agree_on_repeated_catalog(monkeypatch):
+    recs = _records(ROWS, repeat=3)
+    assert _normalized(_vectorized(recs, monkeypatch)) == _normalized(_scalar(recs, monkeypatch))
+
+
+@pytest.mark.parametrize("path", [_scalar, _vectorized])
+def test_identical_rows_do_not_share_reports(path, monkeypatch):
+    results = path(_records([ROWS[8]], repeat=2), monkeypatch)
+    first, second = results
+    first["report"]["errors"].append("edited")
+    first["report"]["correction_logs"].append("edited")
+    assert "edited" not in second["report"]["errors"]
+    assert "edited" not in second["report"]["correction_logs"]
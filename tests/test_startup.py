@@ -0,0 +1,65 @@
+"""
+Cold-start budget of the validation-only path: `valid.py --mode validate_json`
+must start within its budget and never import the OCR / vision stack.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from benchmark import HEAVY_MODULES, STARTUP_SAMPLE_SPECS, STARTUP_TARGETS
+
+VALID_SCRIPT = os.path.join(project_root, "ocr_module", "validation", "valid.py")
+BUDGET_SECONDS = STARTUP_TARGETS["validate"]["budget"]
+
+# Runs valid.py as __main__ and reports, at interpreter exit (valid.py may
+# call sys.exit), which heavy modules ended up in sys.modules
+MODULES_PROBE = """
+import atexit, json, runpy, sys
+heavy = {heavy!r}
+atexit.register(lambda: print("HEAVY_MODULES=" + json.dumps(sorted(m for m in heavy if m in sys.modules))))
+sys.argv = {argv!r}
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+
+@pytest.fixture
+def specs_path(tmp_path):
+    path = tmp_path / "specs.json"
+    path.write_text(json.dumps(STARTUP_SAMPLE_SPECS), encoding="utf-8")
+    return str(path)
+
+
+def _run(command):
+    env = dict(os.environ, SPECSENSE_NO_DAEMON="1")
+    start = time.perf_counter()
+    proc = subprocess.run(command, cwd=project_root, env=env, capture_output=True, text=True)
+    return proc, time.perf_counter() - start
+
+
+def test_validate_json_skips_heavy_modules(specs_path):
+    argv = [VALID_SCRIPT, "--mode", "validate_json", "--specs", specs_path]
+    proc, _ = _run([sys.executable, "-c", MODULES_PROBE.format(heavy=list(HEAVY_MODULES), argv=argv)])
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+    marker = [line for line in proc.stdout.splitlines() if line.startswith("HEAVY_MODULES=")]
+    assert marker, proc.stdout
+    assert json.loads(marker[-1][len("HEAVY_MODULES="):]) == []
+
+
+def test_validate_json_cold_start_within_budget(specs_path):
+    command = [sys.executable, VALID_SCRIPT, "--mode", "validate_json", "--specs", specs_path]
+    # Best of three: the first run also pays for filling the OS file cache
+    walls = []
+    for _ in range(3):
+        proc, wall = _run(command)
+        assert proc.returncode == 0, proc.stdout + proc.stderr
+        walls.append(wall)
+    assert min(walls) <= BUDGET_SECONDS, f"{min(walls):.3f}s cold start, budget {BUDGET_SECONDS:.2f}s"
@@ -0,0 +1,317 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import cv2
+
+try:
+    from .interface import (CONF_THRESHOLD, ImageQualityError, get_detection_cache, inspect_cable_array,
+                            load_model, model_path as default_model_path, read_image_bytes, render_detections)
+    from .detection_cache import hash_bytes, hash_file
+except ImportError:
+    # Fallback when running from inside vision_module
+    from interface import (CONF_THRESHOLD, ImageQualityError, get_detection_cache, inspect_cable_array,
+                           load_model, model_path as default_model_path, read_image_bytes, render_detections)
+    from detection_cache import hash_bytes, hash_file
+
+# ==========================================
+# ⚙️ DEFAULTS
+# ==========================================
+current_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_IMAGES = os.path.join(current_dir, "Cable_Dataset", "images", "train")
+DEFAULT_OUTPUT = os.path.join(current_dir, "Inspection_Results")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff")
+
+# Report columns (mirrors the dicts returned by analyze_cable_image)
+REPORT_FIELDS = ["File", "Status", "Diameter (mm)", "Width (px)", "Voltage Class", "Conductor",
+                 "Insulation", "Sheath Mat.", "Cable Type", "Error"]
+
+MODEL_CHOICE_FILE = "model_choice.json"
+_END = object()
+
+# Status of images whose annotated copy could not be saved; --resume retries them
+WRITE_ERROR = "WRITE ERROR"
+
+
+# ==========================================
+# 🧠 MODEL SELECTION (once, recorded)
+# ==========================================
+def candidate_models(explicit=None):
+    if explicit:
+        return [explicit]
+    trained = glob.glob(os.path.join(current_dir, "runs", "detect", "train*", "weights", "best.pt"))
+    trained.sort(reverse=True)
+    return trained + [default_model_path]
+
+
+def select_model(output_dir, probe_image, explicit=None, reselect=False):
+    """
+    Picks the model to use for the whole run and records the choice in
+    <output>/model_choice.json. Later runs reuse the recorded model as long as
+    its weights are unchanged, so candidates are only probed once.
+    """
+    choice_path = os.path.join(output_dir, MODEL_CHOICE_FILE)
+
+    if not reselect and not explicit and os.path.exists(choice_path):
+        with open(choice_path, "r", encoding="utf-8") as f:
+            choice = json.load(f)
+        weights = choice.get("model")
+        if weights and os.path.exists(weights) and hash_file(weights) == choice.get("sha256"):
+            print(f"[INFO] Using recorded model: {weights}")
+            return weights
+
+    probe_img = cv2.imdecode(read_image_bytes(probe_image), cv2.IMREAD_COLOR) if probe_image else None
+    for weights in candidate_models(explicit):
+        if not os.path.exists(weights):
+            continue
+        try:
+            model = load_model(weights)
+            if explicit or probe_img is None or model(probe_img, conf=CONF_THRESHOLD, verbose=False)[0].boxes:
+                choice = {
+                    "model": weights,
+                    "sha256": hash_file(weights),
+                    "probe_image": probe_image,
+                    "selected_at": datetime.now().isoformat(timespec="seconds"),
+                }
+                with open(choice_path, "w", encoding="utf-8") as f:
+                    json.dump(choice, f, indent=4)
+                print(f"[INFO] Selected model: {weights} (recorded in {choice_path})")
+                return weights
+        except Exception as e:
+            print(f"[WARN] Model {weights} failed to load: {e}")
+    return None
+
+
+# ==========================================
+# 📂 STREAMING INPUT
+# ==========================================
+def iter_images(root):
+    """
+    Walks the image directory lazily, so arbitrarily large folders are never
+    listed into memory at once.
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                yield os.path.join(dirpath, name)
+
+
+def prefetch(paths, out_queue, skip):
+    """
+    Reader thread: reads and decodes images ahead of inference. The queue is
+    bounded, so the reader blocks instead of filling memory.
+    """
+    for path, rel in paths:
+        if rel in skip:
+            continue
+        try:
+            stream = read_image_bytes(path)
+            img = cv2.imdecode(stream, cv2.IMREAD_COLOR)
+            if img is None:
+                raise ValueError("Image decoding failed (Result is None).")
+            out_queue.put((rel, img, hash_bytes(stream), None))
+        except Exception as e:
+            out_queue.put((rel, None, None, str(e)))
+    out_queue.put(_END)
+
+
+# ==========================================
+# 📝 REPORT (CSV / JSONL, append for resume)
+# ==========================================
+class ReportWriter:
+    def __init__(self, path, fmt):
+        self.fmt = fmt
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, "a", encoding="utf-8", newline="")
+        if fmt == "csv":
+            self.writer = csv.DictWriter(self.file, fieldnames=REPORT_FIELDS, extrasaction="ignore")
+            if not exists:
+                self.writer.writeheader()
+
+    def write(self, row):
+        if self.fmt == "csv":
+            self.writer.writerow(row)
+        else:
+            self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        # Flush per row so an interrupted run can be resumed exactly
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def completed_files(path, fmt):
+    """Files already present in an existing report (for --resume), except failed image writes."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            rows = csv.DictReader(f)
+        else:
+            rows = []
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # Partially written last line
+        for row in rows:
+            if row.get("Status") != WRITE_ERROR:
+                done.add(row.get("File"))
+    return done
+
+
+def write_annotated(img, detections, path):
+    # Rendered here, off the inference thread (the array is not used elsewhere)
+    annotated = render_detections(img, detections, copy=False)
+    # imencode + tofile handles non-ASCII Windows paths (cv2.imwrite does not)
+    ok, buf = cv2.imencode(os.path.splitext(path)[1] or ".jpg", annotated)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if not ok:
+        raise ValueError(f"Could not encode {os.path.basename(path)}")
+    buf.tofile(path)
+
+
+def finish_writes(pending, report, wait=False):
+    """
+    Reports the images whose annotated copy has been written, so a row only
+    lands in the report (and counts for --resume) once its image is saved.
+    :param pending: [(future, report row), ...], finished entries are removed
+    :param wait: Wait for every pending write (end of run)
+    :return: Number of failed writes
+    """
+    failed, remaining = 0, []
+    for future, row in pending:
+        if not wait and not future.done():
+            remaining.append((future, row))
+            continue
+        try:
+            future.result()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {row['File']}: annotated image not written ({e})")
+            row = {"File": row["File"], "Status": WRITE_ERROR, "Error": str(e)}
+        report.write(row)
+    pending[:] = remaining
+    return failed
+
+
+# ==========================================
+# 🚀 MAIN
+# ==========================================
+def main():
+    parser = argparse.ArgumentParser(description="Batch cable cross-section inspection")
+    parser.add_argument("--images", default=DEFAULT_IMAGES, help="Directory of images (searched recursively)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Directory for annotated images and the report")
+    parser.add_argument("--model", help="YOLO weights to use (skips model probing)")
+    parser.add_argument("--reselect", action="store_true", help="Ignore the recorded model choice and probe again")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv", help="Report format")
+    parser.add_argument("--resume", action="store_true", help="Skip images already present in the report")
+    parser.add_argument("--prefetch", type=int, default=8, help="Max decoded images waiting for inference")
+    parser.add_argument("--writers", type=int, default=2, help="Background threads writing annotated images")
+    parser.add_argument("--no-images", action="store_true", help="Only write the report")
+    parser.add_argument("--tiled", action="store_true", help="Use tiled inference for high-resolution images")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    report_path = os.path.join(args.output, f"inspection_report.{args.format}")
+
+    first_image = next(iter_images(args.images), None)
+    if first_image is None:
+        print(f"[ERROR] No images found in {args.images}.")
+        return
+
+    print("[INFO] Initializing System...")
+    weights = select_model(args.output, first_image, explicit=args.model, reselect=args.reselect)
+    if not weights:
+        print("[ERROR] System Failure: No working AI model found.")
+        return
+
+    skip = completed_files(report_path, args.format) if args.resume else set()
+    if not args.resume and os.path.exists(report_path):
+        os.remove(report_path)
+    if skip:
+        print(f"[INFO] Resuming: {len(skip)} images already in the report.")
+
+    paths = ((p, os.path.relpath(p, args.images)) for p in iter_images(args.images))
+    work = queue.Queue(maxsize=max(1, args.prefetch))
+    reader = threading.Thread(target=prefetch, args=(paths, work, skip), daemon=True)
+    reader.start()
+
+    report = ReportWriter(report_path, args.format)
+    writers = ThreadPoolExecutor(max_workers=max(1, args.writers))
+    # Bound the number of annotated images waiting to be written
+    in_flight = threading.BoundedSemaphore(max(1, args.writers) * 2)
+
+    pending = []    # (future, report row) of annotated images being written
+    processed, detected, write_errors, start = 0, 0, 0, time.perf_counter()
+    try:
+        while True:
+            item = work.get()
+            if item is _END:
+                break
+            rel, img, digest, error = item
+
+            if error:
+                report.write({"File": rel, "Status": "ERROR", "Error": error})
+                continue
+
+            # Decoded once: the same array is used for inference and annotation.
+            # Measurement is headless; drawing happens later in the writer pool.
+            try:
+                detections = inspect_cable_array(img, tiled=args.tiled, image_digest=digest, weights=weights)
+            except ImageQualityError as e:
+                report.write({"File": rel, "Status": "REJECTED", "Error": str(e)})
+                print(f"⚠️ {rel}: {e}")
+                continue
+            except RuntimeError as e:
+                report.write({"File": rel, "Status": "ERROR", "Error": str(e)})
+                continue
+            processed += 1
+
+            if not detections:
+                report.write({"File": rel, "Status": "NO DETECTION"})
+                print(f"⚠️ {rel}: No cable detected")
+                continue
+
+            detected += 1
+            row = detections[0].to_row()
+            print(f"📄 {rel}: {row['Diameter (mm)']:.2f} mm | {row['Voltage Class']} | {row['Status']}")
+
+            if args.no_images:
+                report.write({"File": rel, **row})
+            else:
+                name = "Datasheet_" + os.path.basename(rel).replace(".jpg.jpg", ".jpg")
+                out_path = os.path.join(args.output, os.path.dirname(rel), name)
+                in_flight.acquire()
+                future = writers.submit(write_annotated, img, detections, out_path)
+                future.add_done_callback(lambda _: in_flight.release())
+                pending.append((future, {"File": rel, **row}))
+            write_errors += finish_writes(pending, report)
+    finally:
+        writers.shutdown(wait=True)
+        write_errors += finish_writes(pending, report, wait=True)
+        report.close()
+
+    elapsed = time.perf_counter() - start
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    print("\n" + "=" * 70)
+    print(f"✅ Inspection complete: {processed} images ({detected} with detections) in {elapsed:.1f}s ({rate:.1f} img/s)")
+    print(f"📁 Report: {report_path}")
+    print(f"🗃️ Detection cache: {get_detection_cache().stats()}")
+    if write_errors:
+        print(f"❌ {write_errors} annotated images could not be written (marked {WRITE_ERROR}; --resume retries them)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
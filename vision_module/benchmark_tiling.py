@@ -0,0 +1,133 @@
+import argparse
+import glob
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+from ultralytics import YOLO
+
+try:
+    from .interface import CONF_THRESHOLD, model_path as default_model_path
+    from .tiling import tiled_detect
+except ImportError:
+    from interface import CONF_THRESHOLD, model_path as default_model_path
+    from tiling import tiled_detect
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+dataset_dir = os.path.join(current_dir, "Cable_Dataset")
+
+
+def load_ground_truth(image_path, width, height):
+    """
+    Reads the YOLO label file matching an image (cls cx cy w h, normalized).
+    Labels are named after the image stem: image-1.jpg.jpg -> image-1.txt
+    """
+    split = os.path.basename(os.path.dirname(image_path))
+    stem = os.path.basename(image_path).split(".")[0]
+    label_path = os.path.join(dataset_dir, "labels", split, stem + ".txt")
+    if not os.path.exists(label_path):
+        return None
+
+    boxes = []
+    with open(label_path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 5:
+                continue
+            cx, cy, bw, bh = (float(v) for v in parts[1:5])
+            boxes.append(((cx - bw / 2) * width, (cy - bh / 2) * height,
+                          (cx + bw / 2) * width, (cy + bh / 2) * height))
+    return boxes
+
+
+def iou(a, b):
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, ix2 - ix1) * max(0, iy2 - iy1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def count_hits(gt_boxes, detections, iou_threshold):
+    return sum(1 for gt in gt_boxes if any(iou(gt, box) >= iou_threshold for box, _ in detections))
+
+
+def full_frame_detect(model, img, conf):
+    results = model(img, conf=conf, verbose=False)
+    detections = []
+    if results[0].boxes:
+        for box in results[0].boxes:
+            detections.append((tuple(map(int, box.xyxy[0])), float(box.conf)))
+    return detections, {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency vs. recall benchmark for tiled inference")
+    parser.add_argument("--model", default=default_model_path, help="Path to YOLO weights")
+    parser.add_argument("--tile-sizes", default="320,640,1024", help="Comma-separated tile sizes to compare")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per image (median is reported)")
+    parser.add_argument("--iou", type=float, default=0.5, help="IoU threshold for a ground-truth hit")
+    parser.add_argument("--output", help="Optional JSON output path")
+    args = parser.parse_args()
+
+    image_files = sorted(glob.glob(os.path.join(dataset_dir, "images", "*", "*")))
+    image_files = [f for f in image_files if f.lower().endswith((".jpg", ".jpeg", ".png"))]
+    if not image_files:
+        print("[ERROR] No images found.")
+        return
+
+    model = YOLO(args.model)
+
+    configs = [("full_frame", None)] + [(f"tiled_{s}", int(s)) for s in args.tile_sizes.split(",")]
+    summary = {}
+
+    for name, tile_size in configs:
+        latencies, hits, total_gt, tiles_run, tiles_total = [], 0, 0, 0, 0
+        for image_path in image_files:
+            img = cv2.imdecode(np.fromfile(image_path, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if img is None:
+                continue
+            gt_boxes = load_ground_truth(image_path, img.shape[1], img.shape[0])
+
+            timings = []
+            for _ in range(max(1, args.runs)):
+                start = time.perf_counter()
+                if tile_size is None:
+                    detections, stats = full_frame_detect(model, img, CONF_THRESHOLD)
+                else:
+                    detections, stats = tiled_detect(model, img, CONF_THRESHOLD, tile_size=tile_size)
+                timings.append(time.perf_counter() - start)
+            latencies.append(float(np.median(timings)))
+
+            tiles_run += stats.get("tiles_run", 0)
+            tiles_total += stats.get("tiles_total", 0)
+            if gt_boxes:
+                total_gt += len(gt_boxes)
+                hits += count_hits(gt_boxes, detections, args.iou)
+
+        summary[name] = {
+            "images": len(latencies),
+            "latency_ms_mean": round(1000 * float(np.mean(latencies)), 2) if latencies else None,
+            "latency_ms_p95": round(1000 * float(np.percentile(latencies, 95)), 2) if latencies else None,
+            "recall": round(hits / total_gt, 3) if total_gt else None,
+            "tiles_skipped_ratio": round(1 - tiles_run / tiles_total, 3) if tiles_total else None,
+        }
+
+    print("\n" + "=" * 70)
+    print("TILED INFERENCE BENCHMARK (latency vs recall)")
+    print("=" * 70)
+    print(f"{'Mode':<14}{'Mean ms':>10}{'p95 ms':>10}{'Recall':>10}{'Skipped':>10}")
+    for name, row in summary.items():
+        print(f"{name:<14}{str(row['latency_ms_mean']):>10}{str(row['latency_ms_p95']):>10}"
+              f"{str(row['recall']):>10}{str(row['tiles_skipped_ratio']):>10}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=4)
+        print(f"\nResults saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
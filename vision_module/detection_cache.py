@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# ==========================================
+# ⚙️ CACHE SETTINGS
+# ==========================================
+# Maximum number of images kept; least recently used entries are evicted.
+MAX_ENTRIES = 5000
+
+# Hit/miss counters and LRU timestamps of hits are kept in memory and
+# written in one transaction every FLUSH_EVERY lookups (and on put, stats
+# and close), so a lookup is a plain read instead of a commit per image.
+FLUSH_EVERY = 100
+
+# Default on-disk location (survives restarts, ignored by git).
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "detections.sqlite")
+
+_model_hashes = {}
+
+
+def hash_bytes(data):
+    """SHA-256 of an encoded image buffer or a contiguous NumPy array."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """
+    SHA-256 of a file, memoized on (path, size, mtime) so the model weights
+    are hashed once per process rather than once per image.
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime)
+    if memo_key not in _model_hashes:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        _model_hashes[memo_key] = digest.hexdigest()
+    return _model_hashes[memo_key]
+
+
+class DetectionCache:
+    """
+    Persistent, bounded cache of raw YOLO detections.
+
+    Entries are keyed by image content + model weights + inference settings,
+    so only the model output is cached. Calibration (PIXELS_PER_MM) and the
+    spec-estimation rules are applied after lookup and can change freely.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending_counts = {"hits": 0, "misses": 0}
+        self._pending_touches = {}  # key -> last_used of hits not yet written
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS detections ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON detections(last_used)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(image_digest, model_digest, conf, tiled=False, tiling=None):
+        key = f"{image_digest}:{model_digest}:{conf:.6f}:{int(bool(tiled))}"
+        if tiled and tiling:
+            # Changing the tile layout or merge thresholds changes the detections
+            key += ":" + ",".join(f"{name}={tiling[name]}" for name in sorted(tiling))
+        return key
+
+    def get(self, key):
+        """
+        :return: List of ((x1, y1, x2, y2), conf) or None on a miss.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM detections WHERE key = ?", (key,)).fetchone()
+            name = "misses" if row is None else "hits"
+            setattr(self, name, getattr(self, name) + 1)
+            self._pending_counts[name] += 1
+            if row is not None:
+                self._pending_touches[key] = time.time()
+            if sum(self._pending_counts.values()) >= FLUSH_EVERY:
+                self._flush()
+                self._conn.commit()
+        if row is None:
+            return None
+        return [(tuple(box), conf) for box, conf in json.loads(row[0])]
+
+    def put(self, key, detections):
+        payload = json.dumps([[list(box), conf] for box, conf in detections])
+        with self._lock:
+            # Pending LRU timestamps first, so eviction below sees them
+            self._flush()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO detections (key, payload, last_used) VALUES (?, ?, ?)",
+                (key, payload, time.time()),
+            )
+            # Evict least recently used entries beyond the bound
+            self._conn.execute(
+                "DELETE FROM detections WHERE key IN ("
+                "SELECT key FROM detections ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM detections")
+            self._conn.execute("DELETE FROM counters")
+            self._conn.commit()
+            self._pending_counts = {"hits": 0, "misses": 0}
+            self._pending_touches.clear()
+        self.hits = self.misses = 0
+
+    def flush(self):
+        """Writes the pending counters and LRU timestamps."""
+        with self._lock:
+            self._flush()
+            self._conn.commit()
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def stats(self):
+        """
+        Hit rate for this process ('session') and since the cache was created ('lifetime').
+        """
+        with self._lock:
+            self._flush()
+            self._conn.commit()
+            entries = self._conn.execute("SELECT COUNT(*) FROM detections").fetchone()[0]
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+
+        def rate(hits, misses):
+            total = hits + misses
+            return round(hits / total, 3) if total else 0.0
+
+        lifetime_hits, lifetime_misses = counters.get("hits", 0), counters.get("misses", 0)
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": rate(self.hits, self.misses),
+            "lifetime_hit_rate": rate(lifetime_hits, lifetime_misses),
+        }
+
+    def _flush(self):
+        """Queues the pending writes in the current transaction (caller holds the lock and commits)."""
+        counts = [(name, n) for name, n in self._pending_counts.items() if n]
+        if counts:
+            self._conn.executemany(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                counts,
+            )
+        if self._pending_touches:
+            self._conn.executemany(
+                "UPDATE detections SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._pending_touches.items()],
+            )
+        # Only dropped once queued: a locked database keeps them for the next flush
+        self._pending_counts = {"hits": 0, "misses": 0}
+        self._pending_touches.clear()
@@ -1,8 +1,36 @@
+import atexit
 import cv2
 import numpy as np  # Required for robust image loading
 import os
 from ultralytics import YOLO
 
+try:
+    from .tiling import tiled_detect, tiling_params
+    from .detection_cache import DetectionCache, hash_bytes, hash_file
+    from .records import CableDetection
+except ImportError:
+    # Fallback when running from inside vision_module
+    from tiling import tiled_detect, tiling_params
+    from detection_cache import DetectionCache, hash_bytes, hash_file
+    from records import CableDetection
+
+# Stage timings are shared with the OCR pipeline when it is importable
+try:
+    from ocr_module.src.instrumentation import byte_size, instrument
+except ImportError:
+    def instrument(name, counters=None):
+        return lambda func: func
+    byte_size = None
+
+# So is the image-quality gate (skipped without it)
+try:
+    from ocr_module.src.quality import ImageQualityError, apply_quality_gate
+except ImportError:
+    apply_quality_gate = None
+
+    class ImageQualityError(ValueError):
+        pass
+
 # ==========================================
 # ⚙️ CONFIGURATION & SETTINGS
 # ==========================================
@@ -14,6 +42,28 @@ PIXELS_PER_MM = 18.5
 # Set EXTREMELY low (0.01) because the current model is very weak/undertrained.
 CONF_THRESHOLD = 0.01
 
+# Tiled (sliced) inference for high-resolution photos (20+ MP metrology camera).
+# When enabled, the image is processed as overlapping native-resolution tiles
+# instead of being downscaled to the model input size. See tiling.py.
+TILED_INFERENCE = False
+
+# Detection Cache: raw detections are stored per (image content, model file,
+# confidence, tiling). Re-analyzing the same image skips YOLO entirely; only the
+# cheap measurement step below re-runs, so PIXELS_PER_MM can be changed freely.
+DETECTION_CACHE = True
+
+# Image-Quality Gate: millisecond checks before YOLO. Tiny or blurry photos are
+# rejected instead of returning "No cable detected"; dark, washed-out or flat
+# ones get contrast normalization first. Cross-sections have no text lines, so
+# there is no skew check.
+QUALITY_GATE = True
+QUALITY_THRESHOLDS = {
+    "min_pixels": 20_000,  # ~140x140; the smallest bundled sample is 180x148
+    "min_sharpness": 10.0,
+    "min_contrast": 40,
+    "max_skew_degrees": None,
+}
+
 # ==========================================
 # 🧠 MODEL LOADER
 # ==========================================
@@ -21,139 +71,374 @@ CONF_THRESHOLD = 0.01
 current_dir = os.path.dirname(os.path.abspath(__file__))
 model_path = os.path.join(current_dir, "best.pt")
 
-def analyze_cable_image(image_path):
+_detection_cache = None
+_models = {}
+
+
+def load_model(weights=None):
+    """
+    Returns a YOLO model, loaded once per weights file and reused afterwards.
+
+    Args:
+        weights (str): Path to the weights. Defaults to best.pt next to this file.
+    """
+    weights = weights or model_path
+    if weights not in _models:
+        _models[weights] = YOLO(weights)
+    return _models[weights]
+
+
+def get_detection_cache():
+    """Returns the shared persistent detection cache (see detection_cache.py)."""
+    global _detection_cache
+    if _detection_cache is None:
+        _detection_cache = DetectionCache()
+        atexit.register(_flush_detection_cache)
+    return _detection_cache
+
+
+def _flush_detection_cache():
+    # Counters and LRU timestamps are written in batches; keep the last ones
+    try:
+        _detection_cache.flush()
+    except Exception as e:
+        print(f"Warning: Could not flush detection cache ({e})")
+
+
+def run_detection(model, img, tiled=False):
+    """
+    Runs the YOLO model on a decoded image.
+
+    Args:
+        model: Loaded YOLO model.
+        img (np.ndarray): BGR image.
+        tiled (bool): Use sliced inference (see tiling.py).
+
+    Returns:
+        list: [((x1, y1, x2, y2), conf), ...] in image coordinates.
+    """
+    if tiled:
+        detections, _ = tiled_detect(model, img, CONF_THRESHOLD, **tiling_params())
+        return detections
+
+    # verbose=False suppresses terminal noise
+    results = model(img, conf=CONF_THRESHOLD, verbose=False)
+    detections = []
+    if results[0].boxes:
+        for box in results[0].boxes:
+            detections.append((tuple(map(int, box.xyxy[0])), float(box.conf)))
+    return detections
+
+
+def read_image_bytes(image):
+    """
+    Returns the encoded image bytes as a uint8 array.
+
+    Args:
+        image: File path, raw encoded bytes or a file-like object.
+    """
+    if isinstance(image, (str, os.PathLike)):
+        # Standard cv2.imread fails with non-English paths/spaces on Windows.
+        # We use numpy to read raw bytes, then decode them.
+        return np.fromfile(image, dtype=np.uint8)
+
+    # In-memory upload: use the buffer directly (no temp file, no copy)
+    if hasattr(image, "getbuffer"):
+        image = image.getbuffer()
+    elif hasattr(image, "read"):
+        image = image.read()
+    return np.frombuffer(image, dtype=np.uint8)
+
+
+def load_image(image):
+    """
+    Decodes an input image into a BGR array.
+
+    Args:
+        image: File path, raw encoded bytes, a file-like object (e.g. a
+            Streamlit upload) or an already decoded BGR NumPy array.
+
+    Returns:
+        np.ndarray: BGR image.
+    """
+    if isinstance(image, np.ndarray):
+        return image
+
+    img = cv2.imdecode(read_image_bytes(image), cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError("Image decoding failed (Result is None).")
+    return img
+
+
+def _analyze_counts(output, args, kwargs):
+    return {"pages": 1, "bytes": byte_size(args[0] if args else kwargs.get("image_path"))}
+
+
+@instrument("vision.analyze", counters=_analyze_counts)
+def analyze_cable_image(image_path, tiled=None):
     """
     Analyzes a cable cross-section image using YOLOv8 AI model.
     Measures diameter and classifies quality.
 
     Args:
-        image_path (str): Full path to the input image.
+        image_path: Full path to the input image, or the image as bytes,
+            a file-like object or a BGR NumPy array (not modified).
+        tiled (bool): Use tiled inference for high-resolution images.
+            Defaults to TILED_INFERENCE.
 
     Returns:
         tuple: (processed_image_array, results_list_of_dicts)
     """
-    
-    # 1. Load the AI Model
+    # Read Image (ROBUST METHOD)
     try:
-        model = YOLO(model_path)
+        img, image_digest = _decode_with_digest(image_path)
     except Exception as e:
-        return None, [{"Error": f"Model failed to load. Check '{model_path}'. Error: {e}"}]
+        return None, [{"Error": f"Failed to read image. File might be corrupt or path invalid. Details: {e}"}]
+
+    # Caller-owned arrays are annotated on a copy
+    if img is image_path:
+        img = img.copy()
+
+    return analyze_cable_array(img, tiled=tiled, image_digest=image_digest)
+
 
-    # 2. Read Image (ROBUST METHOD)
-    # Standard cv2.imread fails with non-English paths/spaces on Windows.
-    # We use numpy to read raw bytes, then decode them.
+def analyze_cable_array(img, tiled=None, image_digest=None, weights=None):
+    """
+    Same as analyze_cable_image, for an already decoded BGR array.
+    The array is annotated in place.
+
+    Args:
+        image_digest (str): Content hash used as detection cache key.
+            Computed from the pixels when omitted.
+        weights (str): YOLO weights to use instead of best.pt.
+    """
     try:
-        # Read file as byte stream
-        img_stream = np.fromfile(image_path, dtype=np.uint8)
-        # Decode image
-        img = cv2.imdecode(img_stream, cv2.IMREAD_COLOR)
-        
-        if img is None:
-            raise ValueError("Image decoding failed (Result is None).")
-            
-    except Exception as e:
-        return None, [{"Error": f"Failed to read image. File might be corrupt or path invalid. Details: {e}"}]
+        checked, quality = check_image_quality(img)
+        if quality and quality["enhanced"] and image_digest:
+            image_digest += "-enhanced"
+        detections = inspect_cable_array(checked, tiled=tiled, image_digest=image_digest, weights=weights,
+                                         quality_gate=False)
+    except ImageQualityError as e:
+        return None, [{"Error": str(e), "Quality Gate": ", ".join(e.quality["gates"])}]
+    except RuntimeError as e:
+        return None, [{"Error": str(e)}]
 
-    # 3. Run AI Inference
-    # verbose=False suppresses terminal noise
-    results = model(img, conf=CONF_THRESHOLD, verbose=False)
-    
-    output_data = []
-    
-    # 4. Process Detections
-    all_detections = []
-    
-    if results[0].boxes:
-        for box in results[0].boxes:
-            x1, y1, x2, y2 = map(int, box.xyxy[0])
-            width_px = x2 - x1
-            height_px = y2 - y1
-            area = width_px * height_px
-            conf = float(box.conf)
-            
-            diameter_mm = width_px / PIXELS_PER_MM
-            
-            all_detections.append({
-                "box": (x1, y1, x2, y2),
-                "width_px": width_px,
-                "diameter_mm": diameter_mm,
-                "area": area,
-                "conf": conf
-            })
-            
+    # Boxes are drawn on the original pixels (enhancement does not move them)
+    render_detections(img, detections, copy=False)
+    rows = [det.to_row() for det in detections]
+    if quality:
+        label = "enhanced: " + ", ".join(quality["gates"]) if quality["enhanced"] else "pass"
+        for row in rows:
+            row["Quality Gate"] = label
+    return img, rows
+
+
+def check_image_quality(img):
+    """
+    Runs the image-quality gate (ocr_module/src/quality.py) with the vision
+    thresholds.
+
+    Returns:
+        tuple: (image to run detection on, quality report or None when the
+        gate is off or unavailable)
+
+    Raises:
+        ImageQualityError: The image is too small or too blurry.
+    """
+    if not QUALITY_GATE or apply_quality_gate is None:
+        return img, None
+    return apply_quality_gate(img, QUALITY_THRESHOLDS)
+
+
+# ==========================================
+# 📐 HEADLESS (MEASUREMENT-ONLY) MODE
+# ==========================================
+def inspect_cable_image(image, tiled=None, weights=None):
+    """
+    Measurement-only analysis: returns typed detection records without
+    drawing on (or copying) the image. Use this for batch/back-end jobs and
+    call render_detections() only when an overlay is actually displayed.
+
+    Args:
+        image: Path, encoded bytes, file-like object or BGR NumPy array.
+
+    Returns:
+        list[CableDetection]: Empty if no cable was found.
+
+    Raises:
+        ValueError: The image could not be decoded, or it failed the
+            quality gate (ImageQualityError).
+        RuntimeError: The model could not be loaded.
+    """
+    img, image_digest = _decode_with_digest(image)
+    return inspect_cable_array(img, tiled=tiled, image_digest=image_digest, weights=weights)
+
+
+def inspect_cable_array(img, tiled=None, image_digest=None, weights=None, quality_gate=True):
+    """
+    Same as inspect_cable_image, for an already decoded BGR array (read only).
+
+    Args:
+        quality_gate (bool): Run the image-quality gate first (when QUALITY_GATE is on).
+    """
+    if quality_gate:
+        checked, quality = check_image_quality(img)
+        if quality and quality["enhanced"]:
+            img = checked
+            image_digest = image_digest and image_digest + "-enhanced"
+    detections = detect_cables(img, tiled=tiled, image_digest=image_digest, weights=weights)
+    return measure_detections(detections)
+
+
+def _decode_with_digest(image):
+    """Decodes an input and, when caching is on, hashes its encoded bytes."""
+    if isinstance(image, np.ndarray):
+        return image, None
+
+    img_stream = read_image_bytes(image)
+    img = cv2.imdecode(img_stream, cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError("Image decoding failed (Result is None).")
+    # Hash the encoded bytes: a re-upload of the same file hits the cache
+    return img, hash_bytes(img_stream) if DETECTION_CACHE else None
+
+
+def _detect_counts(detections, args, kwargs):
+    return {"pages": 1, "bytes": byte_size(args[0] if args else kwargs.get("img"))}
+
+
+@instrument("vision.detect", counters=_detect_counts)
+def detect_cables(img, tiled=None, image_digest=None, weights=None):
+    """
+    Raw detections for an image, served from the detection cache when possible.
+
+    Returns:
+        list: [((x1, y1, x2, y2), conf), ...]
+    """
+    if tiled is None:
+        tiled = TILED_INFERENCE
+    weights = weights or model_path
+
+    # 1. Detection Cache Lookup (the model is only loaded on a miss)
+    detections = None
+    cache_key = None
+    if DETECTION_CACHE:
+        try:
+            if image_digest is None:
+                pixels = np.ascontiguousarray(img)
+                image_digest = hash_bytes(pixels) + f"-{pixels.shape}"
+            cache_key = DetectionCache.make_key(image_digest, hash_file(weights), CONF_THRESHOLD, tiled,
+                                                tiling=tiling_params() if tiled else None)
+            detections = get_detection_cache().get(cache_key)
+        except Exception as e:
+            print(f"Warning: Detection cache unavailable ({e}), running inference...")
+            cache_key = None
+
+    if detections is None:
+        # 2. Load the AI Model
+        try:
+            model = load_model(weights)
+        except Exception as e:
+            raise RuntimeError(f"Model failed to load. Check '{weights}'. Error: {e}")
+
+        # 3. Run AI Inference
+        detections = run_detection(model, img, tiled=tiled)
+        if cache_key:
+            try:
+                get_detection_cache().put(cache_key, detections)
+            except Exception as e:
+                # e.g. database locked by another process, read-only or full disk
+                print(f"Warning: Could not store detections in cache ({e})")
+    return detections
+
+
+def estimate_specs(diameter_mm):
+    """
+    AI Estimation Logic (Rule-Based): estimate specs based on physical diameter.
+    Logic copied exactly from get_specs.py to match user expectations.
+    """
+    if diameter_mm >= 40:
+        return {
+            "Voltage Class": "Medium Voltage (11 kV - 33 kV)",
+            "Conductor": "Class 2 (Compacted Copper/Al)",
+            "Insulation": "XLPE + Semi-conductive Layer",
+            "Sheath Mat.": "HDPE / PVC (Red/Black)",
+            "Cable Type": "Heavy Duty Power Feeder"
+        }
+    elif 15 <= diameter_mm < 40:
+        return {
+            "Voltage Class": "Low Voltage (0.6/1 kV)",
+            "Conductor": "Class 2 (Stranded Copper)",
+            "Insulation": "XLPE (Cross-linked PE)",
+            "Sheath Mat.": "PVC (Black/UV Resistant)",
+            "Cable Type": "Power Cable (Armoured)"
+        }
+    return {
+        "Voltage Class": "Low Voltage (300/500 V)",
+        "Conductor": "Class 1 (Solid Copper)",
+        "Insulation": "PVC (Polyvinyl Chloride)",
+        "Sheath Mat.": "PVC (Grey/White)",
+        "Cable Type": "Control/Light Duty"
+    }
+
+
+def measure_detections(detections):
+    """
+    Measurement step: converts raw detections into CableDetection records.
+    Cheap and pixel-free, so it can re-run after calibration changes.
+    """
     # --- SMART FILTERING ---
     # Logic matched to get_specs.py: Find the ONE best box (Largest Area)
-    final_detections = []
-    if all_detections:
-        # Sort by Area (Largest first)
-        all_detections.sort(key=lambda x: x['area'], reverse=True)
-        # Take ONLY the largest one (Main Cable)
-        final_detections = [all_detections[0]]
-            
-    output_data = []
-    
-    for det in final_detections:
-        x1, y1, x2, y2 = det['box']
-        diameter_mm = det['diameter_mm']
-        width_px = det['width_px']
-        
-        # --- AI Estimation Logic (Rule-Based) ---
-        # Estimate specs based on physical diameter
-        # Logic copied exactly from get_specs.py to match user expectations
-        if diameter_mm >= 40:
-            specs = {
-                "Voltage Class": "Medium Voltage (11 kV - 33 kV)",
-                "Conductor": "Class 2 (Compacted Copper/Al)",
-                "Insulation": "XLPE + Semi-conductive Layer",
-                "Sheath Mat.": "HDPE / PVC (Red/Black)",
-                "Cable Type": "Heavy Duty Power Feeder"
-            }
-        elif 15 <= diameter_mm < 40:
-            specs = {
-                "Voltage Class": "Low Voltage (0.6/1 kV)",
-                "Conductor": "Class 2 (Stranded Copper)",
-                "Insulation": "XLPE (Cross-linked PE)",
-                "Sheath Mat.": "PVC (Black/UV Resistant)",
-                "Cable Type": "Power Cable (Armoured)"
-            }
-        else:
-            specs = {
-                "Voltage Class": "Low Voltage (300/500 V)",
-                "Conductor": "Class 1 (Solid Copper)",
-                "Insulation": "PVC (Polyvinyl Chloride)",
-                "Sheath Mat.": "PVC (Grey/White)",
-                "Cable Type": "Control/Light Duty"
-            }
-
-        # --- Quality Control Logic ---
-        if diameter_mm > 5.0:
-            status = "PASS"
-            color = (0, 255, 0)
-        else:
-            status = "FAIL (Too Small)"
-            color = (0, 0, 255)
+    if not detections:
+        return []
+    box, conf = max(detections, key=lambda d: (d[0][2] - d[0][0]) * (d[0][3] - d[0][1]))
+
+    x1, y1, x2, y2 = box
+    width_px = x2 - x1
+    diameter_mm = width_px / PIXELS_PER_MM
+
+    # --- Quality Control Logic ---
+    status = "PASS" if diameter_mm > 5.0 else "FAIL (Too Small)"
+
+    return [CableDetection(
+        box=(x1, y1, x2, y2),
+        confidence=conf,
+        diameter_mm=diameter_mm,
+        width_px=width_px,
+        specs=estimate_specs(diameter_mm),
+        status=status
+    )]
+
+
+def render_detections(img, detections, copy=True):
+    """
+    Draws detection boxes and labels (UI overlay).
+
+    Args:
+        img (np.ndarray): BGR image the detections were measured on.
+        detections (list[CableDetection]): Records from inspect_cable_*.
+        copy (bool): Draw on a copy (default) or annotate img in place.
+
+    Returns:
+        np.ndarray: Annotated BGR image.
+    """
+    if copy:
+        img = img.copy()
+
+    for det in detections:
+        x1, y1, x2, y2 = det.box
+        color = (0, 255, 0) if det.passed else (0, 0, 255)
 
         # --- Visualization ---
         cv2.rectangle(img, (x1, y1), (x2, y2), color, 3)
         
         # Info Panel on Image - mirroring get_specs.py style
         # Create a larger background area to fit details if needed
-        label_text = f"Dia: {diameter_mm:.1f} mm"
+        label_text = f"Dia: {det.diameter_mm:.1f} mm"
         (text_w, text_h), _ = cv2.getTextSize(label_text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)
         
         # Top label
         cv2.rectangle(img, (x1, y1 - 30), (x1 + text_w + 20, y1), color, -1)
         cv2.putText(img, label_text, (x1, y1 - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-        
-        output_data.append({
-            "Diameter (mm)": round(diameter_mm, 2),
-            "Width (px)": width_px,
-            "Voltage Class": specs["Voltage Class"],
-            "Conductor": specs["Conductor"],
-            "Insulation": specs["Insulation"],
-            "Sheath Mat.": specs["Sheath Mat."],
-            "Cable Type": specs["Cable Type"],
-            "Status": status
-        })
-            
-    return img, output_data
\ No newline at end of file
+
+    return img
@@ -0,0 +1,31 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class CableDetection:
+    """
+    One measured cable, as returned by the headless inspect_cable_* functions.
+    """
+    box: tuple              # (x1, y1, x2, y2) in image pixels
+    confidence: float       # YOLO score (0-1)
+    diameter_mm: float      # width_px / PIXELS_PER_MM
+    width_px: int
+    specs: dict = field(default_factory=dict)  # Rule-based estimation (Voltage Class, Conductor, ...)
+    status: str = "PASS"    # "PASS" or "FAIL (Too Small)"
+
+    @property
+    def passed(self):
+        return self.status == "PASS"
+
+    def to_row(self):
+        """Legacy dict format returned by analyze_cable_image (UI table / reports)."""
+        return {
+            "Diameter (mm)": round(self.diameter_mm, 2),
+            "Width (px)": self.width_px,
+            "Voltage Class": self.specs.get("Voltage Class"),
+            "Conductor": self.specs.get("Conductor"),
+            "Insulation": self.specs.get("Insulation"),
+            "Sheath Mat.": self.specs.get("Sheath Mat."),
+            "Cable Type": self.specs.get("Cable Type"),
+            "Status": self.status
+        }